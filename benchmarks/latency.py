@@ -0,0 +1,258 @@
+"""End-to-end latency of the interactive guide, driven through a pseudo-terminal.
+
+Launches ``gitfix`` on a pty of a fixed size, waits for the first frame, then
+walks the whole state graph from ``StartState``: it types the option leading
+to each state and the left arrow back, timing how long each key takes to be
+painted. A frame is taken to be painted when the terminal output has been
+quiet for ``--settle`` seconds; its paint time is that of its last byte.
+
+Prints the results as JSON, for comparison with an earlier run given with
+``--baseline``. Needs no real terminal, only a POSIX system.
+"""
+import argparse
+import fcntl
+import json
+import os
+import platform
+import select
+import shutil
+import struct
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import termios
+import time
+from collections import deque
+
+from gitfix import git_states
+from gitfix.analysis import MAX_TYPABLE_OPTION
+from gitfix.profile import percentile
+
+DEFAULT_SIZE = (40, 100)
+DEFAULT_SETTLE = 0.1
+PAINT_TIMEOUT = 5.0
+LEFT = "\x1b[D"
+
+
+def default_command():
+    """Return the installed ``gitfix`` script, or running it as a module."""
+    script = shutil.which("gitfix")
+    return [script] if script else [sys.executable, "-m", "gitfix.main"]
+
+
+def walk(graph):
+    """Return the keys visiting every state along a shortest-path tree.
+
+    The result lists ``(key, state)`` pairs, where ``state`` is the name of
+    the state the key leads to.
+    """
+    parents = {0: None}
+    queue = deque([0])
+    children = {}
+    while queue:
+        node = queue.popleft()
+        typable = graph.transitions[node][: MAX_TYPABLE_OPTION + 1]
+        for choice, target in enumerate(typable):
+            if target not in parents:
+                parents[target] = node
+                children.setdefault(node, []).append((choice, target))
+                queue.append(target)
+
+    keys = []
+
+    def visit(node):
+        for choice, target in children.get(node, ()):
+            keys.append((str(choice), graph.nodes[target].id))
+            visit(target)
+            keys.append((LEFT, graph.nodes[node].id))
+
+    visit(0)
+    return keys
+
+
+class Session:
+    """A ``gitfix`` process running on a pseudo-terminal."""
+
+    def __init__(self, command, size, cwd, settle):
+        """Start ``command`` in ``cwd`` on a pty of ``size`` rows and columns."""
+        self.settle = settle
+        self.fd, child = os.openpty()
+        rows, columns = size
+        fcntl.ioctl(child, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+        env = dict(os.environ, TERM="xterm-256color")
+        env.pop("GITFIX_PROFILE", None)
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(  # noqa: S603
+            command,
+            cwd=cwd,
+            env=env,
+            stdin=child,
+            stdout=child,
+            stderr=child,
+            start_new_session=True,
+        )
+        os.close(child)
+
+    def read_frame(self):
+        """Wait for output to settle; return the times of its first and last byte.
+
+        Returns None if nothing was written within ``PAINT_TIMEOUT``.
+        """
+        first = last = None
+        deadline = time.perf_counter() + PAINT_TIMEOUT
+        while True:
+            timeout = self.settle if last else deadline - time.perf_counter()
+            ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+            if not ready:
+                break
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            last = time.perf_counter()
+            first = first or last
+        if first is None:
+            return None
+        return first, last
+
+    def press(self, key):
+        """Type ``key`` and return how long it took to paint, in milliseconds."""
+        sent = time.perf_counter()
+        os.write(self.fd, key.encode("utf-8"))
+        frame = self.read_frame()
+        return None if frame is None else (frame[1] - sent) * 1000
+
+    def close(self):
+        """Quit the guide, killing it if it does not exit."""
+        try:
+            os.write(self.fd, b"q")
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        os.close(self.fd)
+
+
+def run_once(command, size, cwd, settle, keys, results):
+    """Launch the guide once, walk the graph and add the timings to ``results``."""
+    session = Session(command, size, cwd, settle)
+    try:
+        frame = session.read_frame()
+        if frame is None or session.process.poll() is not None:
+            raise RuntimeError(f"{' '.join(command)} did not start the guide")
+        results["cold_start_ms"].append((frame[0] - session.started) * 1000)
+        results["first_paint_ms"].append((frame[1] - session.started) * 1000)
+        for key, state in keys:
+            latency = session.press(key)
+            if latency is None:
+                results["unpainted"].append(state)
+            else:
+                results["keypress_to_paint_ms"].setdefault(state, []).append(latency)
+    finally:
+        session.close()
+
+
+def stats(samples):
+    """Return the p50, p95 and p99 of ``samples``, or nothing without any."""
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    return {f"p{pct}": round(percentile(samples, pct), 3) for pct in (50, 95, 99)}
+
+
+def summarize(results):
+    """Add the percentiles of every measure to ``results``."""
+    keypresses = [
+        ms for samples in results["keypress_to_paint_ms"].values() for ms in samples
+    ]
+    results["summary"] = {
+        "cold_start_ms": stats(results["cold_start_ms"]),
+        "first_paint_ms": stats(results["first_paint_ms"]),
+        "keypress_to_paint_ms": stats(keypresses),
+    }
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Return the measures more than ``tolerance`` slower than ``baseline``."""
+    slower = []
+    for measure, current in results["summary"].items():
+        for pct, value in current.items():
+            before = baseline.get("summary", {}).get(measure, {}).get(pct)
+            if before and value > before * (1 + tolerance):
+                slower.append(f"{measure} {pct}: {before:.1f} -> {value:.1f} ms")
+    return slower
+
+
+def main():
+    """Run the benchmark and print its results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=3, help="number of guides to launch"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        default=DEFAULT_SIZE,
+        metavar=("ROWS", "COLUMNS"),
+        help="terminal size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE,
+        help="seconds of quiet output ending a frame (default: %(default)s)",
+    )
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="slowdown over the baseline that fails the run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "command", nargs="*", help="command starting the guide (default: gitfix)"
+    )
+    args = parser.parse_args()
+
+    command = args.command or default_command()
+    keys = walk(git_states.GRAPH)
+    results = {
+        "command": command,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": list(args.size),
+        "runs": args.runs,
+        "keys": len(keys),
+        "cold_start_ms": [],
+        "first_paint_ms": [],
+        "keypress_to_paint_ms": {},
+        "unpainted": [],
+    }
+    # Run outside any repository, so that no git probe is started.
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(args.runs):
+            run_once(command, args.size, cwd, args.settle, keys, results)
+    summarize(results)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for line in slower:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
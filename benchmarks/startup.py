@@ -0,0 +1,76 @@
+"""Startup-time budget for the gitfix entry point.
+
+Runs ``python -X importtime -c "import gitfix.main"`` in fresh interpreters and
+fails when the best cumulative import time of ``gitfix.main`` exceeds the
+budget, or when a module that should only load on first render (Rich Markdown,
+tables, Pygments) is imported at startup.
+"""
+import argparse
+import os
+import subprocess  # noqa: S404
+import sys
+
+DEFAULT_BUDGET_MS = 50.0
+ENTRY_MODULE = "gitfix.main"
+DEFERRED_MODULES = ("rich.markdown", "rich.table", "rich.syntax", "pygments.lexers")
+
+
+def measure_import(module=ENTRY_MODULE):
+    """Import ``module`` in a fresh interpreter and return its import times.
+
+    The result maps every imported module name to its cumulative import time
+    in microseconds. Bytecode writing is forced on, as it is for an installed
+    package, so that only the first run pays for compilation.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    """Measure startup and exit non-zero when the budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("GITFIX_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum cumulative import time of gitfix.main (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="number of interpreters to launch"
+    )
+    args = parser.parse_args()
+
+    measure_import()  # Warm up the bytecode cache.
+    runs = [measure_import() for _ in range(args.runs)]
+    best_ms = min(run[ENTRY_MODULE] for run in runs) / 1000
+    print(f"{ENTRY_MODULE}: best of {args.runs} = {best_ms:.1f} ms")
+    print(f"budget: {args.budget_ms:.1f} ms")
+
+    failed = False
+    eager = sorted(name for name in DEFERRED_MODULES if name in runs[0])
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if best_ms > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,8 @@ from pathlib import Path
 import nox
 
 package = "gitfix"
-nox.options.sessions = "lint", "safety", "tests"
-locations = "src", "tests", "noxfile.py"
+nox.options.sessions = "lint", "safety", "tests", "startup"
+locations = "src", "tests", "benchmarks", "noxfile.py"
 
 
 def install_with_constraints(session, *args, **kwargs):
@@ -65,3 +65,26 @@ def tests(session):
         session, "coverage[toml]", "pytest", "pytest-cov", "pytest-mock"
     )
     session.run("pytest", *args)
+
+
+@nox.session
+def startup(session):
+    """Check the startup-time budget of the gitfix entry point."""
+    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("python", "benchmarks/startup.py", *session.posargs)
+
+
+@nox.session
+def latency(session):
+    """Measure keypress-to-paint latency of the guide on a pseudo-terminal."""
+    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("python", "benchmarks/latency.py", *session.posargs)
+
+
+@nox.session
+def prerender(session):
+    """Build the prerendered descriptions, the search index and the path table."""
+    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("python", "-m", "gitfix.prerender", *session.posargs)
+    session.run("python", "-m", "gitfix.search")
+    session.run("python", "-m", "gitfix.analysis")
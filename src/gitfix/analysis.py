@@ -0,0 +1,274 @@
+"""Analysis and export of the decision graph.
+
+``analyze`` walks the graph from the start state once and works out the
+depth of every state, the shortest option path to it, the leaves, the states
+that cannot be reached, the states on cycles, and the options that cannot be
+typed: options are chosen with a single digit key, so only the first ten of a
+state are reachable from the keyboard.
+
+The shortest paths are also written at package build time
+(``python -m gitfix.analysis``) and loaded by ``shortest_paths``, which backs
+the navigator's jump to a state.
+"""
+import json
+import os
+import sys
+from collections import deque, namedtuple
+
+PATHS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paths.json")
+# Options are chosen by typing their index as a single digit.
+MAX_TYPABLE_OPTION = 9
+
+Analysis = namedtuple(
+    "Analysis",
+    ["start", "depths", "paths", "leaves", "unreachable", "cyclic", "untypable"],
+)
+Analysis.__doc__ = """What ``analyze`` found out about a graph.
+
+``depths`` and ``paths`` map the index of each reachable node to its distance
+from ``start`` and to the option indexes of a shortest path to it. ``leaves``,
+``unreachable`` and ``cyclic`` are sorted node indexes, and ``untypable``
+lists the ``(node, option)`` pairs that cannot be typed.
+"""
+
+_paths = {}
+
+
+def breadth_first(graph, start=0):
+    """Return the shortest option path from ``start`` to every reachable node."""
+    paths = {start: []}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for choice, child in enumerate(graph.transitions[node]):
+            if child not in paths:
+                paths[child] = paths[node] + [choice]
+                queue.append(child)
+    return paths
+
+
+def strong_components(graph):
+    """Yield the strongly connected components of the graph, with Tarjan's.
+
+    The search is iterative, so deep graphs cannot overflow the stack.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    for root in range(len(graph)):
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work.pop()
+            if position == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            children = graph.transitions[node]
+            if position < len(children):
+                work.append((node, position + 1))
+                child = children[position]
+                if child not in index:
+                    work.append((child, 0))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            if low[node] == index[node]:
+                yield _pop_component(stack, on_stack, node)
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+
+def cyclic_nodes(graph):
+    """Return the sorted nodes that lie on a cycle."""
+    cyclic = []
+    for component in strong_components(graph):
+        node = component[0]
+        if len(component) > 1 or node in graph.transitions[node]:
+            cyclic.extend(component)
+    return sorted(cyclic)
+
+
+def _pop_component(stack, on_stack, root):
+    """Pop the strongly connected component of ``root`` off the stack."""
+    component = []
+    while True:
+        member = stack.pop()
+        on_stack.discard(member)
+        component.append(member)
+        if member == root:
+            return component
+
+
+def analyze(graph, start=0):
+    """Analyze ``graph`` from the node at index ``start``."""
+    paths = breadth_first(graph, start)
+    return Analysis(
+        start=start,
+        depths={node: len(path) for node, path in paths.items()},
+        paths=paths,
+        leaves=sorted(node for node in paths if not graph.transitions[node]),
+        unreachable=sorted(set(range(len(graph))) - set(paths)),
+        cyclic=cyclic_nodes(graph),
+        untypable=[
+            (node, choice)
+            for node, targets in enumerate(graph.transitions)
+            for choice in range(MAX_TYPABLE_OPTION + 1, len(targets))
+        ],
+    )
+
+
+def to_json(graph, analysis):
+    """Return the graph and its analysis as compact JSON, keyed by state name."""
+    ids = [node.id for node in graph.nodes]
+    data = {
+        "checksum": graph.checksum(),
+        "start": ids[analysis.start],
+        "states": {
+            node.id: {
+                "title": node.title,
+                "depth": analysis.depths.get(idx),
+                "path": analysis.paths.get(idx),
+                "edges": [target for _, target in node.edges],
+                "options": [label for label, _ in node.edges],
+            }
+            for idx, node in enumerate(graph.nodes)
+        },
+        "leaves": [ids[node] for node in analysis.leaves],
+        "unreachable": [ids[node] for node in analysis.unreachable],
+        "cyclic": [ids[node] for node in analysis.cyclic],
+        "untypable": [[ids[node], choice] for node, choice in analysis.untypable],
+    }
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _dot_string(text):
+    """Quote ``text`` as a DOT string."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def to_dot(graph, analysis):
+    """Return the graph in Graphviz DOT, highlighting what the analysis found.
+
+    Leaves are drawn as boxes, unreachable states dashed, and options that
+    cannot be typed in red.
+    """
+    untypable = set(analysis.untypable)
+    lines = ["digraph gitfix {", "  node [shape=ellipse];"]
+    for idx, node in enumerate(graph.nodes):
+        attrs = [f"label={_dot_string(node.title)}"]
+        if idx in analysis.leaves:
+            attrs.append("shape=box")
+        if idx in analysis.unreachable:
+            attrs.append("style=dashed")
+        lines.append(f"  {node.id} [{', '.join(attrs)}];")
+    for idx, node in enumerate(graph.nodes):
+        for choice, (label, target) in enumerate(node.edges):
+            attrs = [f"label={_dot_string(f'{choice}: {label}')}"]
+            if (idx, choice) in untypable:
+                attrs.append("color=red")
+            lines.append(f"  {node.id} -> {target} [{', '.join(attrs)}];")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def format_summary(graph, analysis):
+    """Return a readable summary of the analysis."""
+    ids = [node.id for node in graph.nodes]
+
+    def names(nodes):
+        return ", ".join(ids[node] for node in nodes) or "none"
+
+    depths = analysis.depths.values()
+    lines = [
+        f"{len(graph)} states, {sum(map(len, graph.transitions))} options",
+        f"reachable from {ids[analysis.start]}: {len(analysis.paths)}",
+        f"maximum depth: {max(depths)}",
+        f"leaves: {len(analysis.leaves)}",
+        f"unreachable: {names(analysis.unreachable)}",
+        f"on cycles: {names(analysis.cyclic)}",
+        "options that cannot be typed: "
+        + (
+            ", ".join(f"{ids[node]} {choice}" for node, choice in analysis.untypable)
+            or "none"
+        ),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def dump_paths(graph, start=0, path=PATHS_PATH):
+    """Write the shortest path from node ``start`` to every node."""
+    paths = breadth_first(graph, start)
+    data = {
+        "checksum": graph.checksum(),
+        "start": start,
+        "paths": [paths.get(node) for node in range(len(graph))],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def shortest_paths(graph, start=0, path=PATHS_PATH):
+    """Return the shortest option path from node ``start`` to each node.
+
+    The table is read from the file written at package build time, or
+    computed when it is missing or was built from another graph or start.
+    Either way, it is only loaded once.
+    """
+    key = (graph, start)
+    if key not in _paths:
+        table = None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data["start"] == start and data["checksum"] == graph.checksum():
+                table = {
+                    node: choices
+                    for node, choices in enumerate(data["paths"])
+                    if choices is not None
+                }
+        except (OSError, ValueError, KeyError, TypeError):
+            table = None
+        _paths[key] = table if table is not None else breadth_first(graph, start)
+    return _paths[key]
+
+
+def run(args):
+    """Print the analysis of the graph, or export it."""
+    from gitfix import git_states
+
+    graph = git_states.GRAPH
+    analysis = analyze(graph, graph.index(git_states.StartState.__name__))
+    formats = {"summary": format_summary, "json": to_json, "dot": to_dot}
+    output = formats[args.format](graph, analysis)
+    if args.out:
+        try:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(output)
+        except OSError as e:
+            sys.stderr.write(f"gitfix graph: {e}\n")
+            return 2
+    else:
+        sys.stdout.write(output if output.endswith("\n") else output + "\n")
+    return 0
+
+
+def main():
+    """Build the shortest-path table from the command line."""
+    import argparse
+
+    from gitfix import git_states
+
+    parser = argparse.ArgumentParser(description="Build the gitfix path table.")
+    parser.add_argument("--out", default=PATHS_PATH, help="table file to write")
+    args = parser.parse_args()
+    graph = git_states.GRAPH
+    dump_paths(graph, graph.index(git_states.StartState.__name__), args.out)
+    print(f"Wrote the paths to {len(graph)} states to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
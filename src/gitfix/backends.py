@@ -0,0 +1,249 @@
+"""Terminal backends: where frames are written and keys are read from.
+
+A backend has a blessed ``term``, used to format and lay out text, and
+methods to ``write`` frames, ``read_key`` and enter a ``session``.
+``BlessedBackend`` drives the real terminal. ``FramebufferBackend`` keeps the
+screen in memory as a grid of cells with attributes, and reads keys from a
+queue, so frames can be rendered, diffed and inspected without a terminal,
+and any number of sessions can run in one process.
+"""
+import contextlib
+import io
+import os
+import re
+import select
+import sys
+from collections import deque, namedtuple
+
+from blessed import Terminal
+
+Attrs = namedtuple(
+    "Attrs", ["fg", "bg", "bold", "dim", "italic", "underline", "reverse"]
+)
+Attrs.__doc__ = """Display attributes of a cell.
+
+Colors are None for the default color, a palette index, or an ``(r, g, b)``
+tuple.
+"""
+DEFAULT_ATTRS = Attrs(None, None, False, False, False, False, False)
+
+Cell = namedtuple("Cell", ["char", "attrs"])
+Cell.__doc__ = """One character cell of the framebuffer."""
+BLANK = Cell(" ", DEFAULT_ATTRS)
+
+# Control sequences, character set selections, other escapes, and text.
+_sequence_re = re.compile(
+    r"\x1b\[([0-9;?]*)([@-~])|\x1b[()][0-9A-Za-z]|\x1b[@-_]|([^\x1b]+)"
+)
+# SGR parameters setting a flag, by code: (attribute, value).
+_sgr_flags = {
+    1: ("bold", True),
+    2: ("dim", True),
+    3: ("italic", True),
+    4: ("underline", True),
+    7: ("reverse", True),
+    22: ("bold", False),
+    23: ("italic", False),
+    24: ("underline", False),
+    27: ("reverse", False),
+}
+
+
+class BlessedBackend:
+    """The terminal the program runs in, through blessed."""
+
+    def __init__(self, term=None):
+        """Use ``term``, or a blessed terminal on standard output."""
+        self.term = term or Terminal()
+        self.fd = sys.stdout.fileno()
+
+    @contextlib.contextmanager
+    def session(self):
+        """Read keys one at a time, with the cursor hidden."""
+        with self.term.cbreak(), self.term.hidden_cursor():
+            yield self
+
+    def write(self, data):
+        """Write all of ``data``, normally with a single system call."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view) :]
+
+    def read_key(self, timeout, fds=()):
+        """Return the next key, or an empty one on timeout or when ``fds`` wake.
+
+        Keys already buffered by blessed are returned first, without waiting.
+        """
+        key = self.term.inkey(timeout=0)
+        if not key:
+            select.select([sys.__stdin__.fileno(), *fds], [], [], timeout)
+            key = self.term.inkey(timeout=0)
+        return key
+
+
+class FixedSizeTerminal(Terminal):
+    """A blessed terminal of a given size and kind, writing nowhere."""
+
+    def __init__(self, height, width, kind="xterm-256color"):
+        """Initialize a terminal that always formats its sequences."""
+        super().__init__(kind=kind, stream=io.StringIO(), force_styling=True)
+        self._size = (height, width)
+
+    @property
+    def height(self):
+        """The fixed number of rows."""
+        return self._size[0]
+
+    @property
+    def width(self):
+        """The fixed number of columns."""
+        return self._size[1]
+
+
+class FramebufferBackend:
+    """An in-memory screen of cells, fed with keys from a queue."""
+
+    def __init__(
+        self, height=24, width=80, keys=(), kind="xterm-256color", autowrap=True
+    ):
+        """Initialize a blank screen, with ``keys`` waiting to be read.
+
+        With ``autowrap``, as in a real terminal, text reaching the last
+        column continues on the next row, scrolling the screen up from the
+        bottom one; otherwise, the characters past the last column are lost.
+        """
+        self.term = FixedSizeTerminal(height, width, kind)
+        self.autowrap = autowrap
+        self.keys = deque(keys)
+        self.cells = [[BLANK] * width for _ in range(height)]
+        self.row = 0
+        self.column = 0
+        self.attrs = DEFAULT_ATTRS
+        self.bytes_written = 0
+
+    @contextlib.contextmanager
+    def session(self):
+        """Nothing to set up."""
+        yield self
+
+    def read_key(self, timeout, fds=()):
+        """Return the next queued key, or an empty one when there is none.
+
+        Keys are queued as they would be typed: a character, or the escape
+        sequence of a key such as an arrow.
+        """
+        if self.keys:
+            self.term.ungetch(self.keys.popleft())
+        return self.term.inkey(timeout=0)
+
+    def write(self, data):
+        """Apply the text and control sequences in ``data`` to the screen."""
+        self.bytes_written += len(data)
+        for match in _sequence_re.finditer(data.decode("utf-8")):
+            params, command, text = match.groups()
+            if text is not None:
+                self._put(text)
+            elif command is not None:
+                self._control(params, command)
+
+    def _put(self, text):
+        """Write ``text`` at the cursor.
+
+        After the last column, the cursor waits past the edge: the next
+        character wraps, or is lost without autowrap.
+        """
+        for char in text:
+            if char == "\n":
+                self._line_feed()
+                self.column = 0
+            elif char == "\r":
+                self.column = 0
+            elif char.isprintable():
+                if self.column >= self.term.width:
+                    if not self.autowrap:
+                        continue
+                    self._line_feed()
+                    self.column = 0
+                if 0 <= self.row < self.term.height:
+                    self.cells[self.row][self.column] = Cell(char, self.attrs)
+                self.column += 1
+
+    def _line_feed(self):
+        """Move the cursor down a row, scrolling up when it is on the last one."""
+        if self.row + 1 < self.term.height:
+            self.row += 1
+        else:
+            del self.cells[0]
+            self.cells.append([BLANK] * self.term.width)
+
+    def _control(self, params, command):
+        """Apply a control sequence; unsupported ones are ignored."""
+        args = [int(arg) if arg.isdigit() else 0 for arg in params.split(";")]
+        if command == "H":
+            self.row = max(1, args[0]) - 1
+            self.column = max(1, args[1] if len(args) > 1 else 1) - 1
+        elif command == "J" and args[0] == 2:
+            self.cells = [[BLANK] * self.term.width for _ in range(self.term.height)]
+        elif command == "K" and 0 <= self.row < self.term.height:
+            line = self.cells[self.row]
+            line[self.column :] = [BLANK] * (self.term.width - self.column)
+        elif command == "m":
+            self.attrs = sgr(self.attrs, args)
+
+    def lines(self):
+        """Return the text of the screen, one string per row."""
+        return ["".join(cell.char for cell in row).rstrip() for row in self.cells]
+
+    def text(self):
+        """Return the text of the screen, without trailing blank rows."""
+        return "\n".join(self.lines()).rstrip("\n")
+
+
+def styled_runs(text):
+    """Yield the ``(text, attrs)`` runs of text with SGR sequences.
+
+    Other control sequences are dropped, so this suits rendered text such as
+    a state description, not a whole frame.
+    """
+    attrs = DEFAULT_ATTRS
+    for match in _sequence_re.finditer(text):
+        params, command, run = match.groups()
+        if run is not None:
+            yield run, attrs
+        elif command == "m":
+            args = [int(arg) if arg.isdigit() else 0 for arg in params.split(";")]
+            attrs = sgr(attrs, args)
+
+
+def sgr(attrs, args):
+    """Return ``attrs`` updated with the parameters of an SGR sequence."""
+    values = attrs._asdict()
+    args = deque(args)
+    while args:
+        code = args.popleft()
+        if code == 0:
+            values = DEFAULT_ATTRS._asdict()
+        elif code in _sgr_flags:
+            name, value = _sgr_flags[code]
+            values[name] = value
+            if code == 22:
+                values["dim"] = False
+        elif 30 <= code <= 37 or 40 <= code <= 47:
+            values["fg" if code < 40 else "bg"] = code % 10
+        elif 90 <= code <= 97 or 100 <= code <= 107:
+            values["fg" if code < 100 else "bg"] = code % 10 + 8
+        elif code in (39, 49):
+            values["fg" if code == 39 else "bg"] = None
+        elif code in (38, 48):
+            values["fg" if code == 38 else "bg"] = _extended_color(args)
+    return Attrs(**values)
+
+
+def _extended_color(args):
+    """Take a 256-color or RGB color from the parameters following 38 or 48."""
+    mode = args.popleft() if args else None
+    if mode == 5 and args:
+        return args.popleft()
+    elif mode == 2 and len(args) >= 3:
+        return (args.popleft(), args.popleft(), args.popleft())
+    return None
@@ -0,0 +1,159 @@
+"""Differential frame compositor for the terminal UI.
+
+A frame is laid out from named regions, stacked top to bottom, and compared
+line by line with the previous frame. Only the rows that changed are moved to
+and rewritten, and the whole update goes to the backend in a single write, which
+keeps both flicker and round trips down on slow links. Lines are clipped to
+the terminal width, so that none wraps onto the row below.
+"""
+import re
+
+REGIONS = ("title", "body", "banner", "options", "status")
+# Any OSC, CSI or other escape sequence. Blessed only recognizes the
+# sequences of its terminal's capabilities, not every one Rich writes, such as
+# a 256-color foreground and background in a single SGR.
+_sequence_re = re.compile(
+    r"(\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b\[[0-?]*[ -/]*[@-~]|\x1b[ -/]*[0-~])"
+)
+
+
+def clip(term, line, width=None):
+    """Return ``line`` cut to ``width`` columns, by default the terminal's.
+
+    Escape sequences take no room and are all kept, so styles are still
+    reset after the cut. Without clipping, a line wider than the terminal
+    would wrap onto the next row, which is only repainted when it changes.
+    """
+    width = term.width if width is None else width
+    parts = _sequence_re.split(line)
+    if term.length("".join(parts[::2])) <= width:
+        return line
+    columns = 0
+    for idx in range(0, len(parts), 2):
+        text = parts[idx]
+        for end, char in enumerate(text):
+            columns += term.length(char)
+            if columns > width:
+                parts[idx] = text[:end]
+                columns = width
+                break
+        if columns >= width:
+            parts[idx + 2 :: 2] = [""] * len(parts[idx + 2 :: 2])
+            break
+    return "".join(parts)
+
+
+def banner(term, text):
+    """Return the lines of an instructions banner, wrapped to the terminal."""
+    return [term.black_on_green(term.center(line)) for line in term.wrap(text)]
+
+
+class Compositor:
+    """Draws frames to a terminal, writing only the lines that changed."""
+
+    def __init__(self, backend):
+        """Initialize the compositor for a terminal backend."""
+        self.backend = backend
+        self.term = backend.term
+        self.frames = 0
+        self.bytes_written = 0
+        self.last_frame_bytes = 0
+        self._previous = None
+        self._size = None
+
+    def layout(self, regions, height):
+        """Stack the regions into the lines of a frame of ``height`` rows.
+
+        As in a scrolling terminal, the content starts halfway down the
+        screen and, when it is too tall to fit, its bottom is kept visible.
+        """
+        lines = []
+        for name in REGIONS:
+            lines.extend(regions.get(name, ()))
+        padding = max(0, min(height // 2, height - len(lines)))
+        frame = [""] * padding + lines
+        return frame[-height:] if height else frame
+
+    def draw(self, regions):
+        """Draw a frame, repainting only the rows that differ from the last one.
+
+        Returns the number of bytes written to the terminal.
+        """
+        return self.flush(self.compose(regions))
+
+    def compose(self, regions):
+        """Return the bytes that update the terminal to show ``regions``."""
+        term = self.term
+        size = (term.height, term.width)
+        frame = self.layout(regions, term.height)
+        if self._previous is None or size != self._size:
+            previous = [""] * len(frame)
+            out = [term.home, term.normal, term.clear]
+        else:
+            previous = self._previous
+            out = []
+        for row in range(max(len(frame), len(previous))):
+            line = frame[row] if row < len(frame) else ""
+            if row < len(previous) and previous[row] == line:
+                continue
+            out.append(term.move_yx(row, 0) + term.clear_eol + clip(term, line))
+        self._previous = frame
+        self._size = size
+        return "".join(out).encode("utf-8")
+
+    def flush(self, data):
+        """Write a frame composed by ``compose`` and return its size."""
+        self.backend.write(data)
+        self.frames += 1
+        self.last_frame_bytes = len(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def invalidate(self):
+        """Force the next frame to be repainted in full."""
+        self._previous = None
+
+
+class Viewport:
+    """A scrollable window over the lines of a rendered body.
+
+    The lines are kept as they were rendered; scrolling only moves the
+    offset, and each frame takes the slice of visible lines.
+    """
+
+    def __init__(self):
+        """Initialize an empty viewport."""
+        self.key = None
+        self.lines = []
+        self.offset = 0
+        self.height = 0
+
+    def show(self, key, lines):
+        """Display ``lines``, scrolled to the top, identified by ``key``."""
+        self.key = key
+        self.lines = lines
+        self.offset = 0
+
+    def scrollable(self, height):
+        """Return whether the lines overflow ``height`` rows."""
+        return len(self.lines) > height
+
+    def visible(self, height):
+        """Return the lines visible in ``height`` rows."""
+        self.height = max(1, height)
+        self.scroll(0)
+        return self.lines[self.offset : self.offset + self.height]
+
+    def scroll(self, delta):
+        """Scroll by ``delta`` lines, staying within the body."""
+        last = max(0, len(self.lines) - self.height)
+        self.offset = max(0, min(last, self.offset + delta))
+
+    def page(self, pages):
+        """Scroll by ``pages`` screens, keeping a line of context."""
+        self.scroll(pages * max(1, self.height - 1))
+
+    def position(self):
+        """Return a description of the visible range, such as ``1-20 of 85``."""
+        stop = min(len(self.lines), self.offset + self.height)
+        return f"{self.offset + 1}-{stop} of {len(self.lines)}"
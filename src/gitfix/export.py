@@ -0,0 +1,260 @@
+"""Static export of every state as HTML pages, SVG images or Markdown files.
+
+States are rendered on a pool of processes, since rendering with Rich is
+bound by the CPU. Exports are incremental: a manifest in the output directory
+records a hash of what each file was made from (the state's title, body and
+options, the format and the width), and only the states whose hash changed
+are rendered again. Files of states that no longer exist are removed.
+"""
+import hashlib
+import html
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from gitfix import git_states
+from gitfix.pages import (
+    BACKGROUND,
+    FOREGROUND,
+    PAGE_WIDTH,
+    attribute,
+    css_color,
+    state_page,
+)
+from gitfix.prerender import iter_states
+
+# Changing how files are exported invalidates every earlier export.
+EXPORT_VERSION = 1
+FORMATS = ("html", "svg", "md")
+MANIFEST = ".gitfix-export-{format}.json"
+# SVG geometry, in pixels.
+FONT_SIZE = 14
+CHAR_WIDTH = 8.4
+LINE_HEIGHT = 18
+PADDING = 16
+# SVG attributes of the cell attributes that are flags.
+SVG_STYLES = {
+    "bold": 'font-weight="bold"',
+    "dim": 'opacity="0.7"',
+    "italic": 'font-style="italic"',
+    "underline": 'text-decoration="underline"',
+}
+
+
+def file_name(state, export_format):
+    """Return the name of the file of ``state`` in an export."""
+    return f"{state}.{export_format}"
+
+
+def content_hash(state, export_format, width):
+    """Return the hash of everything the exported file of ``state`` depends on."""
+    graph = state.graph
+    node = graph.nodes[state.node]
+    data = [EXPORT_VERSION, export_format, width, node.id, node.title, node.body]
+    data.append([list(edge) for edge in node.edges])
+    return hashlib.sha1(json.dumps(data).encode("utf-8")).hexdigest()  # noqa: S303
+
+
+def export_markdown(state, width):
+    """Return the Markdown file of ``state``, with its options as links."""
+    title, body = state.describe()
+    lines = [f"# {title}", "", body.strip(), ""]
+    lines.extend(
+        f"{idx}. [{label}]({file_name(state.child(idx), 'md')})"
+        for idx, label in enumerate(state.options)
+    )
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def export_html(state, width):
+    """Return the HTML page of ``state``, linking to the pages next to it."""
+    return state_page(state, lambda target: file_name(target, "html"), width)
+
+
+def styled_lines(text):
+    """Return the lines of rendered ``text`` as lists of ``(text, attrs)`` runs."""
+    from gitfix.backends import styled_runs
+
+    lines = [[]]
+    for run, attrs in styled_runs(text):
+        parts = run.split("\n")
+        for idx, part in enumerate(parts):
+            if idx:
+                lines.append([])
+            if not part:
+                continue
+            line = lines[-1]
+            if line and line[-1][1] == attrs:
+                line[-1] = (line[-1][0] + part, attrs)
+            else:
+                line.append((part, attrs))
+    return lines
+
+
+def _number(value):
+    """Return a coordinate as an HTML attribute value."""
+    return attribute(f"{value:g}")
+
+
+def svg_line(runs, y, theme):
+    """Return the SVG elements drawing one line of styled runs at ``y``."""
+    rects = []
+    spans = []
+    column = 0
+    for run, attrs in runs:
+        fg, bg = (attrs.bg, attrs.fg) if attrs.reverse else (attrs.fg, attrs.bg)
+        x = PADDING + column * CHAR_WIDTH
+        if bg is not None:
+            rects.append(
+                f"<rect x={_number(x)} y={_number(y - FONT_SIZE)} "
+                f"width={_number(len(run) * CHAR_WIDTH)} "
+                f"height={_number(LINE_HEIGHT)} fill={attribute(css_color(bg, theme))}/>"
+            )
+        styles = [f"x={_number(x)}"]
+        if fg is not None:
+            styles.append(f"fill={attribute(css_color(fg, theme))}")
+        for flag, style in SVG_STYLES.items():
+            if getattr(attrs, flag):
+                styles.append(style)
+        spans.append(f"<tspan {' '.join(styles)}>{html.escape(run)}</tspan>")
+        column += len(run)
+    return "".join(rects) + f"<text y={_number(y)}>" + "".join(spans) + "</text>"
+
+
+def export_svg(state, width):
+    """Return ``state`` drawn as it looks in a terminal, as an SVG image.
+
+    The options link to the images of the states they lead to.
+    """
+    from rich.terminal_theme import DEFAULT_TERMINAL_THEME
+
+    from gitfix.backends import DEFAULT_ATTRS
+    from gitfix.render import render_state
+
+    theme = DEFAULT_TERMINAL_THEME
+    lines = [([(state.title, DEFAULT_ATTRS._replace(fg=6, bold=True))], None)]
+    lines.append(([], None))
+    for runs in styled_lines(render_state(state, width, "truecolor")):
+        lines.append((runs, None))
+    lines.append(([], None))
+    for idx, label in enumerate(state.options):
+        runs = [(f"{idx}: {label}", DEFAULT_ATTRS._replace(fg=14))]
+        lines.append((runs, file_name(state.child(idx), "svg")))
+
+    elements = []
+    for row, (runs, link) in enumerate(lines):
+        element = svg_line(runs, PADDING + FONT_SIZE + row * LINE_HEIGHT, theme)
+        if link is not None:
+            element = f"<a href={attribute(link)}>{element}</a>"
+        elements.append(element)
+    svg_width = PADDING * 2 + width * CHAR_WIDTH
+    svg_height = PADDING * 2 + len(lines) * LINE_HEIGHT
+    return "\n".join(
+        [
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f"width={_number(svg_width)} height={_number(svg_height)}>",
+            f"<title>{html.escape(state.title)}</title>",
+            f'<rect width="100%" height="100%" fill={attribute(BACKGROUND)}/>',
+            '<g font-family="ui-monospace, Menlo, Consolas, monospace" '
+            f"font-size={_number(FONT_SIZE)} fill={attribute(FOREGROUND)} "
+            'xml:space="preserve">',
+            *elements,
+            "</g>",
+            "</svg>\n",
+        ]
+    )
+
+
+EXPORTERS = {"html": export_html, "svg": export_svg, "md": export_markdown}
+
+
+def render_file(job):
+    """Render one file of an export, in a worker process.
+
+    ``job`` is the ``(state name, format, width)`` of the file.
+    """
+    name, export_format, width = job
+    state = getattr(git_states, name)()
+    return EXPORTERS[export_format](state, width)
+
+
+def load_manifest(path):
+    """Return the hashes recorded by the last export, by file name."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def write_file(path, content):
+    """Write ``content`` to ``path``, replacing the file only once complete."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def export(out, export_format, width=PAGE_WIDTH, jobs=None, force=False):
+    """Export every state reachable from the start state to the directory ``out``.
+
+    Only the files whose hash changed since the last export, or that are
+    missing, are rendered, or every file with ``force``, on up to ``jobs``
+    processes (by default, one per CPU). Either way, the files of states
+    that are gone since the last export are removed. HTML exports also get an
+    ``index.html`` copy of the start page. Returns the number of files
+    rendered, kept and removed.
+    """
+    os.makedirs(out, exist_ok=True)
+    manifest_path = os.path.join(out, MANIFEST.format(format=export_format))
+    previous = load_manifest(manifest_path)
+    hashes = {}
+    stale = []
+    for state in iter_states():
+        name = file_name(state, export_format)
+        hashes[name] = content_hash(state, export_format, width)
+        path = os.path.join(out, name)
+        if force or previous.get(name) != hashes[name] or not os.path.exists(path):
+            stale.append((str(state), export_format, width))
+
+    if len(stale) > 1 and jobs != 1:
+        with ProcessPoolExecutor(jobs) as executor:
+            contents = list(executor.map(render_file, stale))
+    else:
+        contents = [render_file(job) for job in stale]
+    for (name, _, _), content in zip(stale, contents):
+        write_file(os.path.join(out, f"{name}.{export_format}"), content)
+
+    if export_format == "html":
+        start = os.path.join(out, file_name(git_states.StartState(), "html"))
+        index = os.path.join(out, "index.html")
+        if stale or not os.path.exists(index):
+            shutil.copyfile(start, index)
+
+    removed = [name for name in previous if name not in hashes]
+    for name in removed:
+        try:
+            os.remove(os.path.join(out, name))
+        except FileNotFoundError:
+            pass
+    data = {"format": export_format, "files": hashes}
+    write_file(manifest_path, json.dumps(data, indent=1, sort_keys=True) + "\n")
+    return len(stale), len(hashes) - len(stale), len(removed)
+
+
+def run(args):
+    """Export the guide to a directory."""
+    try:
+        written, kept, removed = export(
+            args.out, args.format, args.width, args.jobs, args.force
+        )
+    except OSError as e:
+        sys.stderr.write(f"gitfix export: {e}\n")
+        return 2
+    sys.stdout.write(
+        f"Exported {written + kept} states to {args.out}: {written} rendered, "
+        f"{kept} unchanged, {removed} removed.\n"
+    )
+    return 0
@@ -0,0 +1,225 @@
+"""Jump-to-state finder matching state titles and option labels as typed.
+
+Every title and option label is indexed by its n-grams of up to three
+characters. Each word of the query must appear in a text for it to match;
+typing a character only adds one n-gram to look up, so the candidates of the
+previous query are narrowed by a single set intersection and only those left
+are checked. Deleting a character returns to the candidates kept for the
+shorter query.
+"""
+from collections import namedtuple
+
+from gitfix import git_states
+from gitfix.compositor import banner
+
+GRAM_SIZE = 3
+TITLE_BONUS = 2.0
+WORD_START_BONUS = 1.0
+
+Entry = namedtuple("Entry", ["node", "via", "text", "folded"])
+Entry.__doc__ = """A text the finder matches, and the state it leads to.
+
+``via`` is the node displaying the option, for an option label, or None for
+a title.
+"""
+
+Match = namedtuple("Match", ["entry", "spans"])
+Match.__doc__ = (
+    """An entry matching the query, with the ``(start, end)`` of each word."""
+)
+
+_index = None
+
+
+class FinderIndex:
+    """The entries of a graph, with the entries containing each n-gram."""
+
+    def __init__(self, graph):
+        """Index every title and option label of ``graph``."""
+        self.entries = []
+        for idx, node in enumerate(graph.nodes):
+            self.entries.append(Entry(idx, None, node.title, node.title.lower()))
+        for idx, node in enumerate(graph.nodes):
+            for label, target in node.edges:
+                entry = Entry(graph.index(target), idx, label, label.lower())
+                self.entries.append(entry)
+        self.all = frozenset(range(len(self.entries)))
+        self.grams = {}
+        for number, entry in enumerate(self.entries):
+            text = entry.folded
+            for size in range(1, GRAM_SIZE + 1):
+                for start in range(len(text) - size + 1):
+                    self.grams.setdefault(text[start : start + size], set()).add(number)
+
+    def narrow(self, candidates, word):
+        """Return the ``candidates`` that may contain ``word``.
+
+        ``candidates`` are the entries that may contain ``word`` without its
+        last character, so only the n-gram ending the word is looked up.
+        """
+        return candidates & self.grams.get(word[-GRAM_SIZE:], frozenset())
+
+
+def load_finder_index():
+    """Return the finder index of ``git_states``, building it on first use."""
+    global _index
+    if _index is None:
+        _index = FinderIndex(git_states.GRAPH)
+    return _index
+
+
+def score(match):
+    """Return how well an entry matches: titles and word starts rank higher."""
+    entry = match.entry
+    value = TITLE_BONUS if entry.via is None else 0.0
+    for start, _ in match.spans:
+        if start == 0 or not entry.folded[start - 1].isalnum():
+            value += WORD_START_BONUS
+    return value - len(entry.text) / 100
+
+
+class Finder:
+    """The matches of a query, updated a character at a time."""
+
+    def __init__(self, index):
+        """Start with an empty query, matching every state's title."""
+        self.index = index
+        self.query = ""
+        self._candidates = [index.all]
+        self.matches = []
+        self._update()
+
+    def type(self, char):
+        """Add a character to the query."""
+        self.query += char.lower()
+        word = self.query.rsplit(" ", 1)[-1]
+        candidates = self._candidates[-1]
+        if word:
+            candidates = self.index.narrow(candidates, word)
+        self._candidates.append(candidates)
+        self._update()
+
+    def delete(self):
+        """Remove the last character of the query."""
+        if self.query:
+            self.query = self.query[:-1]
+            self._candidates.pop()
+            self._update()
+
+    def _update(self):
+        """Rank the best match of each state among the candidates."""
+        words = self.query.split()
+        if not words:
+            entries = self.index.entries
+            self.matches = [Match(entry, ()) for entry in entries if entry.via is None]
+            return
+        best = {}
+        for number in self._candidates[-1]:
+            entry = self.index.entries[number]
+            spans = []
+            for word in words:
+                start = entry.folded.find(word)
+                if start < 0:
+                    break
+                spans.append((start, start + len(word)))
+            else:
+                match = Match(entry, tuple(spans))
+                value = score(match)
+                if entry.node not in best or value > best[entry.node][0]:
+                    best[entry.node] = (value, number, match)
+        ranked = sorted(best.values(), key=lambda item: (-item[0], item[1]))
+        self.matches = [match for _, _, match in ranked]
+
+
+def highlight(term, text, spans):
+    """Return ``text`` with the characters within ``spans`` in bold."""
+    bold = [False] * len(text)
+    for start, end in spans:
+        bold[start:end] = [True] * (end - start)
+    parts = []
+    start = 0
+    for end in range(1, len(text) + 1):
+        if end == len(text) or bold[end] != bold[start]:
+            part = text[start:end]
+            parts.append(term.bold(part) if bold[start] else part)
+            start = end
+    return "".join(parts)
+
+
+class FinderView:
+    """Ctrl-P style prompt jumping to a state by its title or an option label.
+
+    Choosing a state reached through an option label goes through the state
+    displaying that option, so the back key returns there.
+    """
+
+    def __init__(self, index):
+        """Start with an empty query."""
+        self.finder = Finder(index)
+        self.selected = 0
+        self.done = False
+        self.choice = None
+        self.via = None
+
+    def pending(self):
+        """Return whether the screen is waiting on background work."""
+        return False
+
+    def close(self):
+        """Nothing to stop: matching happens as keys are typed."""
+
+    def on_key(self, key):
+        """Update the query or the selection for a keypress."""
+        if key.name == "KEY_ESCAPE":
+            self.done = True
+        elif key.name == "KEY_ENTER":
+            if self.finder.matches:
+                entry = self.finder.matches[self.selected].entry
+                views = git_states.StartState.views
+                self.choice = views[entry.node].instance
+                if entry.via is not None:
+                    self.via = views[entry.via].instance
+            self.done = True
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self.finder.delete()
+            self.selected = 0
+        elif key.name == "KEY_UP":
+            self.selected = max(0, self.selected - 1)
+        elif key.name == "KEY_DOWN":
+            last = len(self.finder.matches) - 1
+            self.selected = max(0, min(last, self.selected + 1))
+        elif not key.is_sequence and key.isprintable():
+            self.finder.type(key)
+            self.selected = 0
+
+    def regions(self, term):
+        """Return the compositor regions of the finder screen."""
+        graph = git_states.GRAPH
+        height = max(1, term.height - 5)
+        top = max(0, self.selected - height + 1)
+        lines = []
+        for idx, match in enumerate(self.finder.matches[top : top + height], top):
+            entry = match.entry
+            line = entry.text
+            if entry.via is not None:
+                line += (
+                    f" ({graph.nodes[entry.via].id} -> {graph.nodes[entry.node].id})"
+                )
+            else:
+                line += f" ({graph.nodes[entry.node].id})"
+            line = line[: term.width]
+            if idx == self.selected:
+                lines.append(term.reverse(line))
+            else:
+                lines.append(highlight(term, line, match.spans))
+        if not lines:
+            lines.append(term.bright_black("No matching states."))
+        return {
+            "title": [term.cyan(f"Jump to: {self.finder.query}")],
+            "body": [""] + lines + [""],
+            "banner": banner(
+                term,
+                "Type part of a title or option, up/down to select, "
+                "enter to jump, escape to cancel.",
+            ),
+        }
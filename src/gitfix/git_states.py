@@ -1,5 +1,10 @@
-"""Transition states to help locate the proper git steps to run."""
-from gitfix.state import State
+"""Transition states to help locate the proper git steps to run.
+
+Each state declares its title, its body and its ordered edges, as pairs of
+option label and target state. The declarations are compiled once into the
+index-addressed transition table in ``GRAPH``.
+"""
+from gitfix.state import State, compile_states
 
 
 class StartState(State):
@@ -8,31 +13,15 @@ class StartState(State):
     No ancestors.
     """
 
-    def __init__(self):
-        """Initialize the starting state."""
-        super().__init__()
-        self.options = ["Fix a change", "Find what is lost"]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Fix a change":
-            return CommitedQuestionState(self)
-        elif choice == "Find what is lost":
-            return LostNFoundState(self)
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = (
-            "Are you trying to find that which is lost or fix a change that was made?"
-        )
-        body = """Due to previous activities, you may have lost some work which you \
+    title = "Are you trying to find that which is lost or fix a change that was made?"
+    body = """Due to previous activities, you may have lost some work which you \
 would like to find and restore. Alternatively, you may have made some changes which \
 you would like to fix. Fixing includes updating, rewording, and deleting or \
 discarding."""
-        return title, body
+    edges = (
+        ("Fix a change", "CommitedQuestionState"),
+        ("Find what is lost", "LostNFoundState"),
+    )
 
 
 class CommitedQuestionState(State):
@@ -41,41 +30,16 @@ class CommitedQuestionState(State):
     Ancestor is StartState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(
-            parent,
-            options=[
-                "I am in the middle of a bad merge",
-                "I am in the middle of a bad rebase",
-                "Yes, commits were made",
-                "No, I have not yet committed",
-            ],
-        )
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "I am in the middle of a bad merge":
-            return BadMergeState(self)
-        elif choice == "I am in the middle of a bad rebase":
-            return BadRebaseState(self)
-        elif choice == "Yes, commits were made":
-            return CommittedState(self)
-        elif choice == "No, I have not yet committed":
-            return UncommittedState(self)
-        elif choice == "Parent":
-            return self.parent
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Have you committed?"
-        body = """If you have not yet committed that which you do not want, git \
+    title = "Have you committed?"
+    body = """If you have not yet committed that which you do not want, git \
 does not know anything about what you have done yet, so it is pretty easy to \
 undo what you have done."""
-        return title, body
+    edges = (
+        ("I am in the middle of a bad merge", "BadMergeState"),
+        ("I am in the middle of a bad rebase", "BadRebaseState"),
+        ("Yes, commits were made", "CommittedState"),
+        ("No, I have not yet committed", "UncommittedState"),
+    )
 
 
 class LostNFoundState(State):
@@ -84,23 +48,8 @@ class LostNFoundState(State):
     Ancestor is StartState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "I have lost some commits I know I made"
-        body = """First make sure that it was not on a different branch. Try \
+    title = "I have lost some commits I know I made"
+    body = """First make sure that it was not on a different branch. Try \
 `git log --grep foo --all` where `foo` is replaced with something unique in the \
 commits you made. You can also search with `gitk --all --date-order` to see \
 if anything looks likely.
@@ -151,7 +100,6 @@ and current state of that SHA (probably not recommended for stashes), you can \
 not recommended for stashes), you can `git stash apply SHA` (for the non-index \
 commit in a git-stash), you can `git stash merge SHA` or `git cherry-pick SHA` \
 (for either part of a stash or non-stashes), etc."""
-        return title, body
 
 
 class BadMergeState(State):
@@ -160,27 +108,12 @@ class BadMergeState(State):
     Ancestors are StartState -> CommitedQuestionState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Recovering from a broken merge"
-        body = """So, you were in the middle of a merge, have encountered one \
+    title = "Recovering from a broken merge"
+    body = """So, you were in the middle of a merge, have encountered one \
 or more conflicts, and you have now decided that it was a big mistake and want \
 to get out of the merge.
 
 The fastest way out of the merge is `git merge --abort` """
-        return title, body
 
 
 class BadRebaseState(State):
@@ -189,27 +122,12 @@ class BadRebaseState(State):
     Ancestors are StartState -> CommitedQuestionState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Recovering from a broken rebase"
-        body = """So, you were in the middle of a rebase, have encountered one \
+    title = "Recovering from a broken rebase"
+    body = """So, you were in the middle of a rebase, have encountered one \
 or more conflicts, and you have now decided that it was a big mistake and want \
 to get out of the rebase.
 
 The fastest way out of the rebase is `git rebase --abort`"""
-        return title, body
 
 
 class CommittedState(State):
@@ -218,32 +136,8 @@ class CommittedState(State):
     Ancestors are StartState -> CommitedQuestionState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "No, I have no changes/working directory is clean",
-            "Yes, I have bad changes/working directory is dirty: discard it",
-            "Yes, I have good changes/working directory is dirty: save it",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "No, I have no changes/working directory is clean":
-            return CommittedReallyState(self)
-        elif choice == "Yes, I have bad changes/working directory is dirty: discard it":
-            return UncommittedEverythingState(self)
-        elif choice == "Yes, I have good changes/working directory is dirty: save it":
-            return UncommittedCommitState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Do you have uncommitted stuff in your working directory?"
-        body = """So you have committed. However, before we go about fixing or \
+    title = "Do you have uncommitted stuff in your working directory?"
+    body = """So you have committed. However, before we go about fixing or \
 removing whatever is wrong, you should first ensure that any uncommitted changes \
 are safe, by either committing them (`git commit`) or by stashing them (`git stash \
 save "message"`) or getting rid of them.
@@ -251,7 +145,17 @@ save "message"`) or getting rid of them.
 `git status` will help you understand whether your working directory is clean or \
 not. It should report nothing for perfect safety ("Untracked files" only are \
 sometimes safe.)"""
-        return title, body
+    edges = (
+        ("No, I have no changes/working directory is clean", "CommittedReallyState"),
+        (
+            "Yes, I have bad changes/working directory is dirty: discard it",
+            "UncommittedEverythingState",
+        ),
+        (
+            "Yes, I have good changes/working directory is dirty: save it",
+            "UncommittedCommitState",
+        ),
+    )
 
 
 class UncommittedState(State):
@@ -260,37 +164,17 @@ class UncommittedState(State):
     Ancestors are StartState -> CommitedQuestionState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "Discard everything",
-            "Discard some things",
-            "I want to save my changes",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Discard everything":
-            return UncommittedEverythingState(self)
-        elif choice == "Discard some things":
-            return UncommittedSomethingsState(self)
-        elif choice == "I want to save my changes":
-            return UncommittedCommitState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Discard everything or just some things?"
-        body = (
-            "So you have not yet committed, the question is now whether you want to"
-            " undo everything which you have done since the last commit or just some"
-            " things, or just save what you have done?"
-        )
-        return title, body
+    title = "Discard everything or just some things?"
+    body = (
+        "So you have not yet committed, the question is now whether you want to"
+        " undo everything which you have done since the last commit or just some"
+        " things, or just save what you have done?"
+    )
+    edges = (
+        ("Discard everything", "UncommittedEverythingState"),
+        ("Discard some things", "UncommittedSomethingsState"),
+        ("I want to save my changes", "UncommittedCommitState"),
+    )
 
 
 class CommittedReallyState(State):
@@ -299,26 +183,8 @@ class CommittedReallyState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = ["Yes, pushes were made", "No pushes"]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes, pushes were made":
-            return PushedState(self)
-        elif choice == "No pushes":
-            return UnpushedState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Have you pushed?"
-        body = """So you have committed, the question is now whether you have \
+    title = "Have you pushed?"
+    body = """So you have committed, the question is now whether you have \
 made your changes (or at least the changes you are interesting in "fixing") \
 publicly available or not. Publishing history has a big impact on others working \
 on the same repository.
@@ -339,7 +205,10 @@ There will be reflog'd and dangling commits holding the state you just corrected
 This is normally a good thing and it will eventually go away by itself, but if for \
 some reason you want to cut your seat belts, you can expire the reflog now and \
 garbage collect with immediate pruning."""
-        return title, body
+    edges = (
+        ("Yes, pushes were made", "PushedState"),
+        ("No pushes", "UnpushedState"),
+    )
 
 
 class UncommittedEverythingState(State):
@@ -348,22 +217,8 @@ class UncommittedEverythingState(State):
     Ancestors are StartState -> CommitedQuestionState -> UncommittedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "How to undo all uncommitted changes"
-        body = """So you have not yet committed and you want to undo everything.\
+    title = "How to undo all uncommitted changes"
+    body = """So you have not yet committed and you want to undo everything.\
  Well, best practice is for you to stash the changes in case you were mistaken \
 and later decide that you really wanted them after all. \
 `git stash push -m "description of changes"`. You can revisit those stashes later \
@@ -382,7 +237,6 @@ both at once. Well, actually those command do not delete the files. They \
 show what files will be deleted. Replace the "n" in "-nd…" with "f" to \
 actually delete the files. Best practice is to ensure you are not deleting \
 what you should not by looking at the filenames first."""
-        return title, body
 
 
 class UncommittedCommitState(State):
@@ -391,22 +245,8 @@ class UncommittedCommitState(State):
     Ancestors are StartState -> CommitedQuestionState -> UncommittedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "How to save uncommitted changes"
-        body = """There are five ways you can save your uncommitted change.
+    title = "How to save uncommitted changes"
+    body = """There are five ways you can save your uncommitted change.
 
 |Description|Command|
 |:------------|:------|
@@ -416,7 +256,6 @@ class UncommittedCommitState(State):
 |Commit them on a new branch.|`git checkout -b new_branch; git commit -am "message"`|
 |Stash them for later|`git stash push -m "description"`|
 """
-        return title, body
 
 
 class PushedState(State):
@@ -425,77 +264,45 @@ class PushedState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
+    title = (
+        "Can you make a positive commit to fix the problem and what is the fix"
+        " class?"
+    )
+    body = """Rewriting public history is a bad idea. It requires everyone \
+else to do special things and you must publicly announce your failure. Ideally, \
+you will create either a commit to just fix the problem, or a new `git revert` \
+commit to create a new commit which undoes the changes made in a previous commit."""
+    edges = (
+        (
             "Yes, I can make a new commit, but the bad commit trashed a particular file"
             " in error (among other good things I want to keep)",
+            "PushedRestoreFileState",
+        ),
+        (
             "Yes, I can make a new commit, and the bad commit is a merge commit I want"
             " to totally remove",
+            "PushedNewMergeState",
+        ),
+        (
             "Yes, I can make a new commit, but the bad commit is a simple commit I want"
             " to totally remove",
+            "PushedNewSimpleState",
+        ),
+        (
             "Yes, I can make a new commit, and the bad commit has an error in it I want"
             " to fix",
+            "PushedFixitState",
+        ),
+        (
             "Yes, I can make a new commit, but history is all messed up and I have a"
             " replacement branch",
+            "BranchOverlayMergeState",
+        ),
+        (
             "No, I must rewrite published history and will have to inform others",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif (
-            choice
-            == "Yes, I can make a new commit, but the bad commit trashed a particular"
-            " file in error (among other good things I want to keep)"
-        ):
-            return PushedRestoreFileState(self)
-        elif (
-            choice
-            == "Yes, I can make a new commit, and the bad commit is a merge commit I"
-            " want to totally remove"
-        ):
-            return PushedNewMergeState(self)
-        elif (
-            choice
-            == "Yes, I can make a new commit, but the bad commit is a simple commit I"
-            " want to totally remove"
-        ):
-            return PushedNewSimpleState(self)
-        elif (
-            choice
-            == "Yes, I can make a new commit, and the bad commit has an error in it I"
-            " want to fix"
-        ):
-            return PushedFixitState(self)
-        elif (
-            choice
-            == "Yes, I can make a new commit, but history is all messed up and I have a"
-            " replacement branch"
-        ):
-            return BranchOverlayMergeState(self)
-        elif (
-            choice
-            == "No, I must rewrite published history and will have to inform others"
-        ):
-            return PushedOldState(self)
-
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = (
-            "Can you make a positive commit to fix the problem and what is the fix"
-            " class?"
-        )
-        body = """Rewriting public history is a bad idea. It requires everyone \
-else to do special things and you must publicly announce your failure. Ideally, \
-you will create either a commit to just fix the problem, or a new `git revert` \
-commit to create a new commit which undoes the changes made in a previous commit."""
-        return title, body
+            "PushedOldState",
+        ),
+    )
 
 
 class UnpushedState(State):
@@ -505,41 +312,21 @@ class UnpushedState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "Yes, I want to discard all unpushed changes",
-            "Yes, and I want to make my branch identical to some non-upstream ref",
-            "No, I want to fix some unpushed changes",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes, I want to discard all unpushed changes":
-            return DiscardAllUnpushedState(self)
-        elif (
-            choice
-            == "Yes, and I want to make my branch identical to some non-upstream ref"
-        ):
-            return ReplaceAllUnpushedState(self)
-        elif choice == "No, I want to fix some unpushed changes":
-            return FixUnpushedState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Do you want to discard all unpushed changes on this branch?"
-        body = """There is a shortcut in case you want to discard all changes made \
+    title = "Do you want to discard all unpushed changes on this branch?"
+    body = """There is a shortcut in case you want to discard all changes made \
 on this branch since you have last pushed or in any event, to make your local branch \
 identical to "upstream". Upstream, for local tracking branches, is the place you \
 get history from when you `git pull`: typically for master it might be origin/master. \
 There is a variant of this option which lets you make your local branch identical \
 to some other branch or ref."""
-        return title, body
+    edges = (
+        ("Yes, I want to discard all unpushed changes", "DiscardAllUnpushedState"),
+        (
+            "Yes, and I want to make my branch identical to some non-upstream ref",
+            "ReplaceAllUnpushedState",
+        ),
+        ("No, I want to fix some unpushed changes", "FixUnpushedState"),
+    )
 
 
 class DiscardAllUnpushedState(State):
@@ -549,26 +336,11 @@ class DiscardAllUnpushedState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Discarding all local commits on this branch"
-        body = """In order to discard all local commits on this branch, to \
+    title = "Discarding all local commits on this branch"
+    body = """In order to discard all local commits on this branch, to \
 make the local branch identical to the "upstream" of this branch, simply \
 run `git reset --hard @{u}`
 """
-        return title, body
 
 
 class ReplaceAllUnpushedState(State):
@@ -578,22 +350,8 @@ class ReplaceAllUnpushedState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Replacing all branch history/contents"
-        body = """If instead of discarding all local commits, you can make \
+    title = "Replacing all branch history/contents"
+    body = """If instead of discarding all local commits, you can make \
 your branch identical to some other branch, tag, ref, or SHA that exists on \
 your system.
 
@@ -607,7 +365,6 @@ Once you have found the correct state of your branch, you can get to that state
 `git reset --hard REF`
 
 Replace `REF` with the reference or SHA you want to get back to."""
-        return title, body
 
 
 class FixUnpushedState(State):
@@ -617,54 +374,30 @@ class FixUnpushedState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "Yes, I want to change the most recent commit",
-            "Yes, I want to discard the most recent commit(s)",
+    title = "Is the commit you want to fix the most recent?"
+    body = (
+        "While the techniques mentioned to deal with deeper commits will work on"
+        " the most recent, there are some convenient shortcuts you can take with"
+        " the most recent commit."
+    )
+    edges = (
+        ("Yes, I want to change the most recent commit", "ChangeLastState"),
+        ("Yes, I want to discard the most recent commit(s)", "RemoveLastState"),
+        (
             "Yes, I want to undo the last git operation(s) affecting the HEAD/tip of my"
             " branch (most useful for rebase, reset, or --amend)",
-            "No, I want to change an older commit",
+            "UndoTipState",
+        ),
+        ("No, I want to change an older commit", "ChangeDeepState"),
+        (
             "No, I want to restore a older version of/deleted file as a new commit",
+            "PushedRestoreFileState",
+        ),
+        (
             "Either way, I want to move a commit from one branch to another",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes, I want to change the most recent commit":
-            return ChangeLastState(self)
-        elif choice == "Yes, I want to discard the most recent commit(s)":
-            return RemoveLastState(self)
-        elif (
-            choice
-            == "Yes, I want to undo the last git operation(s) affecting the HEAD/tip of"
-            " my branch (most useful for rebase, reset, or --amend)"
-        ):
-            return UndoTipState(self)
-        elif choice == "No, I want to change an older commit":
-            return ChangeDeepState(self)
-        elif (
-            choice
-            == "No, I want to restore a older version of/deleted file as a new commit"
-        ):
-            return PushedRestoreFileState(self)
-        elif choice == "Either way, I want to move a commit from one branch to another":
-            return MoveCommitState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Is the commit you want to fix the most recent?"
-        body = (
-            "While the techniques mentioned to deal with deeper commits will work on"
-            " the most recent, there are some convenient shortcuts you can take with"
-            " the most recent commit."
-        )
-        return title, body
+            "MoveCommitState",
+        ),
+    )
 
 
 class ChangeLastState(State):
@@ -674,43 +407,23 @@ class ChangeLastState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "I want to remove the last commit",
+    title = (
+        "Do you want to remove or change the commit message/contents of the last"
+        " commit?"
+    )
+    body = ""
+    edges = (
+        ("I want to remove the last commit", "RemoveLastState"),
+        (
             "I want to update the author/message/contents of the last commit",
+            "UpdateLastState",
+        ),
+        (
             "I want to reorder, split, merge, or significantly rework the last"
             " commit(s)",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "I want to remove the last commit":
-            return RemoveLastState(self)
-        elif (
-            choice == "I want to update the author/message/contents of the last commit"
-        ):
-            return UpdateLastState(self)
-        elif (
-            choice
-            == "I want to reorder, split, merge, or significantly rework the last"
-            " commit(s)"
-        ):
-            return ReworkLastState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = (
-            "Do you want to remove or change the commit message/contents of the last"
-            " commit?"
-        )
-        body = ""
-        return title, body
+            "ReworkLastState",
+        ),
+    )
 
 
 class RemoveLastState(State):
@@ -720,22 +433,8 @@ class RemoveLastState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Removing the last commit"
-        body = """To remove the last commit from git, you can simply run \
+    title = "Removing the last commit"
+    body = """To remove the last commit from git, you can simply run \
 `git reset --hard HEAD^` If you are removing multiple commits from the top, \
 you can run `git reset --hard HEAD~2` to remove the last two commits. You can \
 increase the number to remove even more commits.
@@ -747,7 +446,6 @@ commits from the branch and from the index, but leave the working tree around.
 If you want to save the commits on a new branch name, then run \
 `git branch newbranchname` before doing the `git reset`.
         """
-        return title, body
 
 
 class UndoTipState(State):
@@ -757,22 +455,8 @@ class UndoTipState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Undoing the last few git operations affecting HEAD/my branch's tip"
-        body = """Practically every git operation which affects the repository \
+    title = "Undoing the last few git operations affecting HEAD/my branch's tip"
+    body = """Practically every git operation which affects the repository \
 is recorded in the git reflog. You may then use the reflog to look at the \
 state of the branches at previous times or even go back to the state of the \
 local branch at the time.
@@ -804,7 +488,6 @@ Note that any other commits you have performed since you did that "bad" \
 operation will then be lost. You could `git cherry-pick` or \
 `git rebase -p --onto` those other commits over.
         """
-        return title, body
 
 
 class ReworkLastState(State):
@@ -814,22 +497,8 @@ class ReworkLastState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState -> ChangeLastState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Reworking the last commit"
-        body = """WARNING: These techniques should only be used for non-merge \
+    title = "Reworking the last commit"
+    body = """WARNING: These techniques should only be used for non-merge \
 commits. If you have a merge commit, you are better off deleting the merge \
 and recreating it.
 
@@ -844,7 +513,6 @@ the commits and are left with an undifferentiated working directory. If you \
 are trying to squash all of the commits together, or rework which bits are \
 in which commits, this may be what you want.
 """
-        return title, body
 
 
 class ChangeDeepState(State):
@@ -853,30 +521,12 @@ class ChangeDeepState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
-            "Yes, I want to remove an entire commit",
-            "No, I want to change an older commit",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes, I want to remove an entire commit":
-            return RemoveDeepState(self)
-        elif choice == "No, I want to change an older commit":
-            return ModifyDeepState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Do you want to remove an entire commit?"
-        body = ""
-        return title, body
+    title = "Do you want to remove an entire commit?"
+    body = ""
+    edges = (
+        ("Yes, I want to remove an entire commit", "RemoveDeepState"),
+        ("No, I want to change an older commit", "ModifyDeepState"),
+    )
 
 
 class PushedRestoreFileState(State):
@@ -886,22 +536,8 @@ class PushedRestoreFileState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Making a new commit to restore a file deleted earlier"
-        body = """The file may have been deleted or every change to that file in that \
+    title = "Making a new commit to restore a file deleted earlier"
+    body = """The file may have been deleted or every change to that file in that \
 commit (and all commits since then) should be destroyed. If so, you can simply \
 checkout a version of the file which you know is good.
 
@@ -917,7 +553,6 @@ git checkout SHA -- path/to/filename
 
 Obviously replace `SHA` with the reference that is good. You can then add and \
 commit as normal to fix the problem."""
-        return title, body
 
 
 class MoveCommitState(State):
@@ -927,22 +562,8 @@ class MoveCommitState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Moving a commit from one branch to another"
-        body = """So, you have a commit which is in the wrong place and you \
+    title = "Moving a commit from one branch to another"
+    body = """So, you have a commit which is in the wrong place and you \
 want to move it from one branch to another. In order to do this, you will \
 need to know the SHA of the first and last commit (in a continuous series of \
 commits) you want to move (those values are the same if you are moving only \
@@ -992,7 +613,6 @@ which were deleted. They may have been recreated incorrectly. If so you can \
 either undo the delete or try to delete the bad merge and try to recreate it \
 manually, or create a fake (--ours) merge from the same SHA so that git is \
 aware that the merge occurred."""
-        return title, body
 
 
 class UpdateLastState(State):
@@ -1002,22 +622,8 @@ class UpdateLastState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState -> PushedOldState -> UnpushedState -> FixUnpushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Updating the last commit's contents or commit message"
-        body = """To update the last commit's contents, author, or commit \
+    title = "Updating the last commit's contents or commit message"
+    body = """To update the last commit's contents, author, or commit \
 message for a commit which you have not pushed or otherwise published, first \
 you need to get the index into the correct state you wish the commit to \
 reflect. If you are changing the file contents, typically you would modify \
@@ -1036,7 +642,6 @@ to update the last commit. Yes, you can use `-a` if you want to avoid the \
 `git add` suggested in the previous paragraph. You can also use `--author` \
 to change the author information.
 """
-        return title, body
 
 
 class RemoveDeepState(State):
@@ -1045,22 +650,8 @@ class RemoveDeepState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Removing an entire commit"
-        body = """You must first identify the SHA of the commit you wish to remove. \
+    title = "Removing an entire commit"
+    body = """You must first identify the SHA of the commit you wish to remove. \
 You can do this using `gitk --date-order` or using \
 `git log --graph --decorate --oneline` You are looking for the 40 character SHA-1 \
 hash ID (or the 7 character abbreviation). Yes, if you know the `^` or `~` \
@@ -1083,7 +674,6 @@ commits and manually re-merge the "bad" merges. Or you can just suffer with the
 inappropriate topology (perhaps by creating fake merges with \
 `git merge --ours otherbranch` so that subsequent development work on those branches\
  will be properly merged in with the correct merge-base)."""
-        return title, body
 
 
 class ModifyDeepState(State):
@@ -1092,31 +682,15 @@ class ModifyDeepState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
+    title = "Do you want to remove/change/rename a particular file/directory "
+    body = ""
+    edges = (
+        (
             "Yes please, I want to make a change involving all git commits",
-            "No, I only want to change a single commit",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes please, I want to make a change involving all git commits":
-            return BulkRewriteHistoryState(self)
-        elif choice == "No, I only want to change a single commit":
-            return ChangeSingleDeepState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Do you want to remove/change/rename a particular file/directory "
-        "from all commits during all of git's history"
-        body = ""
-        return title, body
+            "BulkRewriteHistoryState",
+        ),
+        ("No, I only want to change a single commit", "ChangeSingleDeepState"),
+    )
 
 
 class UncommittedSomethingsState(State):
@@ -1125,22 +699,8 @@ class UncommittedSomethingsState(State):
     Ancestors are StartState -> CommitedQuestionState -> UncommittedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "How to undo some uncommitted changes"
-        body = """So you have not yet committed and you want to undo some things.\
+    title = "How to undo some uncommitted changes"
+    body = """So you have not yet committed and you want to undo some things.\
 `git status` will tell you exactly what you need to do. For example:
 
 ```bash
@@ -1168,7 +728,6 @@ Perhaps you should run `git stash save -p "description"` instead and select \
 the changes you no longer want to be stashed, instead of permanently removing \
 them.
 """
-        return title, body
 
 
 class BulkRewriteHistoryState(State):
@@ -1177,43 +736,23 @@ class BulkRewriteHistoryState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = [
+    title = "Changing all commits during all of git's history"
+    body = (
+        "You have not pushed but still somehow want to change all commits in all of"
+        " git's history? Strange."
+    )
+    edges = (
+        (
             "Not just removing data (eg. re-arranging directory structure for all"
             " commits), or just wanting to use standard tools",
+            "FilterBranchState",
+        ),
+        (
             "Want to only remove unwanted data (big files, private data, etc) and am"
             " willing to use a third party tool to do the job more quickly",
-        ]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif (
-            choice
-            == "Not just removing data (eg. re-arranging directory structure for all"
-            " commits), or just wanting to use standard tools"
-        ):
-            return FilterBranchState(self)
-        elif (
-            choice
-            == "Want to only remove unwanted data (big files, private data, etc) and am"
-            " willing to use a third party tool to do the job more quickly"
-        ):
-            return BfgState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Changing all commits during all of git's history"
-        body = (
-            "You have not pushed but still somehow want to change all commits in all of"
-            " git's history? Strange."
-        )
-        return title, body
+            "BfgState",
+        ),
+    )
 
 
 class ChangeSingleDeepState(State):
@@ -1222,32 +761,17 @@ class ChangeSingleDeepState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = ["Yes, a merge commit is involved", "No, only simple commits"]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Yes, a merge commit is involved":
-            return ChangeSingleDeepMergeState(self)
-        elif choice == "No, only simple commits":
-            return ChangeSingleDeepSimpleState(self)
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Is a merge commit involved?"
-        body = (
-            "If the commit you are trying to change is a merge commit, or if there is a"
-            " merge commit between the commit you are trying to change and the tip of"
-            " the branch you are on, then you need to do some special handling of the"
-            " situation."
-        )
-        return title, body
+    title = "Is a merge commit involved?"
+    body = (
+        "If the commit you are trying to change is a merge commit, or if there is a"
+        " merge commit between the commit you are trying to change and the tip of"
+        " the branch you are on, then you need to do some special handling of the"
+        " situation."
+    )
+    edges = (
+        ("Yes, a merge commit is involved", "ChangeSingleDeepMergeState"),
+        ("No, only simple commits", "ChangeSingleDeepSimpleState"),
+    )
 
 
 class ChangeSingleDeepMergeState(State):
@@ -1256,22 +780,8 @@ class ChangeSingleDeepMergeState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState -> ChangeSingleDeepState
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Changing a single commit involving a merge"
-        body = """Note, that this only applies if you have a merge commit. If a fast-forward (ff) merge occurred you only have simple commits, so should use other instructions.
+    title = "Changing a single commit involving a merge"
+    body = """Note, that this only applies if you have a merge commit. If a fast-forward (ff) merge occurred you only have simple commits, so should use other instructions.
 
 Oh dear. This is going to get a little complicated. It should all work out, though. You will need to use a nonce branch as a placeholder. I will call the nonce branch "nonce" in the following example. However, you may use any branch name that is not currently in use. You can delete it immediately after you are done.
 
@@ -1316,7 +826,6 @@ If some of the commits after the commit you changed are merge commits, please be
 - Delete the nonce branch
 
 You don't need it. It was just there to communicate an SHA between two steps in the above process. `git branch -d nonce`"""
-        return title, body
 
 
 class ChangeSingleDeepSimpleState(State):
@@ -1325,22 +834,8 @@ class ChangeSingleDeepSimpleState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState -> ChangeSingleDeepState
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Changing a single commit involving only simple commits"
-        body = """You must first identify the SHA of the commit you wish to remove. You can do this using `gitk --date-order` or using `git log --graph --decorate --oneline` You are looking for the 40 character SHA-1 hash ID (or the 7 character abbreviation). Yes, if you know the `^` or `~` shortcuts you may use those.
+    title = "Changing a single commit involving only simple commits"
+    body = """You must first identify the SHA of the commit you wish to remove. You can do this using `gitk --date-order` or using `git log --graph --decorate --oneline` You are looking for the 40 character SHA-1 hash ID (or the 7 character abbreviation). Yes, if you know the `^` or `~` shortcuts you may use those.
 
 ```bash
 git rebase -i SHA^
@@ -1351,7 +846,6 @@ Replace `SHA` with the reference you want to get rid of. The `^` in that command
 You will be dumped in an editor with a bunch of lines starting with pick. The oldest commit, the one you are probably interested in changing, is first. You will want to change the "pick" to "reword" or "edit", or perhaps even "squash" depending on what your goal is.
 
 When using "edit" to change contents or author, when you are dumped into the shell to make your change, make your change, `git add` as normal, and then run `git commit --amend` (including changing the author information with --author). When you are satisfied, you should run `git rebase --continue`."""
-        return title, body
 
 
 class PushedNewSimpleState(State):
@@ -1360,22 +854,8 @@ class PushedNewSimpleState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Reverting an old simple pushed commit"
-        body = """To create an positive commit to remove the effects of a \
+    title = "Reverting an old simple pushed commit"
+    body = """To create an positive commit to remove the effects of a \
 simple (non-merge) commit, you must first identify the SHA of the commit you \
 want to revert. You can do this using `gitk --date-order` or using \
 `git log --graph --decorate --oneline`. You are looking for the 40 character \
@@ -1388,7 +868,6 @@ git revert SHA
 
 Obviously replace `SHA` with the reference you want to revert. If you want \
 to revert multiple SHAs, you may specify a range or a list of SHAs."""
-        return title, body
 
 
 class PushedFixitState(State):
@@ -1397,25 +876,10 @@ class PushedFixitState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Making a new commit to fix an old commit"
-        body = """If the problem in the old commit is just something was done \
+    title = "Making a new commit to fix an old commit"
+    body = """If the problem in the old commit is just something was done \
 incorrectly, go ahead and make a normal commit to fix the problem. Feel free to \
 reference the old commit SHA in the commit message."""
-        return title, body
 
 
 class BranchOverlayMergeState(State):
@@ -1424,22 +888,8 @@ class BranchOverlayMergeState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Rewriting an old branch with a new branch with a new commit"
-        body = """If the state of a branch is contaminated beyond repair and \
+    title = "Rewriting an old branch with a new branch with a new commit"
+    body = """If the state of a branch is contaminated beyond repair and \
 you have pushed that branch or otherwise do not want to rewrite the existing \
 history, then you can make a new commit which overwrites the original branch \
 with the new one and pretends this was due to a merge. The command is a bit \
@@ -1480,7 +930,6 @@ git commit -m "Rewrite $destination with $source"
 ```
 
 """
-        return title, body
 
 
 class PushedOldState(State):
@@ -1489,25 +938,8 @@ class PushedOldState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = ["Proceed with fixing the old commit"]
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        elif choice == "Proceed with fixing the old commit":
-            return UnpushedState(self)
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "I am a bad person and must rewrite published history"
-        body = """Hopefully you read the previous reference and fully understand \
+    title = "I am a bad person and must rewrite published history"
+    body = """Hopefully you read the previous reference and fully understand \
 why this is bad and what you have to tell everyone else to do in order to \
 recover from this condition. Assuming this, you simply need to use the commands \
 which assume that you have not yet pushed and do them as normal. \
@@ -1519,7 +951,7 @@ then will need to send an email to everyone who might have pulled the history \
 telling them that history was rewritten and they need to `git pull --rebase` \
 and do a bit of history rewriting of their own if they branched or tagged from \
 the now outdated history."""
-        return title, body
+    edges = (("Proceed with fixing the old commit", "UnpushedState"),)
 
 
 class FilterBranchState(State):
@@ -1528,25 +960,9 @@ class FilterBranchState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState -> BulkRewriteHistoryState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Arbitrarily changing all commits during all of git's history"
-        body = """`git filter-branch` is a powerful, complex command that allows you to perform arbitary scriptable operations on all commits in git repository history. This flexibility can make it quite slow on big repos, and makes using the command quite difficult. See: https://git-scm.com/docs/git-filter-branch
+    title = "Arbitrarily changing all commits during all of git's history"
+    body = """`git filter-branch` is a powerful, complex command that allows you to perform arbitary scriptable operations on all commits in git repository history. This flexibility can make it quite slow on big repos, and makes using the command quite difficult. See: https://git-scm.com/docs/git-filter-branch
         """
-        return title, body
 
 
 class BfgState(State):
@@ -1555,26 +971,11 @@ class BfgState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> UnpushedState -> FixUnpushedState -> ChangeDeepState -> ModifyDeepState -> BulkRewriteHistoryState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = (
-            "Use The BFG to remove unwanted data, like big files or passwords, from Git"
-            " repository history"
-        )
-        body = """https://rtyley.github.io/bfg-repo-cleaner/ is a simpler, faster alternative to `git filter-branch`, specifically designed for cleansing bad data out of your Git repository history - it operates over all branches and tags in your project to purge data you don't want retained anywhere. Some examples:
+    title = (
+        "Use The BFG to remove unwanted data, like big files or passwords, from Git"
+        " repository history"
+    )
+    body = """https://rtyley.github.io/bfg-repo-cleaner/ is a simpler, faster alternative to `git filter-branch`, specifically designed for cleansing bad data out of your Git repository history - it operates over all branches and tags in your project to purge data you don't want retained anywhere. Some examples:
 
 Remove all blobs bigger than 1 megabyte (to make your repo take up less space):
 
@@ -1588,7 +989,6 @@ Replace all passwords listed in a file with ***REMOVED*** wherever they occur in
 $ bfg --replace-text passwords.txt  my-repo.git
 ```
 """
-        return title, body
 
 
 class PushedNewMergeState(State):
@@ -1597,23 +997,8 @@ class PushedNewMergeState(State):
     Ancestors are StartState -> CommitedQuestionState -> CommittedState -> CommittedReallyState -> PushedState.
     """
 
-    def __init__(self, parent):
-        """Initialize the state."""
-        super().__init__(parent)
-        self.options = []
-
-    def on_event(self, event):
-        """Decide on the next state, based on the event."""
-        choice = self.parse_choice(event)
-        if choice == "Parent":
-            return self.parent
-        else:
-            return self
-
-    def describe(self):
-        """Describe the state."""
-        title = "Reverting a merge commit"
-        body = """Note, that this only applies if you have a merge commit. \
+    title = "Reverting a merge commit"
+    body = """Note, that this only applies if you have a merge commit. \
 If a fast-forward (ff) merge occurred you only have simple commits, so should \
 use another method.
 
@@ -1680,4 +1065,6 @@ to the branch, it can be a lot of work. At this time, I will not walk you throug
 the process of recreating the donor branch. \
 See https://github.com/git/git/blob/master/Documentation/howto/revert-a-faulty-merge.txthowto/revert-a-faulty-merge.txt \
 for more information."""
-        return title, body
+
+
+GRAPH = compile_states(State.__subclasses__())
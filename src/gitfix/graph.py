@@ -0,0 +1,79 @@
+"""Declarative decision graph and its compiled transition table."""
+from collections import namedtuple
+
+Node = namedtuple("Node", ["id", "title", "body", "edges"])
+Node.__doc__ = """A state of the decision graph.
+
+``edges`` is an ordered sequence of ``(option label, target node id)`` pairs;
+the position of an edge is the number the user types to follow it.
+"""
+
+
+class Graph:
+    """A decision graph compiled into index-addressed transition tables."""
+
+    def __init__(self, nodes):
+        """Compile the nodes, resolving every edge target to a node index."""
+        self.nodes = tuple(nodes)
+        self.ids = {node.id: idx for idx, node in enumerate(self.nodes)}
+        self.options = tuple(
+            tuple(label for label, _ in node.edges) for node in self.nodes
+        )
+        try:
+            self.transitions = tuple(
+                tuple(self.ids[target] for _, target in node.edges)
+                for node in self.nodes
+            )
+        except KeyError as e:
+            raise ValueError(f"Edge to unknown state {e.args[0]!r}") from None
+
+    def __len__(self):
+        """Return the number of nodes in the graph."""
+        return len(self.nodes)
+
+    def index(self, node_id):
+        """Return the index of the node called ``node_id``."""
+        return self.ids[node_id]
+
+    def transition(self, node, choice):
+        """Return the node reached from ``node`` by option ``choice``, or None."""
+        targets = self.transitions[node]
+        if 0 <= choice < len(targets):
+            return targets[choice]
+        return None
+
+    def to_data(self):
+        """Return the graph as plain lists and dicts, e.g. to dump as JSON."""
+        return [
+            {
+                "id": node.id,
+                "title": node.title,
+                "body": node.body,
+                "edges": [list(edge) for edge in node.edges],
+            }
+            for node in self.nodes
+        ]
+
+    def checksum(self):
+        """Return a checksum of the content of the graph.
+
+        Files built from the graph at package build time record it, to be
+        ignored when the graph has changed since.
+        """
+        import json
+        import zlib
+
+        return zlib.crc32(json.dumps(self.to_data()).encode("utf-8"))
+
+    @classmethod
+    def from_data(cls, data):
+        """Build a graph from the output of ``to_data``."""
+        return cls(
+            Node(
+                item["id"],
+                item["title"],
+                item["body"],
+                tuple(map(tuple, item["edges"])),
+            )
+            for item in data
+        )
@@ -0,0 +1,272 @@
+"""Streaming search for lost commits and stashes.
+
+``git fsck`` walks the whole object graph, which takes minutes on very large
+repositories. Its output is read as it is produced: the dangling commits it
+reports are described in small batches with ``git log`` and ranked as they
+arrive, so the best candidates so far can be shown long before the walk ends.
+"""
+import heapq
+import re
+import subprocess  # noqa: S404
+import threading
+import time
+from collections import namedtuple
+
+from gitfix.compositor import banner
+from gitfix.probes import kill_git, spawn_git
+
+TOP_K = 20
+BATCH_SIZE = 32
+
+Candidate = namedtuple("Candidate", ["sha", "time", "kind", "subject", "paths"])
+Candidate.__doc__ = """A dangling commit that may hold lost work.
+
+``kind`` is ``"stash"`` for the commits left behind by a dropped stash, and
+``"commit"`` otherwise.
+"""
+
+_stash_re = re.compile(r"^(WIP on|On) [^:]+: ")
+
+
+def match_score(candidate, terms):
+    """Return how well a candidate matches the query terms.
+
+    A term found in the subject counts more than one found in a path.
+    """
+    subject = candidate.subject.lower()
+    score = 0
+    for term in terms:
+        if term in subject:
+            score += 2
+        elif any(term in path.lower() for path in candidate.paths):
+            score += 1
+    return score
+
+
+def parse_log(output):
+    """Parse ``git log`` output in the format used by ``describe``."""
+    for record in output.split("\x1e")[1:]:
+        header, _, names = record.partition("\n")
+        sha, commit_time, parents, subject = header.split("\x00", 3)
+        kind = (
+            "stash"
+            if len(parents.split()) > 1 and _stash_re.match(subject)
+            else "commit"
+        )
+        paths = tuple(name for name in names.splitlines() if name)
+        yield Candidate(sha, int(commit_time), kind, subject, paths)
+
+
+class TopK:
+    """Keeps the ``k`` best items pushed so far, in a bounded min-heap."""
+
+    def __init__(self, k):
+        """Start empty."""
+        self.k = k
+        self._heap = []
+
+    def push(self, key, item):
+        """Offer an item; it is kept only if it ranks among the best ``k``."""
+        entry = (key, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        """Return the kept items, best first."""
+        return [item for _, item in sorted(self._heap, reverse=True)]
+
+
+class LostWorkFinder:
+    """Streams dangling commits from ``git fsck`` and ranks them in a thread."""
+
+    def __init__(self, cwd, query="", k=TOP_K):
+        """Start scanning the repository in ``cwd``."""
+        self.cwd = cwd
+        self.terms = query.lower().split()
+        self.scanned = 0
+        self.error = None
+        self._top = TopK(k)
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._closed = False
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._scan, daemon=True)
+        self._thread.start()
+
+    def _spawn(self, *args, **kwargs):
+        """Start a git process that ``close`` will kill."""
+        process = spawn_git(self.cwd, *args, **kwargs)
+        with self._lock:
+            self._processes.add(process)
+            if self._closed:
+                kill_git(process)
+        return process
+
+    def _scan(self):
+        """Read the dangling commits reported by fsck, batch by batch."""
+        fsck = self._spawn("fsck", "--no-reflogs", "--no-progress")
+        batch = []
+        try:
+            for line in fsck.stdout:
+                words = line.split()
+                if words[:2] == ["dangling", "commit"]:
+                    batch.append(words[2])
+                if len(batch) >= BATCH_SIZE:
+                    self._describe(batch)
+                    batch = []
+            if batch:
+                self._describe(batch)
+            if fsck.wait() and not self._closed:
+                self.error = "git fsck failed"
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            self.error = str(e)
+        finally:
+            self._done.set()
+
+    def _describe(self, shas):
+        """Describe a batch of commits and rank them."""
+        process = self._spawn(
+            "log",
+            "--no-walk=unsorted",
+            "--stdin",
+            "-m",
+            "--first-parent",
+            "--name-only",
+            "--format=%x1e%H%x00%ct%x00%P%x00%s",
+            stdin=subprocess.PIPE,
+        )
+        output, _ = process.communicate("\n".join(shas) + "\n")
+        with self._lock:
+            self._processes.discard(process)
+            for candidate in parse_log(output):
+                key = (match_score(candidate, self.terms), candidate.time)
+                self._top.push(key, candidate)
+            self.scanned += len(shas)
+
+    def pending(self):
+        """Return whether the scan is still running."""
+        return not self._done.is_set()
+
+    def results(self):
+        """Return the best candidates found so far, best first."""
+        with self._lock:
+            return self._top.items()
+
+    def close(self):
+        """Stop scanning, killing the git processes still running."""
+        with self._lock:
+            self._closed = True
+            processes = list(self._processes)
+        for process in processes:
+            kill_git(process)
+
+
+def create_branch(cwd, candidate):
+    """Create a branch at a candidate and return its name."""
+    name = f"recovered-{candidate.sha[:10]}"
+    process = spawn_git(cwd, "branch", name, candidate.sha)
+    process.communicate()
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, ["git", "branch"])
+    return name
+
+
+class LostWorkView:
+    """Screen listing lost commits and stashes as they are found."""
+
+    def __init__(self, cwd):
+        """Start by asking for the words to look for."""
+        self.cwd = cwd
+        self.query = ""
+        self.finder = None
+        self.selected = 0
+        self.message = ""
+        self.done = False
+        self.choice = None
+
+    def pending(self):
+        """Return whether results are still streaming in."""
+        return self.finder is not None and self.finder.pending()
+
+    def on_key(self, key):
+        """Edit the query, or move through and pick from the results."""
+        if key.name == "KEY_ESCAPE":
+            self.close()
+            self.done = True
+        elif self.finder is None:
+            self._edit_query(key)
+        elif key.name == "KEY_UP":
+            self.selected = max(0, self.selected - 1)
+        elif key.name == "KEY_DOWN":
+            last = len(self.finder.results()) - 1
+            self.selected = max(0, min(last, self.selected + 1))
+        elif key.name == "KEY_ENTER":
+            self._branch()
+        elif key == "/":
+            self.close()
+            self.finder = None
+
+    def _edit_query(self, key):
+        """Update the query, starting the scan on enter."""
+        if key.name == "KEY_ENTER":
+            self.finder = LostWorkFinder(self.cwd, self.query)
+            self.selected = 0
+            self.message = ""
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self.query = self.query[:-1]
+        elif not key.is_sequence and key.isprintable():
+            self.query += key
+
+    def _branch(self):
+        """Create a branch at the selected candidate."""
+        results = self.finder.results()
+        if not results:
+            return
+        candidate = results[min(self.selected, len(results) - 1)]
+        try:
+            self.message = f"Created branch {create_branch(self.cwd, candidate)}"
+        except (OSError, subprocess.SubprocessError):
+            self.message = f"Could not create a branch at {candidate.sha[:10]}"
+
+    def close(self):
+        """Stop any scan in progress."""
+        if self.finder is not None:
+            self.finder.close()
+
+    def regions(self, term):
+        """Return the compositor regions of the lost work screen."""
+        if self.finder is None:
+            return {
+                "title": [term.cyan(f"Find lost work: {self.query}")],
+                "body": [
+                    "",
+                    "Type words from the commit message or file paths, or nothing",
+                    "to list the most recent lost commits and stashes first.",
+                    "",
+                ],
+                "banner": banner(term, "Press enter to search, escape to cancel."),
+            }
+        lines = []
+        for idx, candidate in enumerate(self.finder.results()):
+            day = time.strftime("%Y-%m-%d", time.localtime(candidate.time))
+            line = f"{day} {candidate.sha[:10]} [{candidate.kind}] {candidate.subject}"
+            line = line[: term.width]
+            lines.append(term.reverse(line) if idx == self.selected else line)
+        if self.finder.pending():
+            status = f"Scanning... {self.finder.scanned} dangling commits so far"
+        elif self.finder.error:
+            status = self.finder.error
+        else:
+            status = f"Done: {self.finder.scanned} dangling commits found"
+        return {
+            "title": [term.cyan(f"Lost work matching: {self.query or '(anything)'}")],
+            "body": [""] + lines + [""],
+            "banner": banner(
+                term,
+                "Up/down to select, enter to create a branch, "
+                "'/' to search again, escape to go back.",
+            ),
+            "status": ["", term.bright_black(self.message or status)],
+        }
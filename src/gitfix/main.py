@@ -1,160 +1,456 @@
 """CLI event loop and terminal printing functions."""
-import re
+import os
 import sys
 
-from blessed import Terminal
-from rich import box
-from rich.align import Align
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.style import Style
-from rich.table import Table
-
-from gitfix import git_states
-
-
-def parse_md(md):
-    """Parse markdown and return a Rich markdown object."""
-    table_re = r"(^|[^|]\n)((?:^\|[^\n]*\|(?:\n|$))+)([^|]|$)"
-    md = re.sub(r"\n([\r\t ]*\n)+", r"\n\n", md, flags=re.MULTILINE)
-    md = re.sub(r"^[\t ]*\|", r"|", md, flags=re.MULTILINE)
-    md = re.sub(r"\|[\t ]*$", r"|", md, flags=re.MULTILINE)
-    tables = []
-    md = re.sub(
-        table_re,
-        lambda match: parse_md_table(match, tables),
-        md,
-        flags=re.MULTILINE | re.S,
-    )
-    console = Console()
-    with console.capture() as capture:
-        console.print(
-            Markdown(md, inline_code_lexer="bash", inline_code_theme="monokai")
-        )
-    formated_text = capture.get()
-    for i in range(len(tables)):
-        formated_text = re.sub("<#MD-TABLE-" + str(i) + "#>", tables[i], formated_text)
-    return re.sub(r"<br/?>", r"\n", formated_text).strip()
-
-
-def parse_md_table(match, tables_memo):
-    """Parse a markdown table and return a Rich markdown object."""
-    [table_header, table_body, columns] = split_md_table(match.group(2))
-    b = box.Box("    \n    \n══╪═\n    \n┈┈┼┈\n┈┈┼┈\n    \n    ")
-    table = Table(
-        box=b, show_header=False, show_edge=False, border_style=Style(color="#222222")
-    )
-    for col_align in columns:
-        table.add_column(None, justify=col_align)
-    sty_header = Style(bgcolor="yellow", color="#000000", bold=True)
-    sty_odd = Style(bgcolor="#111111", color="white")
-    sty_even = Style(bgcolor="#222222", color="white")
-    for row in table_header:
-        row = map(Align.center, row)
-        table.add_row(*row, style=sty_header)
-    for num, row in enumerate(table_body, start=1):
-        style = sty_even if (num % 2 == 0) else sty_odd
-        # Format any code blocks in table
-        formatted_row = [
-            Markdown(col, inline_code_lexer="bash", inline_code_theme="monokai")
-            for col in row
-        ]
-        table.add_row(*formatted_row, style=style)
-
-    console = Console()
-    with console.capture() as capture:
-        console.print(table)
-    formated_text = "\n".join(capture.get().split("\n")[0:-1])
-    before = "" if match.group(1) == "\n\n" else "\n"
-    after = "  " if match.group(3) == "\n" else "  \n"
-    tables_memo.append(before + formated_text)
-    return f"{match.group(1)}<#MD-TABLE-{len(tables_memo) - 1}#>{after}{match.group(3)}"
-
-
-def map_md_table_align_col(cell):
-    """Map markdown table column alignments."""
-    if re.match(r"^\s*:-+:\s*$", cell):
-        return "center"
-    elif re.match(r"^\s*-+:\s*$", cell):
-        return "right"
-    else:
-        return "left"
-
-
-def split_md_table(md_table):
-    """Split a markdown table into header, body and columns."""
-    md_table = re.sub(r"^\||\|$", "", md_table, flags=re.MULTILINE)
-    table_header = []
-    table_body = []
-    columns = []
-    table = list(
-        map(
-            lambda row: list(map(lambda cell: cell.strip(), row.split("|"))),
-            md_table.strip().split("\n"),
-        )
-    )
-    has_header = False
-    for row in table:
-        if re.match(r"^\s*:?-+:?\s*$", row[0]):
-            has_header = True
-    in_header = has_header
-    for row in table:
-        if in_header:
-            if re.match(r"^\s*:?-+:?\s*$", row[0]):
-                in_header = False
-                columns = map(map_md_table_align_col, row)
-            else:
-                table_header.append(row)
-        else:
-            table_body.append(row)
-    return [table_header, table_body, columns]
+from gitfix import git_states, repository
+from gitfix.compositor import Compositor, Viewport, banner
+from gitfix.navigation import Navigator
+from gitfix.render import color_system_for, is_rendered, render_state
+
+BANNER = (
+    "Choose an option, press left/right arrow to go back/forward, '/' to search, "
+    "Ctrl-P to jump to a state, "
+    "or press 'q' to quit."
+)
+
+# Screens offered on some states, by state name: (key, description, view),
+# where the view is imported from "module:class" when first opened.
+TOOLS = {
+    "LostNFoundState": (
+        (
+            "f",
+            "search this repository for lost commits and stashes",
+            "gitfix.lostfound:LostWorkView",
+        ),
+        ("r", "browse the reflog", "gitfix.reflog:ReflogView"),
+    ),
+    "UndoTipState": (
+        ("r", "browse the reflog", "gitfix.reflog:ReflogView"),
+        ("c", "check a commit SHA", "gitfix.objects:ObjectView"),
+    ),
+    "MoveCommitState": (("c", "check a commit SHA", "gitfix.objects:ObjectView"),),
+    "RemoveDeepState": (("c", "check a commit SHA", "gitfix.objects:ObjectView"),),
+}
+
+# Keys scrolling long bodies: (lines, pages) to scroll by.
+SCROLL_KEYS = {
+    "j": (1, 0),
+    "k": (-1, 0),
+    "KEY_PGDOWN": (0, 1),
+    "KEY_PGUP": (0, -1),
+}
+# Ctrl-P opens the jump-to-state finder.
+FINDER_KEY = "\x10"
 
 
-def clear_screen(term):
+def clear_screen(backend):
     """Clear the terminal."""
-    print(term.home + term.black_on_black + term.clear)
+    term = backend.term
+    backend.write(f"{term.home}{term.black_on_black}{term.clear}\n".encode("utf-8"))
 
 
-def display_state(term, console, description):
-    """Display the current state of the git fix walkthrough."""
-    title, body = description[0], description[1]
-    print(term.cyan(f"{title}"))
-    print(parse_md(body))
-    print()
+def display_state(term, color_system, state):
+    """Return the title and body lines of the current state."""
+    title = state.describe()[0]
+    title_lines = [term.cyan(line) for line in term.wrap(title) or [""]]
+    body_lines = render_state(state, term.width, color_system).split("\n")
+    return title_lines, body_lines + [""]
 
 
-def display_options(term, options):
-    """Display the available options for the current state."""
+def display_options(term, options, annotations=None):
+    """Return the lines listing the available options for the current state.
+
+    ``annotations`` maps option indexes to what was detected about them.
+    """
+    annotations = annotations or {}
+    lines = []
     for idx, option in enumerate(options):
-        print(term.yellow(f"{idx}: {option}"))
-
-
-def main():
-    """Main function, prompt loop."""
-    term = Terminal()
-    console = Console()
-    with term.cbreak(), term.hidden_cursor():
-        clear_screen(term)
-        current_state = git_states.StartState()
-
-        while True:
-            print(term.home + term.clear + term.move_y(term.height // 2))
-            display_state(term, console, current_state.describe())
-            print(
-                term.black_on_green(
-                    term.center(
-                        "Choose an option, press left arrow to go back, or press 'q' to quit."
-                    )
-                )
+        text = f"{idx}: {option}"
+        if idx in annotations:
+            text += " " + term.green(f"[detected: {annotations[idx]}]")
+        wrapped = term.wrap(text, subsequent_indent="   ")
+        lines.extend(term.yellow(line) for line in wrapped)
+    return lines
+
+
+def display_banner(term):
+    """Return the lines of the instructions banner."""
+    return banner(term, BANNER) + [""]
+
+
+def display_breadcrumbs(term, navigator):
+    """Return the lines showing the states leading to the current one."""
+    crumbs = " > ".join(str(state) for state in navigator.breadcrumbs())
+    return [""] + [term.bright_black(line) for line in term.wrap(crumbs)]
+
+
+def display_detection(term, detection):
+    """Return the lines reporting what was detected in the repository."""
+    if detection is None:
+        return []
+    return [term.bright_black(f"Detected: {detection.operation} in progress")]
+
+
+def open_tool(view, cwd):
+    """Import and open the view of a tool, given as ``"module:class"``."""
+    import importlib
+
+    module, _, name = view.partition(":")
+    return getattr(importlib.import_module(module), name)(cwd)
+
+
+def positive_int(text):
+    """Parse a command line argument that must be a positive integer."""
+    import argparse
+
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a positive integer")
+    return value
+
+
+def build_parser():
+    """Return the parser for the gitfix subcommands."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="gitfix",
+        description="Recover from a broken git state. Run without arguments for "
+        "the interactive guide.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    show = subparsers.add_parser(
+        "show", help="print a single state without starting the interactive guide"
+    )
+    show.add_argument(
+        "target",
+        help="option path from the start, such as 1.2.0, or a state name",
+    )
+    show.add_argument(
+        "--raw", action="store_true", help="print the Markdown source instead"
+    )
+    show.add_argument("--width", type=positive_int, help="width to render for")
+    show.add_argument(
+        "--color",
+        choices=("auto", "never", "standard", "256", "truecolor"),
+        default="auto",
+        help="color system to render with (default: %(default)s)",
+    )
+    show.set_defaults(run="gitfix.show")
+
+    profile = subparsers.add_parser(
+        "profile",
+        help="summarize a profile recorded with GITFIX_PROFILE=FILE gitfix",
+    )
+    profile.add_argument("file", help="profile file to summarize")
+    profile.set_defaults(run="gitfix.profile")
+
+    graph = subparsers.add_parser(
+        "graph", help="analyze the decision graph, or export it as JSON or DOT"
+    )
+    graph.add_argument(
+        "--format",
+        choices=("summary", "json", "dot"),
+        default="summary",
+        help="output format (default: %(default)s)",
+    )
+    graph.add_argument("--out", help="write to this file instead of the output")
+    graph.set_defaults(run="gitfix.analysis")
+
+    serve = subparsers.add_parser(
+        "serve", help="serve the guide as linked HTML pages over HTTP"
+    )
+    serve.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to listen on (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port to listen on (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--width",
+        type=positive_int,
+        default=100,
+        help="width to render for (default: %(default)s)",
+    )
+    serve.set_defaults(run="gitfix.serve")
+
+    export = subparsers.add_parser(
+        "export", help="export every state as HTML pages, SVG images or Markdown"
+    )
+    export.add_argument(
+        "--format",
+        choices=("html", "svg", "md"),
+        default="html",
+        help="file format (default: %(default)s)",
+    )
+    export.add_argument("--out", required=True, help="directory to export to")
+    export.add_argument(
+        "--width",
+        type=positive_int,
+        default=100,
+        help="width to render for (default: %(default)s)",
+    )
+    export.add_argument(
+        "--jobs",
+        type=positive_int,
+        help="number of processes (default: one per CPU)",
+    )
+    export.add_argument(
+        "--force",
+        action="store_true",
+        help="render every state, even those unchanged since the last export",
+    )
+    export.set_defaults(run="gitfix.export")
+    return parser
+
+
+def main(argv=None):
+    """Main function, runs a subcommand or the prompt loop."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive()
+        return
+    import importlib
+
+    args = build_parser().parse_args(argv)
+    sys.exit(importlib.import_module(args.run).run(args))
+
+
+class Guide:
+    """The interactive guide: what it displays and how it handles keys."""
+
+    def __init__(self, backend, detect=True):
+        """Set up the guide on a terminal backend.
+
+        With ``detect``, the guide starts from what the repository in the
+        working directory reveals; otherwise it starts from the start state
+        and never looks at the repository.
+        """
+        from gitfix.prefetch import Prefetcher
+        from gitfix.probes import Probes
+        from gitfix.profile import load_profiler
+
+        self.backend = backend
+        self.term = term = backend.term
+        self.profiler = load_profiler()
+        self.color_system = color_system_for(term)
+        self.compositor = Compositor(backend)
+        self.viewport = Viewport()
+        self.title = []
+        self.navigator = Navigator(git_states.StartState())
+        self.detection = repository.detect() if detect else None
+        if self.detection is not None and self.detection.state is not None:
+            self.navigator.jump(getattr(git_states, self.detection.state)())
+        self.in_repository = detect and repository.find_git_dir() is not None
+        self.probes = Probes() if self.in_repository else None
+        self.prefetcher = Prefetcher()
+        self.prefetched = None
+        self.view = None
+        self.running = True
+
+    def regions(self):
+        """Return the compositor regions of the current screen."""
+        term = self.term
+        if self.view is not None:
+            return self.view.regions(term)
+        state = self.navigator.current
+        key = (state, term.width, self.color_system)
+        if key != self.viewport.key:
+            with self.profiler.span("prefetch_wait"):
+                self.prefetcher.wait(state, term.width, self.color_system)
+            if self.profiler.enabled:
+                cached = is_rendered(state, term.width, self.color_system)
+                self.profiler.note("cache", "hit" if cached else "miss")
+            with self.profiler.span("render"):
+                self.title, body = display_state(term, self.color_system, state)
+            self.viewport.show(key, body)
+        annotations = self.probes.annotations(state) if self.probes else None
+        regions = {
+            "title": self.title,
+            "banner": display_banner(term),
+            "options": display_options(term, state.options, annotations),
+            "status": display_breadcrumbs(term, self.navigator)
+            + display_detection(term, self.detection)
+            + self.display_tools(state),
+        }
+        regions["body"] = self.display_body(regions)
+        return regions
+
+    def display_body(self, regions):
+        """Return the body lines that fit around the other ``regions``.
+
+        A body too long for the terminal is shown through the viewport, with
+        a line saying which part is visible, so the options stay on screen.
+        """
+        height = self.term.height - sum(len(lines) for lines in regions.values())
+        if not self.viewport.scrollable(height):
+            self.viewport.height = height
+            return self.viewport.lines
+        lines = self.viewport.visible(height - 1)
+        position = self.viewport.position()
+        return lines + [
+            self.term.bright_black(f"Lines {position}, page up/down or j/k to scroll.")
+        ]
+
+    def tools(self, state):
+        """Return the ``(key, description, view)`` tools offered on ``state``."""
+        if not self.in_repository:
+            return ()
+        return TOOLS.get(str(state), ())
+
+    def display_tools(self, state):
+        """Return the lines listing the tools available on ``state``."""
+        return [
+            self.term.bright_black(f"Press {key!r} to {description}.")
+            for key, description, _ in self.tools(state)
+        ]
+
+    def draw(self):
+        """Draw the current screen, then prefetch the states around it."""
+        profiler = self.profiler
+        with profiler.span("regions"):
+            regions = self.regions()
+        with profiler.span("compose"):
+            data = self.compositor.compose(regions)
+        with profiler.span("flush"):
+            profiler.note("bytes", self.compositor.flush(data))
+        if self.view is not None:
+            profiler.end_frame(type(self.view).__name__)
+        else:
+            profiler.end_frame(self.navigator.current)
+        if self.view is None:
+            self.prefetch()
+
+    def resize(self):
+        """Repaint in full at the new terminal size.
+
+        Only the current state is rendered for the new width by the next
+        draw, or taken from the render cache if that width was seen before.
+        """
+        self.prefetcher.cancel()
+        self.compositor.invalidate()
+
+    def prefetch(self):
+        """Render the states one keypress away while the user reads."""
+        key = (self.navigator.current, self.term.width)
+        if key != self.prefetched:
+            self.prefetched = key
+            self.prefetcher.prefetch(
+                self.navigator.next_states(), self.term.width, self.color_system
             )
-            print()
-            display_options(term, current_state.options)
-            inp = term.inkey()
-            if inp == "q":
-                clear_screen(term)
-                sys.exit(0)
-
-            current_state = current_state.on_event(inp)
+
+    def key_timeout(self):
+        """Return how long to wait for a key before drawing again.
+
+        While probes or the current screen are working in the background the
+        guide polls, so that their results show up without waiting for a
+        keypress.
+        """
+        if self.view is not None and self.view.pending():
+            return 0.1
+        elif self.probes is not None and self.probes.pending():
+            return 0.1
+        return None
+
+    def on_key(self, key):
+        """Handle a keypress."""
+        if self.view is not None:
+            self.view.on_key(key)
+            if self.view.done:
+                if self.view.choice is not None:
+                    via = getattr(self.view, "via", None)
+                    self.navigator.jump(self.view.choice, via)
+                self.view.close()
+                self.view = None
+        elif key == "q":
+            self.running = False
+        elif key.name in SCROLL_KEYS or key in SCROLL_KEYS:
+            lines, pages = SCROLL_KEYS[key.name or key]
+            self.viewport.scroll(lines)
+            self.viewport.page(pages)
+        elif key == "/":
+            from gitfix.search import SearchView, load_index
+
+            self.view = SearchView(load_index())
+        elif key == FINDER_KEY:
+            from gitfix.finder import FinderView, load_finder_index
+
+            self.view = FinderView(load_finder_index())
+        else:
+            tools = {tool[0]: tool[2] for tool in self.tools(self.navigator.current)}
+            if key in tools:
+                self.view = open_tool(tools[key], os.getcwd())
+            else:
+                self.navigator.on_event(key)
+
+    def close(self):
+        """Stop any background work."""
+        self.profiler.close()
+        self.prefetcher.close()
+        if self.view is not None:
+            self.view.close()
+        if self.probes is not None:
+            self.probes.close()
+
+
+def shortest(*timeouts):
+    """Return the shortest of the timeouts that are not None, or None."""
+    timeouts = [timeout for timeout in timeouts if timeout is not None]
+    return min(timeouts) if timeouts else None
+
+
+def handle_keys(guide, backend, key):
+    """Handle ``key`` and every key typed ahead of the next frame.
+
+    Keys already waiting are read without blocking and applied in order, so
+    that only the state reached by the last one is drawn.
+    """
+    count = 0
+    while key and guide.running:
+        guide.on_key(key)
+        count += 1
+        key = backend.read_key(0)
+    if count:
+        guide.profiler.note("keys", count)
+
+
+def interactive(backend=None):
+    """Prompt loop."""
+    from gitfix.resize import ResizeWatcher
+
+    if backend is None:
+        from gitfix.backends import BlessedBackend
+
+        backend = BlessedBackend()
+    with backend.session(), ResizeWatcher() as resize:
+        guide = Guide(backend)
+        wakeups = [resize.fd] if resize.fd is not None else []
+        try:
+            while guide.running:
+                if resize.settled():
+                    guide.resize()
+                if not resize.pending:
+                    guide.draw()
+                timeout = shortest(guide.key_timeout(), resize.timeout())
+                with guide.profiler.span("input_wait"):
+                    inp = backend.read_key(timeout, wakeups)
+                with guide.profiler.span("transition"):
+                    handle_keys(guide, backend, inp)
+        finally:
+            # Also on Ctrl-C: git runs in sessions of its own, out of reach of
+            # the terminal's signals, and would hold up the exit.
+            guide.close()
+            clear_screen(backend)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""Back and forward navigation between states."""
+from array import array
+
+from gitfix.state import FORWARD, PARENT
+
+
+class Navigator:
+    """Tracks the path from the start state as a compact back/forward stack.
+
+    The stack holds node indexes of the compiled graph. Going back keeps the
+    states ahead of the current one, so they can be returned to with forward;
+    choosing an option drops them unless it leads to the same state.
+    """
+
+    __slots__ = ("_views", "_stack", "_position")
+
+    def __init__(self, start):
+        """Start navigating from the ``start`` state."""
+        self._views = start.views
+        self._stack = array("H", [start.node])
+        self._position = 0
+
+    @classmethod
+    def from_path(cls, start, path):
+        """Navigate from ``start`` along a sequence of option indexes.
+
+        Raises ValueError if an index is not an option of the state it is
+        applied to.
+        """
+        navigator = cls(start)
+        for choice in path:
+            state = navigator.current
+            if not 0 <= choice < len(state.options):
+                raise ValueError(f"{state} has no option {choice}")
+            navigator.go(state.child(choice))
+        return navigator
+
+    @property
+    def current(self):
+        """Return the state currently displayed."""
+        return self._views[self._stack[self._position]].instance
+
+    def go(self, state):
+        """Move to ``state``, reached from the current state."""
+        ahead = self._position + 1
+        if ahead < len(self._stack) and self._stack[ahead] == state.node:
+            self._position = ahead
+            return
+        del self._stack[ahead:]
+        self._stack.append(state.node)
+        self._position = ahead
+
+    def jump(self, state, via=None):
+        """Move to ``state`` along a shortest path from the start state.
+
+        With ``via``, the path goes to the state ``via`` and then follows its
+        option leading to ``state``. The breadcrumbs, and so the back key,
+        then follow that path. The paths from the start state come from the
+        precomputed table.
+        """
+        from gitfix.analysis import shortest_paths
+
+        start = self._views[self._stack[0]].instance
+        paths = shortest_paths(start.graph, start.node)
+        if via is None:
+            path = paths.get(state.node)
+        else:
+            path = paths.get(via.node)
+            targets = start.graph.transitions[via.node]
+            if path is not None and state.node in targets:
+                path = path + [targets.index(state.node)]
+            else:
+                path = None
+        if path is None:
+            raise ValueError(f"{state} is not reachable from {start}")
+        self._stack = array("H", [start.node])
+        self._position = 0
+        for choice in path:
+            self.go(self.current.child(choice))
+
+    def back(self):
+        """Return to the previous state, if any."""
+        if self._position > 0:
+            self._position -= 1
+
+    def forward(self):
+        """Return to the state that was left by going back, if any."""
+        if self._position + 1 < len(self._stack):
+            self._position += 1
+
+    def on_event(self, event):
+        """Handle a keypress and return the state now displayed."""
+        state = self.current
+        choice = state.parse_choice(event)
+        if choice == PARENT:
+            self.back()
+        elif choice == FORWARD:
+            self.forward()
+        elif choice is not None:
+            self.go(state.child(choice))
+        return self.current
+
+    def next_states(self):
+        """Return the states one keypress away: back, forward and the options.
+
+        They are ordered by how likely they are to be chosen next, without
+        repeats.
+        """
+        state = self.current
+        nodes = []
+        if self._position > 0:
+            nodes.append(self._stack[self._position - 1])
+        if self._position + 1 < len(self._stack):
+            nodes.append(self._stack[self._position + 1])
+        nodes.extend(state.graph.transitions[state.node])
+        return [
+            self._views[node].instance
+            for idx, node in enumerate(nodes)
+            if node not in nodes[:idx]
+        ]
+
+    def breadcrumbs(self):
+        """Return the states leading to and including the current one."""
+        return [
+            self._views[node].instance for node in self._stack[: self._position + 1]
+        ]
+
+    def path(self):
+        """Return the option indexes chosen to reach the current state."""
+        crumbs = self.breadcrumbs()
+        return [
+            parent.graph.transitions[parent.node].index(state.node)
+            for parent, state in zip(crumbs, crumbs[1:])
+        ]
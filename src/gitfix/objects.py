@@ -0,0 +1,219 @@
+"""Object ID lookups in the object database, without running git.
+
+Pack indexes (version 2) are memory-mapped: the fanout table narrows a
+lookup to the objects sharing its first byte, and a binary search over the
+sorted names finds the object, so resolving an ID reads a few dozen bytes.
+Loose objects are found by listing a single fan-out directory.
+"""
+import glob
+import mmap
+import os
+import re
+import struct
+
+from gitfix import repository
+from gitfix.compositor import banner
+
+IDX_MAGIC = b"\xfftOc"
+IDX_HEADER = struct.Struct(">4sI")
+FANOUT = struct.Struct(">256I")
+MIN_ABBREV = 4
+
+_hex_re = re.compile(r"^[0-9a-f]+$")
+
+
+def hash_size(git_dir):
+    """Return the size in bytes of the object IDs of the repository."""
+    try:
+        with open(os.path.join(repository.common_dir(git_dir), "config")) as f:
+            config = f.read().lower()
+    except OSError:
+        return 20
+    return 32 if re.search(r"objectformat\s*=\s*sha256", config) else 20
+
+
+class PackIndex:
+    """A memory-mapped ``.idx`` file (version 2) of a pack."""
+
+    def __init__(self, path, size=20):
+        """Map the index at ``path``, for object IDs of ``size`` bytes.
+
+        Raises ValueError if it is not a version 2 pack index.
+        """
+        self.path = path
+        self.size = size
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = IDX_HEADER.unpack_from(self._data)
+        if magic != IDX_MAGIC or version != 2:
+            self._data.close()
+            raise ValueError(f"{path} is not a version 2 pack index")
+        self.fanout = FANOUT.unpack_from(self._data, IDX_HEADER.size)
+        self._names = IDX_HEADER.size + FANOUT.size
+
+    def __len__(self):
+        """Return the number of objects in the pack."""
+        return self.fanout[255]
+
+    def name(self, position):
+        """Return the object ID at ``position`` in the sorted table."""
+        start = self._names + position * self.size
+        return self._data[start : start + self.size]
+
+    def find(self, prefix, limit=2):
+        """Return up to ``limit`` object IDs starting with the hex ``prefix``."""
+        first = int(prefix[:2], 16)
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        # The smallest ID with this prefix is the prefix padded with zeros.
+        key = bytes.fromhex(prefix.ljust(self.size * 2, "0"))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.name(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        for position in range(lo, min(lo + limit, len(self))):
+            name = self.name(position).hex()
+            if not name.startswith(prefix):
+                break
+            found.append(name)
+        return found
+
+    def close(self):
+        """Unmap the index."""
+        self._data.close()
+
+
+def object_dirs(git_dir):
+    """Return the object directories of the repository, alternates included."""
+    objects = os.path.join(repository.common_dir(git_dir), "objects")
+    dirs = [objects]
+    try:
+        with open(os.path.join(objects, "info", "alternates")) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    dirs.append(os.path.normpath(os.path.join(objects, line)))
+    except OSError:
+        pass
+    return dirs
+
+
+class ObjectStore:
+    """Resolves full and abbreviated object IDs of a repository."""
+
+    def __init__(self, git_dir):
+        """Map the pack indexes of the repository in ``git_dir``."""
+        self.size = hash_size(git_dir)
+        self.dirs = object_dirs(git_dir)
+        self.packs = []
+        for directory in self.dirs:
+            for path in sorted(glob.glob(os.path.join(directory, "pack", "*.idx"))):
+                try:
+                    self.packs.append(PackIndex(path, self.size))
+                except (OSError, ValueError, struct.error):
+                    continue
+
+    def _loose(self, prefix, limit):
+        """Return up to ``limit`` loose object IDs starting with ``prefix``."""
+        found = []
+        for directory in self.dirs:
+            try:
+                names = os.listdir(os.path.join(directory, prefix[:2]))
+            except OSError:
+                continue
+            rest = prefix[2:]
+            found.extend(
+                prefix[:2] + name
+                for name in sorted(names)
+                if name.startswith(rest) and len(name) == self.size * 2 - 2
+            )
+        return found[:limit]
+
+    def find(self, prefix, limit=2):
+        """Return up to ``limit`` distinct object IDs starting with ``prefix``."""
+        found = set(self._loose(prefix, limit))
+        for pack in self.packs:
+            if len(found) >= limit:
+                break
+            found.update(pack.find(prefix, limit))
+        return sorted(found)[:limit]
+
+    def resolve(self, name):
+        """Return the full object ID for a full or abbreviated ``name``.
+
+        Raises ValueError if it is not a valid ID, is unknown, or is
+        ambiguous.
+        """
+        prefix = name.strip().lower()
+        if not _hex_re.match(prefix) or len(prefix) > self.size * 2:
+            raise ValueError(f"{name!r} is not an object ID")
+        elif len(prefix) < MIN_ABBREV:
+            raise ValueError(f"{name!r} is too short, use at least {MIN_ABBREV} digits")
+        found = self.find(prefix)
+        if not found:
+            raise ValueError(f"No object {name!r} in this repository")
+        elif len(found) > 1:
+            raise ValueError(f"{name!r} is ambiguous")
+        return found[0]
+
+    def __contains__(self, name):
+        """Return whether ``name`` resolves to exactly one object."""
+        try:
+            self.resolve(name)
+        except ValueError:
+            return False
+        return True
+
+    def close(self):
+        """Unmap the pack indexes."""
+        for pack in self.packs:
+            pack.close()
+        self.packs = []
+
+
+class ObjectView:
+    """Prompt checking an object ID as it is typed."""
+
+    def __init__(self, cwd):
+        """Open the object database of the repository containing ``cwd``."""
+        self.store = ObjectStore(repository.find_git_dir(cwd))
+        self.query = ""
+        self.done = False
+        self.choice = None
+
+    def pending(self):
+        """Return whether the screen is waiting on background work."""
+        return False
+
+    def close(self):
+        """Unmap the pack indexes."""
+        self.store.close()
+
+    def on_key(self, key):
+        """Edit the object ID."""
+        if key.name in ("KEY_ESCAPE", "KEY_ENTER"):
+            self.done = True
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self.query = self.query[:-1]
+        elif not key.is_sequence and key.isprintable():
+            self.query += key
+
+    def regions(self, term):
+        """Return the compositor regions of the prompt."""
+        if not self.query:
+            result = term.bright_black("Type a full or abbreviated commit SHA.")
+        else:
+            try:
+                result = term.green(f"Found {self.store.resolve(self.query)}")
+            except ValueError as e:
+                result = term.red(str(e))
+        return {
+            "title": [term.cyan(f"Check SHA: {self.query}")],
+            "body": ["", result, ""],
+            "banner": banner(
+                term, "Type a SHA to check it, enter or escape to go back."
+            ),
+        }
@@ -0,0 +1,103 @@
+"""HTML pages of states, for serving or publishing the guide outside a terminal.
+
+A page shows the title of a state, its description as rendered for the
+terminal, with the colors and styles turned into HTML, and links to the
+states its options lead to. Descriptions come from ``render_state``, so they
+are taken from the render cache or the prerendered bundle when possible.
+"""
+import html
+from itertools import groupby
+from operator import itemgetter
+
+from gitfix import git_states
+from gitfix.backends import styled_runs
+from gitfix.render import render_state
+
+PAGE_WIDTH = 100
+COLOR_SYSTEM = "truecolor"
+# Descriptions are rendered with colors meant for a dark terminal.
+BACKGROUND = "#000000"
+FOREGROUND = "#c0c0c0"
+STYLESHEET = f"""\
+body {{ background: {BACKGROUND}; color: {FOREGROUND}; margin: 2em auto; max-width: 62em;
+       font-family: ui-monospace, Menlo, Consolas, monospace; }}
+h1 {{ color: #0aa; font-size: 1.2em; }}
+a {{ color: #5fd7ff; }}
+pre {{ white-space: pre-wrap; }}
+nav {{ color: #808080; }}"""
+
+
+def css_color(color, theme):
+    """Return the CSS color of a cell color: a palette index or RGB tuple."""
+    from rich.color import Color
+
+    if isinstance(color, tuple):
+        return "#{:02x}{:02x}{:02x}".format(*color)
+    return Color.from_ansi(color).get_truecolor(theme).hex
+
+
+def attribute(value):
+    """Return ``value`` quoted as an HTML attribute value."""
+    return '"' + html.escape(value) + '"'
+
+
+def ansi_to_html(text):
+    """Return rendered terminal ``text`` as escaped HTML with styled spans."""
+    from rich.terminal_theme import DEFAULT_TERMINAL_THEME
+
+    parts = []
+    for attrs, runs in groupby(styled_runs(text), key=itemgetter(1)):
+        run = "".join(part for part, _ in runs)
+        fg, bg = (attrs.bg, attrs.fg) if attrs.reverse else (attrs.fg, attrs.bg)
+        styles = []
+        if fg is not None:
+            styles.append(f"color: {css_color(fg, DEFAULT_TERMINAL_THEME)}")
+        if bg is not None:
+            styles.append(f"background: {css_color(bg, DEFAULT_TERMINAL_THEME)}")
+        if attrs.bold:
+            styles.append("font-weight: bold")
+        if attrs.dim:
+            styles.append("opacity: 0.7")
+        if attrs.italic:
+            styles.append("font-style: italic")
+        if attrs.underline:
+            styles.append("text-decoration: underline")
+        run = html.escape(run, quote=False)
+        if styles:
+            run = f"<span style={attribute('; '.join(styles))}>{run}</span>"
+        parts.append(run)
+    return "".join(parts)
+
+
+def state_page(state, link, width=PAGE_WIDTH):
+    """Return the HTML page of ``state``.
+
+    ``link`` returns the URL of the page of a state, relative to this one.
+    """
+    title = html.escape(state.title)
+    body = ansi_to_html(render_state(state, width, COLOR_SYSTEM))
+    options = "".join(
+        f"<li><a href={attribute(link(state.child(idx)))}>"
+        f"{html.escape(label)}</a></li>\n"
+        for idx, label in enumerate(state.options)
+    )
+    start = attribute(link(git_states.StartState()))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - gitfix</title>
+<style>
+{STYLESHEET}
+</style>
+</head>
+<body>
+<nav><a href={start}>gitfix</a> / {html.escape(str(state))}</nav>
+<h1>{title}</h1>
+<pre>{body}</pre>
+<ol start="0">
+{options}</ol>
+</body>
+</html>
+"""
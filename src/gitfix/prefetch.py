@@ -0,0 +1,95 @@
+"""Speculative rendering of the states the user may go to next.
+
+While a state is displayed, a worker thread renders the states one keypress
+away into the render cache, so that whichever is chosen is drawn from the
+cache. Rendering one state is the unit of work: navigating replaces the
+queue, and the worker drops what it had not started yet. The input loop only
+waits on the worker when the state it needs is the one being rendered, which
+is sooner than rendering it a second time; otherwise it only ever takes the
+cache lock, which is not held while rendering.
+"""
+import threading
+
+from gitfix.render import is_rendered, render_state
+
+
+class Prefetcher:
+    """Renders queued states into the render cache on a worker thread."""
+
+    def __init__(self, render=render_state):
+        """Initialize the prefetcher; the worker starts on first use."""
+        self._render = render
+        self._condition = threading.Condition()
+        self._queue = []
+        self._closed = False
+        self._thread = None
+        # The key being rendered, and an event set once it is done.
+        self._rendering = None
+        self.rendered = 0
+        self.error = None
+
+    def prefetch(self, states, width, color_system):
+        """Render ``states`` in the background, cancelling earlier requests."""
+        with self._condition:
+            if self._closed:
+                return
+            self._queue = [
+                (state, width, color_system)
+                for state in states
+                if not is_rendered(state, width, color_system)
+            ]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self):
+        """Drop the states not rendered yet."""
+        with self._condition:
+            self._queue = []
+
+    def pending(self):
+        """Return whether states are still waiting to be rendered."""
+        with self._condition:
+            return bool(self._queue)
+
+    def wait(self, state, width, color_system):
+        """Wait for the render of ``state`` if the worker is rendering it."""
+        with self._condition:
+            if self._rendering is None:
+                return
+            key, done = self._rendering
+        if key == (state, width, color_system):
+            done.wait()
+
+    def _run(self):
+        """Render queued states until closed.
+
+        A render that fails is left for the input loop to render again, and
+        report; the worker goes on with the next state.
+        """
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key = self._queue.pop(0)
+                done = threading.Event()
+                self._rendering = (key, done)
+            try:
+                self._render(*key)
+                self.rendered += 1
+            except Exception as e:
+                self.error = e
+            finally:
+                with self._condition:
+                    self._rendering = None
+                done.set()
+
+    def close(self):
+        """Stop the worker after the render in progress, if any."""
+        with self._condition:
+            self._closed = True
+            self._queue = []
+            self._condition.notify()
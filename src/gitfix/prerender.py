@@ -0,0 +1,159 @@
+"""Build and read the bundle of prerendered state descriptions.
+
+Every state description is static text, so it can be rendered once at build
+time for the most common terminal widths and color systems. The bundle is a
+single file laid out as::
+
+    MAGIC | index length (uint32, big endian) | JSON index | blobs
+
+The index maps each state name to the CRC32 of its Markdown source and to the
+``[offset, length]`` of each zlib-compressed render. The file is memory mapped
+at runtime, so only the renders actually displayed are read and inflated.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections import deque
+
+from gitfix import git_states
+
+MAGIC = b"GFXR\x01"
+BUNDLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "prerendered.bin"
+)
+WIDTHS = (80, 100, 120, 132, 160)
+COLOR_SYSTEMS = (None, "standard", "256", "truecolor")
+
+_header = struct.Struct(">I")
+_bundle = None
+
+
+class _Choice(str):
+    """A stand-in for a keystroke, used to follow the options of a state."""
+
+    name = None
+
+
+def iter_states(start=None):
+    """Yield one instance of every state reachable from the start state."""
+    queue = deque([start or git_states.StartState()])
+    seen = set()
+    while queue:
+        state = queue.popleft()
+        if type(state) in seen:
+            continue
+        seen.add(type(state))
+        yield state
+        for idx in range(len(state.options or ())):
+            queue.append(state.on_event(_Choice(idx)))
+
+
+def source_crc(md):
+    """Return the checksum used to detect a stale render of ``md``."""
+    return zlib.crc32(md.encode("utf-8"))
+
+
+def render_key(width, color_system):
+    """Return the index key of a render for a width and color system."""
+    return f"{width}/{color_system}"
+
+
+def build_bundle(path=BUNDLE_PATH, widths=WIDTHS, color_systems=COLOR_SYSTEMS):
+    """Render every reachable state and write the bundle to ``path``."""
+    from gitfix.render import parse_md
+
+    index = {}
+    blobs = []
+    offset = 0
+    seen_blobs = {}
+    for state in iter_states():
+        body = state.describe()[1]
+        renders = {}
+        for width in widths:
+            for color_system in color_systems:
+                blob = zlib.compress(
+                    parse_md(body, width, color_system).encode("utf-8"), 9
+                )
+                if blob not in seen_blobs:
+                    seen_blobs[blob] = [offset, len(blob)]
+                    blobs.append(blob)
+                    offset += len(blob)
+                renders[render_key(width, color_system)] = seen_blobs[blob]
+        index[str(state)] = {"crc": source_crc(body), "renders": renders}
+
+    raw_index = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_header.pack(len(raw_index)))
+        f.write(raw_index)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class Bundle:
+    """A read-only, memory mapped bundle of prerendered descriptions."""
+
+    def __init__(self, path):
+        """Map the bundle at ``path`` and parse its index."""
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a gitfix prerender bundle")
+        start = len(MAGIC) + _header.size
+        (index_len,) = _header.unpack_from(self._map, len(MAGIC))
+        self._index = json.loads(self._map[start : start + index_len].decode("utf-8"))
+        self._base = start + index_len
+
+    def lookup(self, state, width, color_system):
+        """Return the prerendered body of ``state``, or None if unavailable."""
+        entry = self._index.get(str(state))
+        if entry is None:
+            return None
+        location = entry["renders"].get(render_key(width, color_system))
+        if location is None or entry["crc"] != source_crc(state.describe()[1]):
+            return None
+        offset, length = location
+        start = self._base + offset
+        return zlib.decompress(self._map[start : start + length]).decode("utf-8")
+
+
+def load_bundle(path=BUNDLE_PATH):
+    """Return the packaged bundle, or None if it has not been built."""
+    global _bundle
+    if _bundle is None:
+        try:
+            _bundle = Bundle(path)
+        except (OSError, ValueError):
+            _bundle = False
+    return _bundle or None
+
+
+def lookup(state, width, color_system):
+    """Return the prerendered body of ``state`` from the packaged bundle."""
+    bundle = load_bundle()
+    if bundle is None:
+        return None
+    return bundle.lookup(state, width, color_system)
+
+
+def main():
+    """Build the prerender bundle from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Prerender every gitfix state description."
+    )
+    parser.add_argument("--out", default=BUNDLE_PATH, help="bundle file to write")
+    args = parser.parse_args()
+    count = build_bundle(args.out)
+    print(f"Prerendered {count} states to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Background probes answering the guide's questions from the repository.
+
+Some questions, such as whether the working directory is dirty or whether
+commits were pushed, can be answered by git, but on large repositories the
+answer can take seconds. The probes run in a thread pool started at launch;
+as each one finishes, it annotates the options it can answer. The input loop
+only ever reads the annotations collected so far.
+"""
+import os
+import signal
+import subprocess  # noqa: S404
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gitfix import repository
+
+PROBE_TIMEOUT = 30.0
+PROBE_WORKERS = 3
+
+
+class ProbeCancelled(Exception):
+    """Raised in a probe when the probes were closed while it was running."""
+
+
+def probe_operation(probes):
+    """Answer the merge and rebase options from the git directory."""
+    detection = repository.detect(probes.cwd)
+    options = {"merge": 0, "rebase": 1}
+    if detection is None or detection.operation not in options:
+        return []
+    option = options[detection.operation]
+    return [("CommitedQuestionState", option, f"{detection.operation} in progress")]
+
+
+def probe_status(probes):
+    """Answer whether the working directory is clean."""
+    output = probes.git("status", "--porcelain", "--untracked-files=no")
+    changed = len(output.splitlines())
+    if not changed:
+        return [("CommittedState", 0, "working directory is clean")]
+    text = f"{changed} changed file{'s' if changed > 1 else ''}"
+    return [("CommittedState", 1, text), ("CommittedState", 2, text)]
+
+
+def probe_upstream(probes):
+    """Answer whether the commits on this branch were pushed."""
+    output = probes.git("rev-list", "--count", "@{upstream}..HEAD")
+    ahead = int(output.strip())
+    if not ahead:
+        return [("CommittedReallyState", 0, "HEAD is on the upstream branch")]
+    text = f"{ahead} commit{'s' if ahead > 1 else ''} not pushed"
+    return [("CommittedReallyState", 1, text)]
+
+
+PROBES = (probe_operation, probe_status, probe_upstream)
+
+
+def spawn_git(cwd, *args, **kwargs):
+    """Start a git process in ``cwd``, in a session of its own.
+
+    Optional locks are disabled so that git never competes with the user's
+    own commands for the index lock.
+    """
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    return subprocess.Popen(  # noqa: S603, S607
+        ["git", *args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+        start_new_session=os.name == "posix",
+        **kwargs,
+    )
+
+
+def kill_git(process):
+    """Kill a git process along with any process it started."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        # Already exited.
+        pass
+
+
+class Probes:
+    """Runs the probes in the background and collects their annotations."""
+
+    def __init__(self, cwd=None, probes=PROBES, timeout=PROBE_TIMEOUT):
+        """Start every probe on a thread pool."""
+        self.cwd = cwd or os.getcwd()
+        self.timeout = timeout
+        self._annotations = {}
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS)
+        self._futures = [self._executor.submit(self._run, probe) for probe in probes]
+
+    def _run(self, probe):
+        """Run one probe and record its annotations."""
+        try:
+            results = probe(self)
+        except (OSError, ValueError, subprocess.SubprocessError, ProbeCancelled):
+            return
+        with self._lock:
+            for state, option, text in results:
+                self._annotations.setdefault(state, {})[option] = text
+
+    def git(self, *args):
+        """Run a git command in the repository and return its output.
+
+        Raises CalledProcessError if git fails, TimeoutExpired if it takes
+        longer than the probe timeout, and ProbeCancelled if the probes are
+        closed meanwhile.
+        """
+        process = spawn_git(self.cwd, *args)
+        with self._lock:
+            if self._closed:
+                kill_git(process)
+            self._processes.add(process)
+        try:
+            output, _ = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            kill_git(process)
+            process.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+        if self._closed:
+            raise ProbeCancelled()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args)
+        return output
+
+    def pending(self):
+        """Return whether some probes are still running."""
+        return not all(future.done() for future in self._futures)
+
+    def annotations(self, state):
+        """Return the annotations of the options of ``state``, by index."""
+        with self._lock:
+            return dict(self._annotations.get(str(state), {}))
+
+    def close(self):
+        """Cancel the probes, killing any git process still running."""
+        with self._lock:
+            self._closed = True
+            processes = list(self._processes)
+        for future in self._futures:
+            future.cancel()
+        for process in processes:
+            kill_git(process)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,182 @@
+"""Opt-in per-frame profiling of the interactive guide.
+
+When ``GITFIX_PROFILE`` names a file, every frame appends a JSON line to it
+with the time spent in each span (waiting for input, handling the key,
+building the screen, rendering, composing and flushing), whether the render
+cache had the state, and the bytes written. ``gitfix profile FILE``
+summarizes such a file. When the variable is unset, the guide uses a profiler
+whose methods do nothing.
+"""
+import json
+import os
+import sys
+import time
+
+PROFILE_ENV = "GITFIX_PROFILE"
+PERCENTILES = (50, 95, 99)
+# Spans timed inside another span, by the name of the enclosing one.
+NESTED_SPANS = {"render": "regions", "prefetch_wait": "regions"}
+
+
+class _Span:
+    """Times the code run in a ``with`` block."""
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self._start) * 1000
+        spans = self._profiler.spans
+        spans[self._name] = spans.get(self._name, 0.0) + elapsed
+
+
+class Profiler:
+    """Records the spans of each frame as JSON lines in a file."""
+
+    enabled = True
+
+    def __init__(self, path):
+        """Append the frames to the file at ``path``."""
+        self.path = path
+        self.frames = 0
+        self.spans = {}
+        self.notes = {}
+        self._file = open(path, "a", encoding="utf-8")
+
+    def span(self, name):
+        """Return a context manager adding its duration to span ``name``."""
+        return _Span(self, name)
+
+    def note(self, name, value):
+        """Record a value, such as a count, for the current frame."""
+        self.notes[name] = value
+
+    def end_frame(self, state):
+        """Write the current frame, showing ``state``, and start the next one."""
+        record = {
+            "frame": self.frames,
+            "time": time.time(),
+            "state": str(state),
+            "spans": {name: round(ms, 4) for name, ms in self.spans.items()},
+        }
+        record.update(self.notes)
+        self._file.write(json.dumps(record) + "\n")
+        self.frames += 1
+        self.spans = {}
+        self.notes = {}
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class _NullSpan:
+    """A ``with`` block that does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class NullProfiler:
+    """The profiler used when profiling is off; every method does nothing."""
+
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name):
+        """Return a context manager that does nothing."""
+        return self._span
+
+    def note(self, name, value):
+        """Do nothing."""
+
+    def end_frame(self, state):
+        """Do nothing."""
+
+    def close(self):
+        """Do nothing."""
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def load_profiler(environ=os.environ):
+    """Return a profiler writing to ``GITFIX_PROFILE``, or the null profiler."""
+    path = environ.get(PROFILE_ENV)
+    return Profiler(path) if path else NULL_PROFILER
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of sorted ``values``."""
+    rank = max(1, -(-pct * len(values) // 100))
+    return values[rank - 1]
+
+
+def read_frames(path):
+    """Yield the frames recorded in a profile file, skipping broken lines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize(frames):
+    """Return the sorted samples of each span and of each state's paint time.
+
+    The paint time of a frame is the time from the keypress to the end of the
+    flush: every span except the wait for input and the nested spans.
+    """
+    spans = {}
+    states = {}
+    for frame in frames:
+        paint = 0.0
+        for name, ms in frame.get("spans", {}).items():
+            spans.setdefault(name, []).append(ms)
+            if name != "input_wait" and name not in NESTED_SPANS:
+                paint += ms
+        states.setdefault(frame.get("state", "?"), []).append(paint)
+    for samples in (*spans.values(), *states.values()):
+        samples.sort()
+    return spans, states
+
+
+def format_table(heading, samples):
+    """Return the lines of a percentile table, one row per name."""
+    width = max([len(heading), *map(len, samples)])
+    columns = "".join(f"{f'p{pct}':>10}" for pct in PERCENTILES)
+    lines = [f"{heading:<{width}}{'count':>8}{columns}"]
+    for name in sorted(samples):
+        values = samples[name]
+        cells = "".join(f"{percentile(values, pct):>10.3f}" for pct in PERCENTILES)
+        lines.append(f"{name:<{width}}{len(values):>8}{cells}")
+    return lines
+
+
+def run(args):
+    """Print the percentiles of a profile file, in milliseconds."""
+    try:
+        spans, states = summarize(read_frames(args.file))
+    except OSError as e:
+        sys.stderr.write(f"gitfix profile: {e}\n")
+        return 2
+    if not spans:
+        sys.stderr.write(f"gitfix profile: no frames in {args.file}\n")
+        return 2
+    lines = format_table("span (ms)", spans)
+    lines.append("")
+    lines.extend(format_table("state, keypress to paint (ms)", states))
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 0
@@ -0,0 +1,353 @@
+"""Reflog browser reading the reflog files directly.
+
+Reflogs of long-lived clones can hold hundreds of thousands of entries. The
+files under ``logs/`` are memory-mapped and parsed one line at a time from
+the end, newest first, and the logs of every ref are merged lazily, so only
+the entries scrolled to are ever parsed. The browser keeps the entries of a
+few pages around the visible one, and the position in each file to resume
+from every ``CHECKPOINT_INTERVAL`` entries, so memory use does not grow with
+the size of the reflogs or with how far they are scrolled.
+"""
+import heapq
+import mmap
+import os
+import time
+from collections import namedtuple
+
+from gitfix import repository
+from gitfix.compositor import banner
+
+Entry = namedtuple("Entry", ["ref", "old", "new", "time", "message"])
+Entry.__doc__ = """One reflog entry: ``ref`` moved from ``old`` to ``new``."""
+
+Filter = namedtuple("Filter", ["ref", "since", "until"])
+Filter.__doc__ = """Which entries to show.
+
+``ref`` is matched as a substring of the ref name; ``since`` and ``until``
+are timestamps. Any of them can be None.
+"""
+
+NO_FILTER = Filter(None, None, None)
+DAY = 24 * 60 * 60
+# Entries between the positions the browser can resume reading from.
+CHECKPOINT_INTERVAL = 256
+# Pages of entries the browser keeps parsed.
+WINDOW_PAGES = 3
+
+
+def parse_entry(ref, line):
+    """Parse one reflog line, or return None if it is malformed."""
+    header, _, message = line.decode("utf-8", "replace").partition("\t")
+    fields = header.split(" ")
+    try:
+        return Entry(ref, fields[0], fields[1], int(fields[-2]), message)
+    except (IndexError, ValueError):
+        return None
+
+
+def reversed_line_offsets(data, end=None):
+    """Yield the ``(start, stop)`` offsets of the lines of ``data``, last first.
+
+    Only the data before ``end`` is read, by default all of it.
+    """
+    end = len(data) if end is None else end
+    if data[end - 1 : end] == b"\n":
+        end -= 1
+    while end > 0:
+        start = data.rfind(b"\n", 0, end) + 1
+        yield start, end
+        end = start - 1
+
+
+def reversed_lines(data):
+    """Yield the lines of ``data``, last first, without splitting it all."""
+    for start, stop in reversed_line_offsets(data):
+        yield data[start:stop]
+
+
+class Reflog:
+    """The memory-mapped reflog of a single ref."""
+
+    def __init__(self, path, ref):
+        """Map the reflog at ``path``; an empty log maps nothing."""
+        self.path = path
+        self.ref = ref
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+
+    def __len__(self):
+        """Return the size of the reflog, in bytes."""
+        return len(self._data)
+
+    def __iter__(self):
+        """Yield the entries, newest first."""
+        for entry, _ in self.entries():
+            yield entry
+
+    def entries(self, end=None, since=None, until=None):
+        """Yield the entries in a time range, newest first, with their offset.
+
+        Only the entries before the offset ``end`` are read; each one comes
+        with the offset to pass as ``end`` to read on from the entry after
+        it. Reflogs are appended to in order, so reading stops at the first
+        entry older than ``since``.
+        """
+        for start, stop in reversed_line_offsets(self._data, end):
+            entry = parse_entry(self.ref, self._data[start:stop])
+            if entry is None:
+                continue
+            if since is not None and entry.time < since:
+                return
+            if until is None or entry.time < until:
+                yield entry, max(0, start - 1)
+
+    def close(self):
+        """Unmap the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+
+def reflog_paths(git_dir):
+    """Yield the ``(path, ref)`` of every reflog of the repository.
+
+    ``HEAD`` has its own log in each worktree; the logs of the other refs are
+    shared by all worktrees.
+    """
+    head = os.path.join(git_dir, "logs", "HEAD")
+    if os.path.isfile(head):
+        yield head, "HEAD"
+    logs = os.path.join(repository.common_dir(git_dir), "logs")
+    for directory, _, names in os.walk(os.path.join(logs, "refs")):
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            yield path, os.path.relpath(path, logs).replace(os.sep, "/")
+
+
+def open_reflogs(git_dir, ref=None):
+    """Return the reflogs of the refs whose name contains ``ref``."""
+    reflogs = []
+    for path, name in reflog_paths(git_dir):
+        if ref and ref not in name:
+            continue
+        try:
+            reflogs.append(Reflog(path, name))
+        except (OSError, ValueError):
+            continue
+    return reflogs
+
+
+def _push(heap, idx, stream):
+    """Push the next entry of the ``idx``-th reflog's stream, if any."""
+    for entry, end in stream:
+        heapq.heappush(heap, (-entry.time, idx, entry, end))
+        return
+
+
+def merged_entries(reflogs, since=None, until=None, ends=None):
+    """Yield the entries of all ``reflogs`` in the time range, newest first.
+
+    Each entry comes with the position after it: the offsets, one per
+    reflog, to pass as ``ends`` to read on from the entry after it. Entries
+    at the same time are taken in the order of the reflogs.
+    """
+    ends = list(ends or (len(reflog) for reflog in reflogs))
+    streams = [reflog.entries(end, since, until) for reflog, end in zip(reflogs, ends)]
+    heap = []
+    for idx, stream in enumerate(streams):
+        _push(heap, idx, stream)
+    while heap:
+        _, idx, entry, end = heapq.heappop(heap)
+        ends[idx] = end
+        yield entry, tuple(ends)
+        _push(heap, idx, streams[idx])
+
+
+def parse_date(text):
+    """Return the local midnight timestamp of a ``YYYY-MM-DD`` date."""
+    return int(time.mktime(time.strptime(text, "%Y-%m-%d")))
+
+
+def parse_filter(text):
+    """Parse a filter such as ``main since:2021-07-01 until:2021-07-31``.
+
+    Both dates are included. Raises ValueError for a malformed date.
+    """
+    ref = since = until = None
+    for word in text.split():
+        if word.startswith("since:"):
+            since = parse_date(word[len("since:") :])
+        elif word.startswith("until:"):
+            until = parse_date(word[len("until:") :]) + DAY
+        else:
+            ref = word
+    return Filter(ref, since, until)
+
+
+class ReflogView:
+    """Scrolling list of reflog entries, parsed only as far as displayed."""
+
+    def __init__(self, cwd):
+        """Show every reflog of the repository containing ``cwd``."""
+        self.git_dir = repository.find_git_dir(cwd)
+        self.filter_text = ""
+        self.editing = False
+        self.message = ""
+        self.done = False
+        self.choice = None
+        self.page = 1
+        self._reflogs = []
+        self._apply(NO_FILTER)
+
+    def _apply(self, entry_filter):
+        """Start reading the entries matching ``entry_filter`` again."""
+        self.close()
+        self._filter = entry_filter
+        self._reflogs = open_reflogs(self.git_dir, entry_filter.ref)
+        # Where to resume reading entry k * CHECKPOINT_INTERVAL, None for 0.
+        self._checkpoints = [None]
+        self._seek(0)
+        self._seen = 0
+        self._count = None
+        self.top = 0
+        self.selected = 0
+
+    def _seek(self, index):
+        """Read again from the last checkpoint at or before entry ``index``."""
+        checkpoint = min(index // CHECKPOINT_INTERVAL, len(self._checkpoints) - 1)
+        self._stream = merged_entries(
+            self._reflogs,
+            self._filter.since,
+            self._filter.until,
+            self._checkpoints[checkpoint],
+        )
+        self._base = checkpoint * CHECKPOINT_INTERVAL
+        self._window = []
+
+    def _read(self):
+        """Parse the entry after the window into it; return False at the end."""
+        index = self._base + len(self._window)
+        try:
+            entry, ends = next(self._stream)
+        except StopIteration:
+            self._count = index
+            return False
+        self._window.append(entry)
+        self._seen = max(self._seen, index + 1)
+        if index + 1 == len(self._checkpoints) * CHECKPOINT_INTERVAL:
+            self._checkpoints.append(ends)
+        return True
+
+    def _fetch(self, start, stop):
+        """Parse the entries from ``start`` to ``stop`` into the window.
+
+        The window keeps at most ``WINDOW_PAGES`` pages of entries, dropping
+        the oldest read; scrolling back before it reads from a checkpoint.
+        """
+        if start < self._base:
+            self._seek(start)
+        while self._base + len(self._window) < stop and self._read():
+            pass
+        limit = WINDOW_PAGES * self.page
+        drop = min(start - self._base, len(self._window) - limit)
+        if drop > 0:
+            del self._window[:drop]
+            self._base += drop
+
+    def pending(self):
+        """Return whether the screen is waiting on background work."""
+        return False
+
+    def close(self):
+        """Unmap the reflogs."""
+        for reflog in self._reflogs:
+            reflog.close()
+        self._reflogs = []
+
+    def on_key(self, key):
+        """Scroll through the entries, or edit the filter."""
+        if self.editing:
+            self._edit_filter(key)
+        elif key.name == "KEY_ESCAPE":
+            self.done = True
+        elif key == "/":
+            self.editing = True
+        else:
+            moves = {
+                "KEY_UP": -1,
+                "k": -1,
+                "KEY_DOWN": 1,
+                "j": 1,
+                "KEY_PGUP": -self.page,
+                "KEY_PGDOWN": self.page,
+            }
+            move = moves.get(key.name or str(key))
+            if move is not None:
+                self._select(self.selected + move)
+
+    def _edit_filter(self, key):
+        """Update the filter, applying it on enter."""
+        if key.name == "KEY_ESCAPE":
+            self.editing = False
+        elif key.name == "KEY_ENTER":
+            try:
+                self._apply(parse_filter(self.filter_text))
+                self.message = ""
+            except ValueError:
+                self.message = "Dates are written YYYY-MM-DD."
+            self.editing = False
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self.filter_text = self.filter_text[:-1]
+        elif not key.is_sequence and key.isprintable():
+            self.filter_text += key
+
+    def _select(self, selected):
+        """Move the selection, scrolling to keep it on screen."""
+        selected = max(0, selected)
+        self._fetch(selected, selected + 1)
+        self.selected = max(0, min(selected, self._seen - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.page:
+            self.top = self.selected - self.page + 1
+
+    def _banner(self):
+        """Return the instructions for the current mode."""
+        if self.editing:
+            return (
+                "Type a ref name, since:YYYY-MM-DD and until:YYYY-MM-DD, "
+                "then press enter."
+            )
+        return (
+            "Up/down or j/k to scroll, page up/down to page, "
+            "'/' to filter, escape to go back."
+        )
+
+    def regions(self, term):
+        """Return the compositor regions of the visible entries only."""
+        self.page = max(1, term.height - 7)
+        self._select(self.selected)
+        lines = []
+        self._fetch(self.top, self.top + self.page)
+        offset = self.top - self._base
+        visible = self._window[offset : offset + self.page]
+        for idx, entry in enumerate(visible, self.top):
+            day = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.time))
+            line = f"{day} {entry.new[:10]} {entry.ref}: {entry.message}"
+            line = line[: term.width]
+            lines.append(term.reverse(line) if idx == self.selected else line)
+        if not lines:
+            lines.append(term.bright_black("No matching reflog entries."))
+        if self.editing:
+            status = f"Filter: {self.filter_text}"
+        else:
+            total = self._count if self._count is not None else f"{self._seen}+"
+            status = self.message or f"Entry {self.selected + 1} of {total}"
+        return {
+            "title": [term.cyan(f"Reflog: {self.filter_text or 'all refs'}")],
+            "body": [""] + lines + [""],
+            "banner": banner(term, self._banner()),
+            "status": [term.bright_black(status)],
+        }
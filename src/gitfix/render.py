@@ -0,0 +1,219 @@
+"""Rendering of state descriptions from Markdown to terminal text.
+
+Rich, and through it Pygments, are only imported the first time a description
+has to be rendered live, so a screen served from the render cache or the
+prerendered bundle never pays for them.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from gitfix import prerender
+
+RENDER_CACHE_SIZE = 64
+_render_cache = OrderedDict()
+# Held only while the cache is read or updated, never while rendering.
+_render_lock = threading.Lock()
+
+
+_table_styles = None
+_br_re = re.compile(r"<br/?>")
+_splice_re = re.compile(r"<#MD-TABLE-(\d+)#>|<br/?>")
+
+
+def parse_md(md, width=None, color_system="auto"):
+    """Parse markdown and return it rendered for the terminal.
+
+    Tables are rendered separately and left as placeholders in the Markdown,
+    which are spliced back in a single pass over the rendered text, so the
+    work grows linearly with the number of tables.
+    """
+    from rich.console import Console
+    from rich.markdown import Markdown
+
+    md = re.sub(r"\n([\r\t ]*\n)+", r"\n\n", md, flags=re.MULTILINE)
+    md = re.sub(r"^[\t ]*\|", r"|", md, flags=re.MULTILINE)
+    md = re.sub(r"\|[\t ]*$", r"|", md, flags=re.MULTILINE)
+    console = Console(width=width, color_system=color_system)
+    tables = []
+    parts = []
+    last = 0
+    for start, end in find_md_tables(md):
+        before = "" if start >= 2 and md[start - 2 : start] == "\n\n" else "\n"
+        after = "  " if md[end : end + 1] == "\n" else "  \n"
+        tables.append(before + parse_md_table(md[start:end], console))
+        parts.extend((md[last:start], f"<#MD-TABLE-{len(tables) - 1}#>", after))
+        last = end
+    parts.append(md[last:])
+    with console.capture() as capture:
+        console.print(
+            Markdown(
+                "".join(parts), inline_code_lexer="bash", inline_code_theme="monokai"
+            )
+        )
+
+    def splice(match):
+        if match.group(1) is None:
+            return "\n"
+        return _br_re.sub("\n", tables[int(match.group(1))])
+
+    return _splice_re.sub(splice, capture.get()).strip()
+
+
+def find_md_tables(md):
+    """Yield the ``(start, end)`` offsets of the tables in ``md``.
+
+    A table is a run of lines that start and end with ``|``; ``end`` is past
+    the newline of its last line. The text is scanned once, line by line.
+    """
+    start = None
+    pos = 0
+    while pos < len(md):
+        newline = md.find("\n", pos)
+        stop = len(md) if newline == -1 else newline
+        is_row = stop - pos >= 2 and md[pos] == "|" and md[stop - 1] == "|"
+        if is_row and start is None:
+            start = pos
+        elif not is_row and start is not None:
+            yield start, pos
+            start = None
+        pos = stop + 1
+    if start is not None:
+        yield start, len(md)
+
+
+def table_styles():
+    """Return the box and styles shared by every table, creating them once."""
+    global _table_styles
+    if _table_styles is None:
+        from rich import box
+        from rich.style import Style
+
+        _table_styles = {
+            "box": box.Box("    \n    \n══╪═\n    \n┈┈┼┈\n┈┈┼┈\n    \n    "),
+            "border": Style(color="#222222"),
+            "header": Style(bgcolor="yellow", color="#000000", bold=True),
+            "odd": Style(bgcolor="#111111", color="white"),
+            "even": Style(bgcolor="#222222", color="white"),
+        }
+    return _table_styles
+
+
+def parse_md_table(md_table, console):
+    """Render a markdown table with ``console`` and return the text."""
+    from rich.align import Align
+    from rich.markdown import Markdown
+    from rich.table import Table
+
+    [table_header, table_body, columns] = split_md_table(md_table)
+    styles = table_styles()
+    table = Table(
+        box=styles["box"],
+        show_header=False,
+        show_edge=False,
+        border_style=styles["border"],
+    )
+    for col_align in columns:
+        table.add_column(None, justify=col_align)
+    for row in table_header:
+        row = map(Align.center, row)
+        table.add_row(*row, style=styles["header"])
+    for num, row in enumerate(table_body, start=1):
+        style = styles["even"] if (num % 2 == 0) else styles["odd"]
+        # Format any code blocks in table
+        formatted_row = [
+            Markdown(col, inline_code_lexer="bash", inline_code_theme="monokai")
+            for col in row
+        ]
+        table.add_row(*formatted_row, style=style)
+
+    with console.capture() as capture:
+        console.print(table)
+    return "\n".join(capture.get().split("\n")[0:-1])
+
+
+def map_md_table_align_col(cell):
+    """Map markdown table column alignments."""
+    if re.match(r"^\s*:-+:\s*$", cell):
+        return "center"
+    elif re.match(r"^\s*-+:\s*$", cell):
+        return "right"
+    else:
+        return "left"
+
+
+def split_md_table(md_table):
+    """Split a markdown table into header, body and columns."""
+    md_table = re.sub(r"^\||\|$", "", md_table, flags=re.MULTILINE)
+    table_header = []
+    table_body = []
+    columns = []
+    table = list(
+        map(
+            lambda row: list(map(lambda cell: cell.strip(), row.split("|"))),
+            md_table.strip().split("\n"),
+        )
+    )
+    has_header = False
+    for row in table:
+        if re.match(r"^\s*:?-+:?\s*$", row[0]):
+            has_header = True
+    in_header = has_header
+    for row in table:
+        if in_header:
+            if re.match(r"^\s*:?-+:?\s*$", row[0]):
+                in_header = False
+                columns = map(map_md_table_align_col, row)
+            else:
+                table_header.append(row)
+        else:
+            table_body.append(row)
+    return [table_header, table_body, columns]
+
+
+def render_state(state, width=None, color_system="auto"):
+    """Render the body of a state, reusing a cached render when possible.
+
+    Renders are keyed on the state class, the terminal width and the color
+    system, so a resize or a change of terminal never reuses a stale render.
+    The cache holds at most ``RENDER_CACHE_SIZE`` entries, evicting the least
+    recently used one first. Renders missing from the cache are read from the
+    prerendered bundle when it covers the width, and rendered live otherwise.
+    """
+    key = (type(state), width, color_system)
+    with _render_lock:
+        if key in _render_cache:
+            _render_cache.move_to_end(key)
+            return _render_cache[key]
+    rendered = prerender.lookup(state, width, color_system)
+    if rendered is None:
+        rendered = parse_md(state.describe()[1], width, color_system)
+    with _render_lock:
+        _render_cache[key] = rendered
+        if len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+    return rendered
+
+
+def is_rendered(state, width=None, color_system="auto"):
+    """Return whether a render of ``state`` is in the cache."""
+    with _render_lock:
+        return (type(state), width, color_system) in _render_cache
+
+
+def color_system_for(term):
+    """Return the Rich color system matching a blessed terminal."""
+    colors = term.number_of_colors
+    if colors >= 1 << 24:
+        return "truecolor"
+    elif colors >= 256:
+        return "256"
+    elif colors > 0:
+        return "standard"
+    return None
+
+
+def clear_render_cache():
+    """Drop every cached state render."""
+    with _render_lock:
+        _render_cache.clear()
@@ -0,0 +1,101 @@
+"""Detection of the repository state from the files in the git directory.
+
+Everything here is plain file access: no ``git`` process is started, so
+detection takes a handful of system calls even on very large repositories.
+"""
+import mmap
+import os
+from collections import namedtuple
+
+Detection = namedtuple("Detection", ["operation", "state", "evidence"])
+Detection.__doc__ = """An operation found in progress in the repository.
+
+``state`` names the git state to show for it, or is None when no state covers
+it, and ``evidence`` is the path that revealed it.
+"""
+
+# Checked in order; (operation, path relative to the git directory, state).
+OPERATIONS = (
+    ("merge", "MERGE_HEAD", "BadMergeState"),
+    ("rebase", "rebase-merge", "BadRebaseState"),
+    ("rebase", os.path.join("rebase-apply", "rebasing"), "BadRebaseState"),
+    ("am", os.path.join("rebase-apply", "applying"), None),
+    ("cherry-pick", "CHERRY_PICK_HEAD", None),
+    ("revert", "REVERT_HEAD", None),
+    ("bisect", "BISECT_LOG", None),
+)
+
+
+def _read(path):
+    """Return the stripped contents of a small text file, or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def find_git_dir(start=None):
+    """Return the git directory of the repository containing ``start``.
+
+    Honours ``GIT_DIR`` and follows ``gitdir:`` files, as used by worktrees
+    and submodules. Returns None outside of a repository.
+    """
+    if os.environ.get("GIT_DIR"):
+        return os.path.abspath(os.environ["GIT_DIR"])
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        candidate = os.path.join(directory, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        elif os.path.isfile(candidate):
+            content = _read(candidate) or ""
+            if content.startswith("gitdir:"):
+                target = content[len("gitdir:") :].strip()
+                return os.path.normpath(os.path.join(directory, target))
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def common_dir(git_dir):
+    """Return the directory holding the refs shared by all worktrees."""
+    target = _read(os.path.join(git_dir, "commondir"))
+    if target:
+        return os.path.normpath(os.path.join(git_dir, target))
+    return git_dir
+
+
+def is_unborn(git_dir):
+    """Return whether HEAD is on a branch that has no commits yet."""
+    head = _read(os.path.join(git_dir, "HEAD"))
+    if not head or not head.startswith("ref:"):
+        return False
+    ref = head[len("ref:") :].strip()
+    refs_dir = common_dir(git_dir)
+    if os.path.isdir(os.path.join(refs_dir, "reftable")):
+        return False
+    if os.path.exists(os.path.join(refs_dir, ref)):
+        return False
+    try:
+        with open(os.path.join(refs_dir, "packed-refs"), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as packed:
+                return packed.find(f" {ref}\n".encode("utf-8")) == -1
+    except (OSError, ValueError):
+        # Missing or empty packed-refs.
+        return True
+
+
+def detect(start=None):
+    """Return the operation in progress in the current repository, or None."""
+    git_dir = find_git_dir(start)
+    if git_dir is None:
+        return None
+    for operation, name, state in OPERATIONS:
+        path = os.path.join(git_dir, name)
+        if os.path.exists(path):
+            return Detection(operation, state, path)
+    if is_unborn(git_dir):
+        return Detection("initial commit", "UncommittedState", git_dir)
+    return None
@@ -0,0 +1,82 @@
+"""Debounced handling of terminal resizes.
+
+Dragging a window edge or a tmux split sends a burst of ``SIGWINCH``. The
+signal handler only records the time and wakes the input loop through a
+pipe; the loop then waits until no signal has arrived for ``RESIZE_DEBOUNCE``
+seconds and repaints once, at the final size.
+"""
+import os
+import signal
+import time
+
+RESIZE_DEBOUNCE = 0.05
+
+
+class ResizeWatcher:
+    """Collects bursts of ``SIGWINCH`` into single resize events.
+
+    Use as a context manager around the input loop. Where the platform has
+    no ``SIGWINCH``, no resize is ever reported.
+    """
+
+    def __init__(self, debounce=RESIZE_DEBOUNCE):
+        """Initialize the watcher; signals are only caught once entered."""
+        self.debounce = debounce
+        self.fd = None
+        self._write_fd = None
+        self._previous = None
+        self._last = None
+
+    def __enter__(self):
+        """Catch ``SIGWINCH``."""
+        if hasattr(signal, "SIGWINCH"):
+            self.fd, self._write_fd = os.pipe()
+            os.set_blocking(self.fd, False)
+            os.set_blocking(self._write_fd, False)
+            self._previous = signal.signal(signal.SIGWINCH, self._on_signal)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Restore the previous handler."""
+        if self.fd is not None:
+            signal.signal(signal.SIGWINCH, self._previous)
+            os.close(self.fd)
+            os.close(self._write_fd)
+            self.fd = self._write_fd = None
+
+    def _on_signal(self, signum, frame):
+        """Record the resize and wake up the input loop."""
+        self._last = time.monotonic()
+        try:
+            os.write(self._write_fd, b"\0")
+        except OSError:
+            # The pipe is full: the loop has a wake-up pending already.
+            pass
+
+    def _drain(self):
+        """Empty the wake-up pipe."""
+        try:
+            while os.read(self.fd, 512):
+                pass
+        except OSError:
+            pass
+
+    @property
+    def pending(self):
+        """Whether a resize is in progress."""
+        return self._last is not None
+
+    def timeout(self):
+        """Return how long until the resize in progress settles, or None."""
+        if self._last is None:
+            return None
+        return max(0.0, self._last + self.debounce - time.monotonic())
+
+    def settled(self):
+        """Return True, once, when no signal arrived for the debounce delay."""
+        if self.fd is not None:
+            self._drain()
+        if self._last is None or self.timeout() > 0:
+            return False
+        self._last = None
+        return True
@@ -0,0 +1,231 @@
+"""Full-text search over state titles, bodies and option labels.
+
+The inverted index is built at package build time (``python -m gitfix.search``)
+and loaded the first time a search is started. When it is missing or was
+built from different content it is rebuilt in memory, which only takes a few
+milliseconds.
+"""
+import json
+import math
+import os
+import re
+from bisect import bisect_left
+
+from gitfix import git_states
+from gitfix.compositor import banner
+
+INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "search_index.json"
+)
+FIELD_WEIGHTS = {"title": 5.0, "option": 3.0, "body": 1.0}
+MAX_RESULTS = 10
+
+_token_re = re.compile(r"[a-z0-9]+(?:[-_][a-z0-9]+)*")
+_index = None
+
+
+def tokenize(text, min_length=2):
+    """Return the search terms of ``text``.
+
+    Hyphenated words such as ``filter-branch`` give the whole word and each
+    of its parts. Terms shorter than ``min_length`` are dropped.
+    """
+    terms = []
+    for word in _token_re.findall(text.lower()):
+        terms.append(word)
+        if "-" in word or "_" in word:
+            terms.extend(re.split(r"[-_]", word))
+    return [term for term in terms if len(term) >= min_length]
+
+
+class Index:
+    """An inverted index mapping terms to scored states."""
+
+    def __init__(self, crc, vocabulary, postings):
+        """Initialize the index from its sorted vocabulary and postings.
+
+        ``postings[i]`` lists the ``[node, score]`` pairs of ``vocabulary[i]``.
+        """
+        self.crc = crc
+        self.vocabulary = vocabulary
+        self.postings = postings
+
+    @classmethod
+    def build(cls, graph):
+        """Index every title, body and option label of ``graph``.
+
+        An option label describes the state it leads to, so it is indexed
+        under that state rather than the one displaying it.
+        """
+        weights = {}
+
+        def add(node, text, field):
+            for term in tokenize(text):
+                node_weights = weights.setdefault(term, {})
+                node_weights[node] = node_weights.get(node, 0.0) + FIELD_WEIGHTS[field]
+
+        for idx, node in enumerate(graph.nodes):
+            add(idx, node.title, "title")
+            add(idx, node.body, "body")
+            for label, target in node.edges:
+                add(graph.index(target), label, "option")
+
+        count = len(graph)
+        vocabulary = sorted(weights)
+        postings = []
+        for term in vocabulary:
+            idf = math.log(count / len(weights[term])) + 1.0
+            postings.append(
+                [
+                    [node, round(weight * idf, 3)]
+                    for node, weight in sorted(weights[term].items())
+                ]
+            )
+        return cls(graph.checksum(), vocabulary, postings)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by ``dump``."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["crc"], data["vocabulary"], data["postings"])
+
+    def dump(self, path):
+        """Write the index to ``path`` as compact JSON."""
+        data = {
+            "crc": self.crc,
+            "vocabulary": self.vocabulary,
+            "postings": self.postings,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def _scores(self, term, prefix):
+        """Return the scores of the states matching one term."""
+        scores = {}
+        start = bisect_left(self.vocabulary, term)
+        stop = start
+        while stop < len(self.vocabulary) and (
+            self.vocabulary[stop] == term
+            or (prefix and self.vocabulary[stop].startswith(term))
+        ):
+            for node, score in self.postings[stop]:
+                scores[node] = max(scores.get(node, 0.0), score)
+            stop += 1
+        return scores
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Return the node indexes of the states matching ``query``, best first.
+
+        Every term must match; the last one also matches as a prefix, so
+        results can be updated as the query is typed.
+        """
+        terms = tokenize(query, min_length=1)
+        if not terms:
+            return []
+        total = None
+        for position, term in enumerate(terms):
+            scores = self._scores(term, prefix=position == len(terms) - 1)
+            if total is None:
+                total = scores
+            else:
+                total = {
+                    node: total[node] + score
+                    for node, score in scores.items()
+                    if node in total
+                }
+            if not total:
+                return []
+        ranked = sorted(total.items(), key=lambda item: (-item[1], item[0]))
+        return [node for node, _ in ranked[:limit]]
+
+
+def load_index(path=INDEX_PATH):
+    """Return the search index of ``git_states``, loading it on first use."""
+    global _index
+    if _index is None:
+        crc = git_states.GRAPH.checksum()
+        try:
+            _index = Index.load(path)
+        except (OSError, ValueError, KeyError):
+            _index = None
+        if _index is None or _index.crc != crc:
+            _index = Index.build(git_states.GRAPH)
+    return _index
+
+
+class SearchView:
+    """Interactive search prompt, updated on every keystroke."""
+
+    def __init__(self, index):
+        """Start an empty search."""
+        self.index = index
+        self.query = ""
+        self.results = []
+        self.selected = 0
+        self.done = False
+        self.choice = None
+
+    def pending(self):
+        """Return whether the screen is waiting on background work."""
+        return False
+
+    def close(self):
+        """Nothing to stop: searching happens as keys are typed."""
+
+    def on_key(self, key):
+        """Update the query or the selection for a keypress."""
+        if key.name == "KEY_ESCAPE":
+            self.done = True
+        elif key.name == "KEY_ENTER":
+            if self.results:
+                self.choice = self.results[self.selected]
+            self.done = True
+        elif key.name in ("KEY_BACKSPACE", "KEY_DELETE"):
+            self._update(self.query[:-1])
+        elif key.name == "KEY_UP":
+            self.selected = max(0, self.selected - 1)
+        elif key.name == "KEY_DOWN":
+            self.selected = max(0, min(len(self.results) - 1, self.selected + 1))
+        elif not key.is_sequence and key.isprintable():
+            self._update(self.query + key)
+
+    def _update(self, query):
+        """Search again for a new query."""
+        self.query = query
+        views = git_states.StartState.views
+        self.results = [views[node].instance for node in self.index.search(query)]
+        self.selected = 0
+
+    def regions(self, term):
+        """Return the compositor regions of the search screen."""
+        lines = []
+        for idx, state in enumerate(self.results):
+            line = f"{state.title} ({state})"[: term.width]
+            lines.append(term.reverse(line) if idx == self.selected else line)
+        if self.query and not self.results:
+            lines.append(term.bright_black("No matching states."))
+        return {
+            "title": [term.cyan(f"Search: {self.query}")],
+            "body": [""] + lines + [""],
+            "banner": banner(
+                term,
+                "Type to search, up/down to select, enter to jump, escape to cancel.",
+            ),
+        }
+
+
+def main():
+    """Build the search index from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the gitfix search index.")
+    parser.add_argument("--out", default=INDEX_PATH, help="index file to write")
+    args = parser.parse_args()
+    index = Index.build(git_states.GRAPH)
+    index.dump(args.out)
+    print(f"Indexed {len(index.vocabulary)} terms to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
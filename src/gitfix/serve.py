@@ -0,0 +1,239 @@
+"""HTTP server publishing the guide as linked HTML pages.
+
+Every page is rendered once at startup and kept in memory, with its gzipped
+form and an ETag, so a request is answered by a dictionary lookup and a
+single write. The server runs on asyncio and keeps connections alive, so one
+process serves hundreds of concurrent clients.
+"""
+import asyncio
+import gzip
+import hashlib
+import sys
+from collections import namedtuple
+
+from gitfix import git_states
+from gitfix.pages import PAGE_WIDTH, state_page
+from gitfix.prerender import iter_states
+
+BACKLOG = 1024
+# Seconds to wait for the next request on a kept-alive connection.
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_SIZE = 16384
+# Largest request body read and discarded to keep the connection alive.
+MAX_DISCARD_SIZE = 65536
+CACHE_CONTROL = "public, max-age=300"
+
+Page = namedtuple("Page", ["etag", "body", "gzip_etag", "gzip_body"])
+Page.__doc__ = """A page ready to be sent, plain and gzipped, with their ETags."""
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def page_url(state):
+    """Return the path of the page of ``state``."""
+    return f"/{state}"
+
+
+def make_page(html):
+    """Return a page for the HTML text ``html``."""
+    body = html.encode("utf-8")
+    digest = hashlib.sha1(body).hexdigest()[:16]  # noqa: S303
+    etag = '"' + digest + '"'
+    gzip_etag = '"' + digest + '-gz"'
+    return Page(etag, body, gzip_etag, gzip.compress(body, 9))
+
+
+def build_pages(width=PAGE_WIDTH):
+    """Render the page of every state, keyed by path."""
+    pages = {}
+    for state in iter_states():
+        pages[page_url(state)] = make_page(state_page(state, page_url, width))
+    pages["/"] = pages[page_url(git_states.StartState())]
+    return pages
+
+
+def accepts_gzip(value):
+    """Return whether an ``Accept-Encoding`` header value allows gzip."""
+    for coding in value.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def parse_request(data):
+    """Return the method, path, version and lower-cased headers of a request.
+
+    Raises ValueError on a malformed request.
+    """
+    lines = data.decode("latin-1").split("\r\n")
+    method, path, version = lines[0].split(" ")
+    if not version.startswith("HTTP/1."):
+        raise ValueError(f"unsupported version {version}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, path.split("?", 1)[0], version, headers
+
+
+def keep_alive(version, headers):
+    """Return whether the client wants to keep the connection open."""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def body_length(headers):
+    """Return the length of a request's body, or None if it is not known.
+
+    A chunked body, or a ``Content-Length`` that is not a number, leaves the
+    end of the request unknown, so the connection cannot be reused.
+    """
+    if "transfer-encoding" in headers:
+        return None
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+async def skip_body(reader, headers):
+    """Read past the body of a request, and return whether it was skipped.
+
+    Pages are only fetched, but a body sent with a request must be skipped or
+    it would be read as the next request. A body that cannot be skipped means
+    the connection must be closed after answering.
+    """
+    length = body_length(headers)
+    if length is None or length > MAX_DISCARD_SIZE:
+        return False
+    if length:
+        try:
+            await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return False
+    return True
+
+
+def respond(pages, method, path, headers):
+    """Return the status, headers and body answering a request."""
+    if method not in ("GET", "HEAD"):
+        return 405, {"Allow": "GET, HEAD"}, b""
+    page = pages.get(path)
+    if page is None:
+        return 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not found\n"
+    response_headers = {
+        "Content-Type": "text/html; charset=utf-8",
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(headers.get("accept-encoding", "")):
+        etag, body = page.gzip_etag, page.gzip_body
+        response_headers["Content-Encoding"] = "gzip"
+    else:
+        etag, body = page.etag, page.body
+    response_headers["ETag"] = etag
+    if etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+        return 304, response_headers, b""
+    return 200, response_headers, body
+
+
+def format_response(status, headers, body, send_body=True, close=False):
+    """Return the bytes of a response."""
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    if status != 304:
+        lines.append(f"Content-Length: {len(body)}")
+    if close:
+        lines.append("Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + body if send_body and status != 304 else head
+
+
+class Server:
+    """Answers requests for the pages, over kept-alive connections."""
+
+    def __init__(self, pages):
+        """Serve ``pages``, a dict of ``Page`` by path."""
+        self.pages = pages
+
+    async def handle(self, reader, writer):
+        """Answer the requests of one connection until it is closed."""
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(format_response(400, {}, b"", close=True))
+                    break
+                try:
+                    method, path, version, headers = parse_request(data)
+                except ValueError:
+                    writer.write(format_response(400, {}, b"", close=True))
+                    break
+                close = not keep_alive(version, headers)
+                close = not await skip_body(reader, headers) or close
+                status, response_headers, body = respond(
+                    self.pages, method, path, headers
+                )
+                writer.write(
+                    format_response(
+                        status, response_headers, body, method != "HEAD", close
+                    )
+                )
+                await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def start(self, loop, host, port):
+        """Start listening, and return the asyncio server."""
+        return loop.run_until_complete(
+            asyncio.start_server(
+                self.handle, host, port, backlog=BACKLOG, limit=MAX_HEADER_SIZE
+            )
+        )
+
+
+def run(args):
+    """Serve the guide until interrupted."""
+    pages = build_pages(args.width)
+    loop = asyncio.new_event_loop()
+    try:
+        server = Server(pages).start(loop, args.host, args.port)
+    except OSError as e:
+        sys.stderr.write(f"gitfix serve: {e}\n")
+        loop.close()
+        return 2
+    host, port = server.sockets[0].getsockname()[:2]
+    sys.stdout.write(
+        f"Serving {len(pages) - 1} states on http://{host}:{port}/ "
+        "(press Ctrl-C to stop)\n"
+    )
+    sys.stdout.flush()
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+    return 0
@@ -0,0 +1,78 @@
+"""Non-interactive display of a single state, for scripts and bots."""
+import os
+import re
+import sys
+
+from gitfix import git_states
+from gitfix.navigation import Navigator
+from gitfix.render import render_state
+
+DEFAULT_WIDTH = 80
+
+
+def find_state(target):
+    """Return the state at an option path such as ``1.2.0``, or with a name.
+
+    An empty path is the start state. Names are matched with or without the
+    ``State`` suffix. Raises ValueError if nothing matches.
+    """
+    start = git_states.StartState()
+    if re.match(r"^\d+(\.\d+)*$|^$", target):
+        path = [int(choice) for choice in target.split(".") if choice]
+        return Navigator.from_path(start, path).current
+    for name in (target, target + "State"):
+        if name in git_states.GRAPH.ids:
+            return start.views[git_states.GRAPH.index(name)].instance
+    raise ValueError(f"No state named {target!r}")
+
+
+def detect_color_system(color):
+    """Return the Rich color system to render with for a ``--color`` choice."""
+    if color == "never" or (color == "auto" and not sys.stdout.isatty()):
+        return None
+    elif color != "auto":
+        return color
+    elif os.environ.get("COLORTERM") in ("truecolor", "24bit"):
+        return "truecolor"
+    elif "256" in os.environ.get("TERM", ""):
+        return "256"
+    return "standard"
+
+
+def terminal_width():
+    """Return the width of the terminal on stdout, or a default when piped."""
+    if sys.stdout.isatty():
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    return DEFAULT_WIDTH
+
+
+def format_raw(state):
+    """Return the state as Markdown."""
+    title, body = state.describe()
+    lines = [f"# {title}", "", body.strip(), ""]
+    lines.extend(f"{idx}. {option}" for idx, option in enumerate(state.options))
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def format_rendered(state, width, color_system):
+    """Return the state rendered for a terminal."""
+    title = state.describe()[0]
+    lines = [title, "", render_state(state, width, color_system), ""]
+    lines.extend(f"{idx}: {option}" for idx, option in enumerate(state.options))
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def run(args):
+    """Print the state selected on the command line."""
+    try:
+        state = find_state(args.target)
+    except ValueError as e:
+        sys.stderr.write(f"gitfix show: {e}\n")
+        return 2
+    if args.raw:
+        output = format_raw(state)
+    else:
+        width = args.width or terminal_width()
+        output = format_rendered(state, width, detect_color_system(args.color))
+    sys.stdout.write(output)
+    return 0
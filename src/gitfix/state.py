@@ -1,31 +1,76 @@
 """Base class for Git Fix states."""
+from gitfix.graph import Graph, Node
 
+PARENT = "Parent"
+FORWARD = "Forward"
 
-class State:
-    """Defines an individual state within the state machine."""
 
-    def __init__(self, parent=None, options=None):
-        """Initializes the State."""
-        self.parent = parent
-        self.options = options
+class _StateType(type):
+    """Metaclass giving every State subclass empty ``__slots__``."""
+
+    def __new__(mcs, name, bases, namespace):
+        """Create the class without a per-instance ``__dict__``."""
+        namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class State(metaclass=_StateType):
+    """Defines an individual state within the state machine.
+
+    Subclasses declare a ``title``, a ``body`` and their ordered ``edges``;
+    ``compile_states`` turns them into a ``Graph`` and binds each class to
+    its node, so a State instance is a thin view over the compiled graph.
+    Each class has a single, immutable instance: calling the class returns
+    it, and where the user came from is tracked by a ``Navigator``.
+    """
+
+    title = ""
+    body = ""
+    edges = ()
+
+    graph = None
+    views = ()
+    node = None
+    options = ()
+    instance = None
+
+    def __new__(cls, parent=None):
+        """Return the shared instance of the State."""
+        if cls.instance is None:
+            return super().__new__(cls)
+        return cls.instance
+
+    def __init__(self, parent=None):
+        """Initializes the State; ``parent`` is accepted for compatibility."""
 
     def parse_choice(self, event):
-        """Parses the choice made by the user."""
-        test = event.name
-        if test == "KEY_LEFT":
-            return "Parent"
+        """Parses the choice made by the user into an option index."""
+        if event.name == "KEY_LEFT":
+            return PARENT
+        elif event.name == "KEY_RIGHT":
+            return FORWARD
         try:
             code = int(event)
         except ValueError:
             return None
-        if not self.options or code >= len(self.options):
-            return None
-        else:
-            return self.options[code]
+        if 0 <= code < len(self.options):
+            return code
+        return None
+
+    def child(self, choice):
+        """Return the state reached by the option at index ``choice``."""
+        return self.views[self.graph.transitions[self.node][choice]].instance
 
     def on_event(self, event):
-        """Handle events that are delegated to this State."""
-        pass
+        """Return the state reached by an option key, or this State otherwise."""
+        choice = self.parse_choice(event)
+        if choice is None or choice in (PARENT, FORWARD):
+            return self
+        return self.child(choice)
+
+    def describe(self):
+        """Describe the state."""
+        return self.title, self.body
 
     def __repr__(self):
         """Leverages the __str__ method to describe the State."""
@@ -34,3 +79,18 @@ class State:
     def __str__(self):
         """Returns the name of the State."""
         return self.__class__.__name__
+
+
+def compile_states(classes):
+    """Compile State subclasses into a graph and bind each class to its node."""
+    classes = tuple(classes)
+    graph = Graph(
+        Node(cls.__name__, cls.title, cls.body, tuple(cls.edges)) for cls in classes
+    )
+    for idx, cls in enumerate(classes):
+        cls.graph = graph
+        cls.views = classes
+        cls.node = idx
+        cls.options = graph.options[idx]
+        cls.instance = cls()
+    return graph
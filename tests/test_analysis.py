@@ -0,0 +1,66 @@
+from gitfix import git_states
+from gitfix.analysis import analyze, cyclic_nodes, shortest_paths, to_dot
+from gitfix.graph import Graph, Node
+
+
+def graph(edges):
+    return Graph(
+        Node(
+            name,
+            name.lower(),
+            "",
+            tuple((str(idx), target) for idx, target in enumerate(targets)),
+        )
+        for name, targets in edges.items()
+    )
+
+
+def test_cyclic_nodes():
+    cyclic = graph(
+        {
+            "A": ["B", "D"],
+            "B": ["C"],
+            "C": ["A"],
+            "D": ["D", "E"],
+            "E": [],
+            "F": ["G"],
+            "G": ["F"],
+        }
+    )
+    assert cyclic_nodes(cyclic) == [0, 1, 2, 3, 5, 6]
+
+
+def test_acyclic_graph_has_no_cycles():
+    assert cyclic_nodes(graph({"A": ["B", "C"], "B": ["C"], "C": []})) == []
+
+
+def test_deep_graph_does_not_overflow_the_stack():
+    names = [f"S{idx}" for idx in range(5000)]
+    chain = {name: [following] for name, following in zip(names, names[1:])}
+    chain[names[-1]] = [names[0]]
+    assert len(cyclic_nodes(graph(chain))) == 5000
+
+
+def test_analyze():
+    analysis = analyze(graph({"A": ["B", "C"], "B": ["C"] * 12, "C": [], "D": ["A"]}))
+    assert analysis.paths == {0: [], 1: [0], 2: [1]}
+    assert analysis.depths == {0: 0, 1: 1, 2: 1}
+    assert analysis.leaves == [2]
+    assert analysis.unreachable == [3]
+    assert analysis.untypable == [(1, 10), (1, 11)]
+    assert "color=red" in to_dot(
+        graph({"A": ["A"] * 11}), analyze(graph({"A": ["A"] * 11}))
+    )
+
+
+def test_guide_graph_is_sound():
+    analysis = analyze(git_states.GRAPH)
+    assert analysis.unreachable == []
+    assert analysis.untypable == []
+
+
+def test_shortest_paths_ignore_a_stale_table(tmp_path):
+    table = tmp_path / "paths.json"
+    table.write_text('{"checksum": 0, "start": 0, "paths": []}')
+    paths = shortest_paths(git_states.GRAPH, 0, str(table))
+    assert len(paths) == len(git_states.GRAPH)
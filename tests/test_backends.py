@@ -0,0 +1,49 @@
+from gitfix.backends import DEFAULT_ATTRS, FramebufferBackend, sgr, styled_runs
+
+
+def test_autowrap_continues_on_the_next_row():
+    backend = FramebufferBackend(3, 5)
+    backend.write(b"abcdefg")
+    assert backend.lines() == ["abcde", "fg", ""]
+
+
+def test_autowrap_scrolls_at_the_bottom():
+    backend = FramebufferBackend(2, 3)
+    backend.write(b"abcdefgh")
+    assert backend.lines() == ["def", "gh"]
+
+
+def test_without_autowrap_characters_are_lost():
+    backend = FramebufferBackend(2, 3, autowrap=False)
+    backend.write(b"abcdef")
+    assert backend.lines() == ["abc", ""]
+
+
+def test_cursor_moves_and_clears():
+    backend = FramebufferBackend(3, 10)
+    term = backend.term
+    backend.write(
+        f"hello{term.move_yx(1, 2)}there{term.move_yx(0, 2)}{term.clear_eol}".encode()
+    )
+    assert backend.lines() == ["he", "  there", ""]
+
+
+def test_sgr_colors_and_flags():
+    attrs = sgr(DEFAULT_ATTRS, [1, 31, 48, 5, 200])
+    assert (attrs.bold, attrs.fg, attrs.bg) == (True, 1, 200)
+    attrs = sgr(attrs, [38, 2, 1, 2, 3, 22])
+    assert (attrs.bold, attrs.fg) == (False, (1, 2, 3))
+    assert sgr(attrs, [0]) == DEFAULT_ATTRS
+
+
+def test_cells_keep_their_attributes():
+    backend = FramebufferBackend(1, 10)
+    backend.write(f"a{backend.term.bold}b{backend.term.normal}c".encode())
+    bold = [cell.attrs.bold for cell in backend.cells[0][:3]]
+    assert bold == [False, True, False]
+
+
+def test_styled_runs():
+    runs = list(styled_runs("a\x1b[1mb\x1b[0mc"))
+    assert [text for text, _ in runs] == ["a", "b", "c"]
+    assert [attrs.bold for _, attrs in runs] == [False, True, False]
@@ -0,0 +1,81 @@
+from gitfix.backends import FixedSizeTerminal, FramebufferBackend
+from gitfix.compositor import Compositor, Viewport, clip
+
+
+def test_first_frame_clears_the_screen():
+    backend = FramebufferBackend(10, 40)
+    data = Compositor(backend).compose({"title": ["Hello"]})
+    assert data.startswith(backend.term.home.encode())
+    assert backend.term.clear.encode() in data
+
+
+def test_only_changed_rows_are_rewritten():
+    backend = FramebufferBackend(10, 40)
+    compositor = Compositor(backend)
+    compositor.draw({"title": ["Title"], "body": ["one", "two"]})
+    data = compositor.compose({"title": ["Title"], "body": ["one", "three"]})
+    assert b"three" in data
+    assert b"Title" not in data
+    assert b"one" not in data
+    backend.write(data)
+    assert backend.lines()[5:8] == ["Title", "one", "three"]
+
+
+def test_unchanged_frame_writes_nothing():
+    backend = FramebufferBackend(10, 40)
+    compositor = Compositor(backend)
+    compositor.draw({"body": ["same"]})
+    assert compositor.compose({"body": ["same"]}) == b""
+
+
+def test_resize_repaints_in_full():
+    backend = FramebufferBackend(10, 40)
+    compositor = Compositor(backend)
+    compositor.draw({"body": ["same"]})
+    compositor.invalidate()
+    assert b"same" in compositor.compose({"body": ["same"]})
+
+
+def test_clip_keeps_escape_sequences():
+    term = FixedSizeTerminal(10, 10)
+    line = term.red("0123456789abc") + "def"
+    clipped = clip(term, line)
+    assert term.length(clipped) == 10
+    assert term.strip_seqs(clipped) == "0123456789"
+    assert clipped.endswith(term.normal)
+
+
+def test_clip_keeps_sequences_blessed_does_not_know():
+    term = FixedSizeTerminal(10, 10)
+    code = "\x1b[38;5;231;48;5;235m"
+    link = "\x1b]8;id=1;https://example.com\x1b\\"
+    line = f"{code}git\x1b[0m {link}log\x1b]8;;\x1b\\ --grep {code}foo\x1b[0m"
+    clipped = clip(term, line, 9)
+    assert clipped == f"{code}git\x1b[0m {link}log\x1b]8;;\x1b\\ -{code}\x1b[0m"
+    assert clip(term, line, 20) == line
+
+
+def test_rich_colors_reach_the_screen_intact():
+    backend = FramebufferBackend(4, 10)
+    compositor = Compositor(backend)
+    compositor.draw({"body": ["\x1b[38;5;231;48;5;235mgit\x1b[0m log --grep foo"]})
+    assert backend.lines()[2] == "git log --"
+    assert backend.cells[2][0].attrs.bg == 235
+    assert backend.cells[2][3].attrs.bg is None
+
+
+def test_wide_lines_do_not_wrap():
+    backend = FramebufferBackend(4, 10)
+    compositor = Compositor(backend)
+    compositor.draw({"body": ["x" * 15, "y"]})
+    assert backend.lines()[2:] == ["x" * 10, "y"]
+
+
+def test_viewport_scrolls_within_the_lines():
+    viewport = Viewport()
+    viewport.show("key", [str(n) for n in range(10)])
+    assert viewport.visible(4) == ["0", "1", "2", "3"]
+    viewport.page(1)
+    assert viewport.visible(4) == ["3", "4", "5", "6"]
+    viewport.scroll(100)
+    assert viewport.position() == "7-10 of 10"
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from gitfix import git_states
+from gitfix.export import MANIFEST, export
+from gitfix.main import build_parser
+from gitfix.prerender import iter_states
+
+
+@pytest.fixture(scope="module")
+def states():
+    return len(list(iter_states()))
+
+
+def test_export_is_incremental(tmp_path, states):
+    assert export(str(tmp_path), "md", jobs=1) == (states, 0, 0)
+    assert export(str(tmp_path), "md", jobs=1) == (0, states, 0)
+    (tmp_path / "StartState.md").unlink()
+    assert export(str(tmp_path), "md", jobs=1) == (1, states - 1, 0)
+    start = (tmp_path / "StartState.md").read_text()
+    assert start.startswith(f"# {git_states.StartState.title}")
+    assert "(CommitedQuestionState.md)" in start
+
+
+@pytest.mark.parametrize("force", [False, True])
+def test_export_removes_states_that_are_gone(tmp_path, states, force):
+    export(str(tmp_path), "md", jobs=1)
+    manifest = tmp_path / MANIFEST.format(format="md")
+    data = json.loads(manifest.read_text())
+    data["files"]["GoneState.md"] = "0"
+    manifest.write_text(json.dumps(data))
+    (tmp_path / "GoneState.md").write_text("# Gone\n")
+    written, _, removed = export(str(tmp_path), "md", jobs=1, force=force)
+    assert written == (states if force else 0)
+    assert removed == 1
+    assert not (tmp_path / "GoneState.md").exists()
+
+
+def test_html_export_has_an_index(tmp_path):
+    export(str(tmp_path), "html", jobs=1)
+    index = (tmp_path / "index.html").read_text()
+    assert index == (tmp_path / "StartState.html").read_text()
+    assert 'href="CommitedQuestionState.html"' in index
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2", "x"])
+def test_jobs_must_be_positive(jobs, capsys):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["export", "--out", "out", "--jobs", jobs])
+    assert "not a positive integer" in capsys.readouterr().err
+
+
+def test_export_arguments():
+    args = build_parser().parse_args(["export", "--out", "out", "--jobs", "2"])
+    assert (args.out, args.jobs, args.force) == ("out", 2, False)
+
+
+@pytest.mark.parametrize("width", ["0", "-1", "x"])
+def test_width_must_be_positive(width):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["export", "--out", "out", "--width", width])
@@ -0,0 +1,79 @@
+from gitfix import git_states
+from gitfix.backends import FramebufferBackend
+from gitfix.compositor import banner
+from gitfix.finder import Finder, FinderIndex, load_finder_index
+
+
+def query(text):
+    finder = Finder(load_finder_index())
+    for char in text:
+        finder.type(char)
+    return finder
+
+
+def ids(finder):
+    return [git_states.GRAPH.nodes[match.entry.node].id for match in finder.matches]
+
+
+def test_index_is_built_once():
+    assert load_finder_index() is load_finder_index()
+
+
+def test_index_has_every_title_and_option():
+    graph = git_states.GRAPH
+    index = FinderIndex(graph)
+    options = sum(len(node.edges) for node in graph.nodes)
+    assert len(index.entries) == len(graph.nodes) + options
+    assert index.narrow(index.all, "reb") == {
+        number for number, entry in enumerate(index.entries) if "reb" in entry.folded
+    }
+
+
+def test_empty_query_lists_every_state():
+    finder = query("")
+    assert len(finder.matches) == len(git_states.GRAPH.nodes)
+    assert all(match.entry.via is None for match in finder.matches)
+
+
+def test_each_word_must_match():
+    finder = query("broken rebase")
+    assert ids(finder) == ["BadRebaseState"]
+    assert finder.matches[0].spans == ((18, 24), (25, 31))
+
+
+def test_each_state_is_listed_once():
+    finder = query("commit")
+    assert len(ids(finder)) == len(set(ids(finder)))
+
+
+def test_titles_rank_above_options():
+    finder = query("rebase")
+    assert finder.matches[0].entry.via is None
+    assert finder.matches[0].entry.text == "Recovering from a broken rebase"
+
+
+def test_case_is_ignored():
+    assert ids(query("BROKEN Rebase")) == ids(query("broken rebase"))
+
+
+def test_no_matches():
+    assert query("rebasex").matches == []
+
+
+def test_delete_returns_to_the_shorter_query():
+    finder = query("rebasex")
+    finder.delete()
+    assert finder.query == "rebase"
+    assert ids(finder) == ids(query("rebase"))
+    for _ in range(len("rebase")):
+        finder.delete()
+    finder.delete()
+    assert finder.query == ""
+    assert len(finder.matches) == len(git_states.GRAPH.nodes)
+
+
+def test_banner_is_wrapped_to_the_terminal():
+    term = FramebufferBackend(30, 40).term
+    lines = banner(term, "Type part of a title or option, enter to jump. " * 2)
+    assert len(lines) > 1
+    assert all(term.length(line) == 40 for line in lines)
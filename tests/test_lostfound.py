@@ -0,0 +1,114 @@
+import os
+import time
+
+import pytest
+
+from gitfix.lostfound import Candidate, LostWorkFinder, TopK, match_score, parse_log
+
+STASH = "1" * 40
+COMMIT = "2" * 40
+BASE = "3" * 40
+INDEX = "4" * 40
+LOG = (
+    f"\x1e{STASH}\x001600000000\x00{BASE} {INDEX}\x00WIP on main: 3333333 Fix parser\n"
+    "\nsrc/parser.py\nREADME.md\n"
+    f"\x1e{COMMIT}\x001500000000\x00{BASE}\x00Add the lexer\n"
+    "\nsrc/lexer.py\n"
+)
+
+
+@pytest.fixture
+def fake_git(tmp_path, monkeypatch):
+    """Put a ``git`` on the PATH running a shell script, with ``$1`` the command."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    git = bin_dir / "git"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def install(script):
+        git.write_text(f"#!/bin/sh\n{script}\n")
+        git.chmod(0o755)
+
+    return install
+
+
+def wait(finder):
+    deadline = time.monotonic() + 5
+    while finder.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not finder.pending()
+
+
+def test_parse_log():
+    stash, commit = parse_log(LOG)
+    assert stash == Candidate(
+        STASH,
+        1600000000,
+        "stash",
+        "WIP on main: 3333333 Fix parser",
+        ("src/parser.py", "README.md"),
+    )
+    assert commit.kind == "commit"
+    assert commit.paths == ("src/lexer.py",)
+
+
+def test_merges_are_not_stashes():
+    log = f"\x1e{COMMIT}\x001500000000\x00{BASE} {INDEX}\x00Merge branch 'x'\n"
+    (candidate,) = parse_log(log)
+    assert candidate.kind == "commit"
+    assert candidate.paths == ()
+
+
+def test_match_score():
+    stash, commit = parse_log(LOG)
+    assert match_score(stash, ["parser"]) == 2
+    assert match_score(stash, ["readme"]) == 1
+    assert match_score(commit, ["parser", "lexer"]) == 2
+    assert match_score(commit, []) == 0
+
+
+def test_top_k():
+    top = TopK(3)
+    for key in (5, 1, 9, 3, 7, 2):
+        top.push((key, 0), f"item {key}")
+    assert top.items() == ["item 9", "item 7", "item 5"]
+    assert TopK(2).items() == []
+
+
+def test_finder_ranks_the_dangling_commits(fake_git, tmp_path):
+    (tmp_path / "log").write_text(LOG)
+    fake_git(
+        f'case "$1" in\n'
+        f"fsck) printf 'dangling blob {BASE}\\ndangling commit {STASH}\\n"
+        f"dangling commit {COMMIT}\\n' ;;\n"
+        f"log) cat > /dev/null; cat {tmp_path / 'log'} ;;\n"
+        "esac"
+    )
+    finder = LostWorkFinder(str(tmp_path), "lexer")
+    wait(finder)
+    assert finder.error is None
+    assert finder.scanned == 2
+    assert [candidate.sha for candidate in finder.results()] == [COMMIT, STASH]
+
+
+def test_failed_fsck_is_reported(fake_git, tmp_path):
+    fake_git("exit 128")
+    finder = LostWorkFinder(str(tmp_path))
+    wait(finder)
+    assert finder.error == "git fsck failed"
+
+
+def test_close_kills_a_running_fsck(fake_git, tmp_path):
+    fake_git(f"sleep 30\necho 'dangling commit {COMMIT}'")
+    finder = LostWorkFinder(str(tmp_path))
+    deadline = time.monotonic() + 5
+    while not finder._processes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (fsck,) = finder._processes
+    started = time.monotonic()
+    finder.close()
+    wait(finder)
+    assert fsck.wait(timeout=5) != 0
+    assert time.monotonic() - started < 5
+    assert finder.error is None
+    assert finder.results() == []
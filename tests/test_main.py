@@ -0,0 +1,185 @@
+import os
+
+import pytest
+
+from gitfix import git_states
+from gitfix.backends import FramebufferBackend
+from gitfix.main import Guide, handle_keys, interactive
+
+LEFT = "\x1b[D"
+RIGHT = "\x1b[C"
+DOWN = "\x1b[B"
+
+
+class InterruptedBackend(FramebufferBackend):
+    """A screen on which Ctrl-C is pressed once the keys run out."""
+
+    def read_key(self, timeout, fds=()):
+        """Return the next key, or interrupt the guide."""
+        if not self.keys:
+            raise KeyboardInterrupt()
+        return super().read_key(timeout, fds)
+
+
+@pytest.fixture
+def guide():
+    backend = FramebufferBackend(30, 80)
+    guide = Guide(backend, detect=False)
+    guide.draw()
+    yield guide
+    guide.close()
+
+
+def press(guide, *keys):
+    backend = guide.backend
+    backend.keys.extend(keys)
+    handle_keys(guide, backend, backend.read_key(0))
+    guide.draw()
+
+
+def crumbs(guide):
+    return [str(state) for state in guide.navigator.breadcrumbs()]
+
+
+def test_starts_on_the_start_state(guide):
+    assert str(guide.navigator.current) == "StartState"
+    assert guide.navigator.current.title in guide.backend.text()
+
+
+def test_options_lead_to_their_states(guide):
+    press(guide, "0")
+    assert crumbs(guide) == ["StartState", "CommitedQuestionState"]
+    assert "Have you committed?" in guide.backend.text()
+
+
+def test_back_and_forward(guide):
+    press(guide, "0", "1")
+    press(guide, LEFT)
+    assert str(guide.navigator.current) == "CommitedQuestionState"
+    press(guide, RIGHT)
+    assert str(guide.navigator.current) == "BadRebaseState"
+    press(guide, LEFT, LEFT, LEFT)
+    assert str(guide.navigator.current) == "StartState"
+
+
+def test_incremental_frames_match_a_full_repaint(guide):
+    press(guide, "0", "0", LEFT, "2", LEFT, LEFT)
+    fresh = FramebufferBackend(30, 80)
+    other = Guide(fresh, detect=False)
+    other.navigator = guide.navigator
+    other.draw()
+    assert guide.backend.lines() == fresh.lines()
+
+
+@pytest.mark.parametrize("state", ["StartState", "LostNFoundState"])
+@pytest.mark.parametrize("width", [40, 80, 100])
+def test_no_line_wraps(state, width):
+    screens = []
+    for autowrap in (True, False):
+        backend = FramebufferBackend(30, width, autowrap=autowrap)
+        guide = Guide(backend, detect=False)
+        guide.navigator.jump(getattr(git_states, state)())
+        guide.draw()
+        guide.close()
+        screens.append(backend.lines())
+    assert screens[0] == screens[1]
+
+
+def test_interrupt_stops_background_work(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    closed = []
+    close = Guide.close
+
+    def record_close(guide):
+        closed.append(guide)
+        close(guide)
+
+    monkeypatch.setattr(Guide, "close", record_close)
+    backend = InterruptedBackend(30, 80, keys=["0"])
+    with pytest.raises(KeyboardInterrupt):
+        interactive(backend)
+    assert len(closed) == 1
+    assert not backend.text().strip()
+
+
+def test_interrupt_closes_the_open_view(tmp_path, monkeypatch):
+    from gitfix.lostfound import LostWorkView
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "git").write_text('#!/bin/sh\n[ "$1" = fsck ] && sleep 30\nexit 1\n')
+    (bin_dir / "git").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    (repo / ".git" / "HEAD").write_text("1" * 40 + "\n")
+    monkeypatch.chdir(repo)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    views = []
+    close = LostWorkView.close
+
+    def record_close(view):
+        views.append(view)
+        close(view)
+
+    monkeypatch.setattr(LostWorkView, "close", record_close)
+    backend = InterruptedBackend(30, 80, keys=["1", "f", "\r"])
+    with pytest.raises(KeyboardInterrupt):
+        interactive(backend)
+    (view,) = views
+    view.finder._thread.join(5)
+    assert not view.finder.pending()
+    (fsck,) = view.finder._processes
+    assert fsck.wait(timeout=5) != 0
+
+
+def test_long_bodies_scroll_with_the_options_on_screen():
+    backend = FramebufferBackend(16, 80)
+    guide = Guide(backend, detect=False)
+    state = git_states.CommittedReallyState()
+    guide.navigator.jump(state)
+    guide.draw()
+    text = backend.text()
+    assert "Lines 1-" in text
+    assert all(
+        f"{idx}: {option}"[:60] in text for idx, option in enumerate(state.options)
+    )
+    backend.keys.append("j")
+    handle_keys(guide, backend, backend.read_key(0))
+    guide.draw()
+    assert "Lines 2-" in backend.text()
+    guide.close()
+
+
+def test_typed_ahead_keys_draw_a_single_frame(guide):
+    frames = guide.compositor.frames
+    press(guide, "0", "2", "1")
+    assert guide.compositor.frames == frames + 1
+    assert str(guide.navigator.current) == "UncommittedEverythingState"
+
+
+def test_typed_ahead_keys_stop_at_quit(guide):
+    guide.backend.keys.extend(["0", "q", "1"])
+    handle_keys(guide, guide.backend, guide.backend.read_key(0))
+    assert not guide.running
+    assert str(guide.navigator.current) == "CommitedQuestionState"
+
+
+def test_finder_jumps_to_a_title(guide):
+    press(guide, "\x10", *"broken rebase", "\r")
+    assert crumbs(guide)[-1] == "BadRebaseState"
+    press(guide, LEFT)
+    assert str(guide.navigator.current) == "CommitedQuestionState"
+
+
+def test_finder_jumps_through_the_option_matched(guide):
+    press(guide, "\x10", *"i want to remove the last commit", DOWN, "\r")
+    assert crumbs(guide)[-2:] == ["ChangeLastState", "RemoveLastState"]
+    press(guide, LEFT)
+    assert str(guide.navigator.current) == "ChangeLastState"
+
+
+def test_finder_escape_keeps_the_state(guide):
+    press(guide, "0", "\x10", *"rebase", "\x1b")
+    assert str(guide.navigator.current) == "CommitedQuestionState"
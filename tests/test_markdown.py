@@ -0,0 +1,89 @@
+import re
+
+import pytest
+
+from gitfix.prerender import iter_states
+from gitfix.render import find_md_tables, parse_md, parse_md_table, split_md_table
+
+# The table pattern used before find_md_tables, as the reference.
+TABLE_RE = re.compile(
+    r"(^|[^|]\n)((?:^\|[^\n]*\|(?:\n|$))+)([^|]|$)", flags=re.MULTILINE | re.S
+)
+DOCUMENTS = [
+    "No tables here.\n",
+    "|a|b|\n|-|-|\n|1|2|",
+    "Intro\n\n|a|b|\n|:-:|-:|\n|1|2|\n\nOutro\n",
+    "Intro\n|a|\n|b|\nOutro\n|c|\n",
+    "|x|\n\n|y|\n",
+    "| not a row\n|\n||\n",
+]
+
+
+def normalize(md):
+    md = re.sub(r"\n([\r\t ]*\n)+", r"\n\n", md, flags=re.MULTILINE)
+    md = re.sub(r"^[\t ]*\|", r"|", md, flags=re.MULTILINE)
+    return re.sub(r"\|[\t ]*$", r"|", md, flags=re.MULTILINE)
+
+
+def regex_parse_md(md, width, color_system):
+    """Render ``md`` as it was with one regex substitution per table."""
+    from rich.console import Console
+    from rich.markdown import Markdown
+
+    md = normalize(md)
+    console = Console(width=width, color_system=color_system)
+    tables = []
+
+    def table(match):
+        before = "" if match.group(1) == "\n\n" else "\n"
+        after = "  " if match.group(3) == "\n" else "  \n"
+        tables.append(before + parse_md_table(match.group(2), console))
+        placeholder = f"<#MD-TABLE-{len(tables) - 1}#>"
+        return f"{match.group(1)}{placeholder}{after}{match.group(3)}"
+
+    md = TABLE_RE.sub(table, md)
+    with console.capture() as capture:
+        console.print(
+            Markdown(md, inline_code_lexer="bash", inline_code_theme="monokai")
+        )
+    text = capture.get()
+    for idx, rendered in enumerate(tables):
+        text = text.replace(f"<#MD-TABLE-{idx}#>", rendered)
+    return re.sub(r"<br/?>", "\n", text).strip()
+
+
+def state_bodies():
+    return [pytest.param(state.body, id=str(state)) for state in iter_states()]
+
+
+@pytest.mark.parametrize("md", DOCUMENTS + state_bodies())
+def test_tables_match_the_regex(md):
+    md = normalize(md)
+    expected = [match.span(2) for match in TABLE_RE.finditer(md)]
+    assert list(find_md_tables(md)) == expected
+
+
+@pytest.mark.parametrize("md", state_bodies())
+@pytest.mark.parametrize("width", [60, 100])
+def test_states_render_as_before(md, width):
+    assert parse_md(md, width, "256") == regex_parse_md(md, width, "256")
+
+
+def test_many_tables_render_as_before():
+    table = "|Command|Effect|\n|-------|------|\n|`git a`|one<br>two|\n"
+    md = "\n".join(f"Step {idx}\n\n{table}" for idx in range(12))
+    assert parse_md(md, 80, None) == regex_parse_md(md, 80, None)
+    assert parse_md(md, 80, None).count("git a") == 12
+
+
+def test_split_md_table():
+    header, body, columns = split_md_table("|a|b|c|\n|:-:|--:|---|\n|1|2|3|\n|4|5|6|")
+    assert header == [["a", "b", "c"]]
+    assert body == [["1", "2", "3"], ["4", "5", "6"]]
+    assert list(columns) == ["center", "right", "left"]
+
+
+def test_tables_without_a_header():
+    header, body, _ = split_md_table("|a|b|\n|1|2|")
+    assert header == []
+    assert body == [["a", "b"], ["1", "2"]]
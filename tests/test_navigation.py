@@ -0,0 +1,111 @@
+import pytest
+
+from gitfix import git_states
+from gitfix.navigation import Navigator
+
+
+class Key(str):
+    """A keystroke, as read from the terminal."""
+
+    name = None
+
+
+LEFT = Key()
+LEFT.name = "KEY_LEFT"
+RIGHT = Key()
+RIGHT.name = "KEY_RIGHT"
+
+
+def names(states):
+    return [str(state) for state in states]
+
+
+@pytest.fixture
+def navigator():
+    return Navigator(git_states.StartState())
+
+
+def test_states_are_shared_instances():
+    assert git_states.StartState() is git_states.StartState()
+    assert git_states.StartState().child(0) is git_states.CommitedQuestionState()
+
+
+def test_back_and_forward(navigator):
+    navigator.on_event(Key("0"))
+    navigator.on_event(Key("1"))
+    assert names(navigator.breadcrumbs()) == [
+        "StartState",
+        "CommitedQuestionState",
+        "BadRebaseState",
+    ]
+    assert navigator.path() == [0, 1]
+    navigator.on_event(LEFT)
+    navigator.on_event(LEFT)
+    navigator.on_event(LEFT)
+    assert str(navigator.current) == "StartState"
+    navigator.on_event(RIGHT)
+    navigator.on_event(RIGHT)
+    navigator.on_event(RIGHT)
+    assert str(navigator.current) == "BadRebaseState"
+
+
+def test_choosing_an_option_drops_the_states_ahead(navigator):
+    navigator.on_event(Key("0"))
+    navigator.on_event(Key("1"))
+    navigator.back()
+    navigator.on_event(Key("0"))
+    assert str(navigator.current) == "BadMergeState"
+    navigator.forward()
+    assert str(navigator.current) == "BadMergeState"
+
+
+def test_choosing_the_state_ahead_keeps_the_stack(navigator):
+    navigator.on_event(Key("0"))
+    navigator.on_event(Key("1"))
+    navigator.back()
+    navigator.back()
+    navigator.on_event(Key("0"))
+    navigator.forward()
+    assert str(navigator.current) == "BadRebaseState"
+
+
+def test_other_keys_are_ignored(navigator):
+    for key in (Key("x"), Key("9"), Key("-1")):
+        assert str(navigator.on_event(key)) == "StartState"
+
+
+def test_from_path():
+    navigator = Navigator.from_path(git_states.StartState(), [0, 2])
+    assert str(navigator.current) == "CommittedState"
+    with pytest.raises(ValueError):
+        Navigator.from_path(git_states.StartState(), [0, 9])
+
+
+def test_jump_follows_a_shortest_path(navigator):
+    navigator.jump(git_states.BadRebaseState())
+    assert names(navigator.breadcrumbs()) == [
+        "StartState",
+        "CommitedQuestionState",
+        "BadRebaseState",
+    ]
+
+
+def test_next_states(navigator):
+    navigator.on_event(Key("0"))
+    navigator.on_event(Key("1"))
+    navigator.back()
+    next_states = names(navigator.next_states())
+    assert next_states[:2] == ["StartState", "BadRebaseState"]
+    assert len(next_states) == len(set(next_states))
+
+
+def test_jump_via_a_state(navigator):
+    navigator.jump(git_states.RemoveLastState(), via=git_states.ChangeLastState())
+    assert names(navigator.breadcrumbs())[-2:] == ["ChangeLastState", "RemoveLastState"]
+    navigator.back()
+    assert str(navigator.current) == "ChangeLastState"
+
+
+def test_jump_via_a_state_without_the_option(navigator):
+    with pytest.raises(ValueError):
+        navigator.jump(git_states.RemoveLastState(), via=git_states.StartState())
@@ -0,0 +1,96 @@
+import os
+import shutil
+import subprocess  # noqa: S404
+from pathlib import Path
+
+import pytest
+
+from gitfix.objects import ObjectStore, PackIndex
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="A U Thor",
+    GIT_AUTHOR_EMAIL="author@example.com",
+    GIT_COMMITTER_NAME="A U Thor",
+    GIT_COMMITTER_EMAIL="author@example.com",
+    GIT_CONFIG_NOSYSTEM="1",
+)
+
+
+def git(repo, *args):
+    return subprocess.run(  # noqa: S603, S607
+        ["git", "-C", str(repo), *args],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        env=ENV,
+    ).stdout
+
+
+@pytest.fixture(scope="module")
+def repo(tmp_path_factory):
+    repo = tmp_path_factory.mktemp("repo")
+    git(repo, "init", "-q")
+    for idx in range(60):
+        (repo / f"file{idx % 7}.txt").write_text(f"revision {idx}\n")
+        git(repo, "add", ".")
+        git(repo, "commit", "-q", "-m", f"commit {idx}")
+    git(repo, "gc", "-q")
+    return repo
+
+
+@pytest.fixture(scope="module")
+def objects(repo):
+    output = git(repo, "cat-file", "--batch-all-objects", "--batch-check=%(objectname)")
+    return output.split()
+
+
+def test_pack_index_finds_every_object(repo, objects):
+    (path,) = (repo / ".git" / "objects" / "pack").glob("*.idx")
+    index = PackIndex(str(path))
+    assert len(index) == len(objects) > 100
+    for name in objects:
+        assert index.find(name) == [name]
+        assert index.find(name[:12]) == [name]
+    index.close()
+
+
+def test_abbreviations_match_rev_parse(repo, objects):
+    store = ObjectStore(str(repo / ".git"))
+    for name in objects:
+        for length in (4, 5, 7):
+            prefix = name[:length]
+            result = subprocess.run(  # noqa: S603, S607
+                ["git", "-C", str(repo), "rev-parse", "-q", "--verify", prefix],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                universal_newlines=True,
+            )
+            if result.returncode == 0:
+                assert store.resolve(prefix) == result.stdout.strip()
+            else:
+                assert len(store.find(prefix)) > 1
+    store.close()
+
+
+def test_unknown_and_malformed_ids(repo, objects):
+    store = ObjectStore(str(repo / ".git"))
+    unknown = next(
+        prefix
+        for prefix in (f"{value:06x}" for value in range(1 << 24))
+        if not any(name.startswith(prefix) for name in objects)
+    )
+    for name in (unknown, "xyz123", "abc", "a" * 41):
+        with pytest.raises(ValueError):
+            store.resolve(name)
+    assert unknown not in store
+    store.close()
+
+
+def test_pack_index_rejects_other_files(tmp_path):
+    path = Path(tmp_path, "bad.idx")
+    path.write_bytes(b"\0" * 2048)
+    with pytest.raises(ValueError):
+        PackIndex(str(path))
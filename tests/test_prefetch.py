@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from gitfix import git_states, prerender, render
+from gitfix.backends import FramebufferBackend
+from gitfix.main import Guide, handle_keys
+from gitfix.prefetch import Prefetcher
+
+START = git_states.StartState()
+QUESTION = git_states.CommitedQuestionState()
+LOST = git_states.LostNFoundState()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    render.clear_render_cache()
+    yield
+    render.clear_render_cache()
+
+
+@pytest.fixture
+def prefetcher():
+    prefetcher = Prefetcher(lambda *key: None)
+    yield prefetcher
+    prefetcher.close()
+
+
+def wait_idle(prefetcher, count):
+    deadline = time.monotonic() + 5
+    while prefetcher.rendered < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_renders_the_queued_states():
+    rendered = []
+    prefetcher = Prefetcher(lambda *key: rendered.append(key))
+    prefetcher.prefetch([START, QUESTION], 80, "256")
+    wait_idle(prefetcher, 2)
+    prefetcher.close()
+    assert rendered == [(START, 80, "256"), (QUESTION, 80, "256")]
+
+
+def test_new_requests_replace_the_queue():
+    started = threading.Event()
+    release = threading.Event()
+    rendered = []
+
+    def slow_render(*key):
+        started.set()
+        release.wait(5)
+        rendered.append(key[0])
+
+    prefetcher = Prefetcher(slow_render)
+    prefetcher.prefetch([START, QUESTION], 80, None)
+    assert started.wait(5)
+    prefetcher.prefetch([LOST], 80, None)
+    release.set()
+    wait_idle(prefetcher, 2)
+    prefetcher.close()
+    assert rendered == [START, LOST]
+    assert not prefetcher.pending()
+
+
+def test_wait_for_the_render_in_progress():
+    started = threading.Event()
+    rendered = []
+
+    def slow_render(*key):
+        started.set()
+        time.sleep(0.2)
+        rendered.append(key)
+
+    prefetcher = Prefetcher(slow_render)
+    prefetcher.prefetch([QUESTION], 80, None)
+    assert started.wait(5)
+    moment = time.monotonic()
+    prefetcher.wait(START, 80, None)
+    assert time.monotonic() - moment < 0.1
+    prefetcher.wait(QUESTION, 80, None)
+    assert rendered == [(QUESTION, 80, None)]
+    prefetcher.close()
+
+
+def test_failed_renders_do_not_stop_the_worker():
+    def render_state(state, width, color_system):
+        if state is START:
+            raise ValueError("bad Markdown")
+
+    prefetcher = Prefetcher(render_state)
+    prefetcher.prefetch([START, QUESTION], 80, None)
+    wait_idle(prefetcher, 1)
+    assert isinstance(prefetcher.error, ValueError)
+    prefetcher.prefetch([LOST], 80, None)
+    wait_idle(prefetcher, 2)
+    assert prefetcher.rendered == 2
+    assert prefetcher._thread.is_alive()
+    prefetcher.close()
+
+
+def test_closed_prefetcher_ignores_requests(prefetcher):
+    prefetcher.close()
+    prefetcher.prefetch([START], 80, None)
+    assert not prefetcher.pending()
+
+
+def test_guide_waits_for_a_state_being_prefetched(monkeypatch):
+    renders = []
+
+    def parse_md(md, width=None, color_system="auto"):
+        renders.append(md)
+        time.sleep(0.1)
+        return md
+
+    monkeypatch.setattr(prerender, "lookup", lambda *args: None)
+    monkeypatch.setattr(render, "parse_md", parse_md)
+    backend = FramebufferBackend(30, 80)
+    guide = Guide(backend, detect=False)
+    try:
+        guide.draw()
+        deadline = time.monotonic() + 5
+        while guide.prefetcher._rendering is None and time.monotonic() < deadline:
+            time.sleep(0.001)
+        backend.keys.append("0")
+        handle_keys(guide, backend, backend.read_key(0))
+        guide.draw()
+    finally:
+        guide.close()
+    assert renders.count(QUESTION.body) == 1
+    assert QUESTION.title in backend.text()
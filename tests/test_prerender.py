@@ -0,0 +1,78 @@
+import pytest
+
+from gitfix import git_states, prerender, render
+from gitfix.render import parse_md
+
+WIDTH = 60
+
+
+@pytest.fixture
+def states(monkeypatch):
+    states = [git_states.StartState(), git_states.CommitedQuestionState()]
+    monkeypatch.setattr(prerender, "iter_states", lambda: iter(states))
+    return states
+
+
+@pytest.fixture
+def bundle(tmp_path, states):
+    path = str(tmp_path / "prerendered.bin")
+    assert prerender.build_bundle(path, (WIDTH,), (None, "256")) == len(states)
+    bundle = prerender.Bundle(path)
+    yield bundle
+    bundle._map.close()
+
+
+def test_iter_states_reaches_every_state():
+    names = [str(state) for state in prerender.iter_states()]
+    assert names[0] == "StartState"
+    assert len(names) == len(set(names)) == len(git_states.GRAPH)
+
+
+def test_lookup(bundle, states):
+    for state in states:
+        for color_system in (None, "256"):
+            expected = parse_md(state.describe()[1], WIDTH, color_system)
+            assert bundle.lookup(state, WIDTH, color_system) == expected
+
+
+def test_lookup_misses(bundle):
+    assert bundle.lookup(git_states.StartState(), WIDTH + 1, None) is None
+    assert bundle.lookup(git_states.StartState(), WIDTH, "truecolor") is None
+    assert bundle.lookup(git_states.LostNFoundState(), WIDTH, None) is None
+
+
+def test_stale_render_is_rejected(bundle, monkeypatch):
+    monkeypatch.setattr(git_states.StartState, "body", "Changed since the build.")
+    assert bundle.lookup(git_states.StartState(), WIDTH, None) is None
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "prerendered.bin"
+    path.write_bytes(b"not a bundle")
+    with pytest.raises(ValueError):
+        prerender.Bundle(str(path))
+
+
+def test_render_state_falls_back_to_a_live_render(bundle, monkeypatch):
+    monkeypatch.setattr(prerender, "_bundle", bundle)
+    monkeypatch.setattr(git_states.StartState, "body", "Changed *since* the build.")
+    render.clear_render_cache()
+    try:
+        rendered = render.render_state(git_states.StartState(), WIDTH, None)
+    finally:
+        render.clear_render_cache()
+    assert rendered == "Changed since the build."
+
+
+def test_render_state_reads_the_bundle(bundle, monkeypatch):
+    def parse_md(*args):
+        raise AssertionError("rendered live")
+
+    expected = bundle.lookup(git_states.StartState(), WIDTH, None)
+    monkeypatch.setattr(prerender, "_bundle", bundle)
+    monkeypatch.setattr(render, "parse_md", parse_md)
+    render.clear_render_cache()
+    try:
+        assert render.render_state(git_states.StartState(), WIDTH, None) == expected
+    finally:
+        render.clear_render_cache()
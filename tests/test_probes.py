@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+from gitfix.probes import Probes, probe_operation, probe_status
+
+
+def wait(probes):
+    deadline = time.monotonic() + 5
+    while probes.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not probes.pending()
+
+
+@pytest.fixture
+def fake_git(tmp_path, monkeypatch):
+    """Put a ``git`` on the PATH that runs the script given to it."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    git = bin_dir / "git"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def install(script):
+        git.write_text(f"#!/bin/sh\n{script}\n")
+        git.chmod(0o755)
+
+    return install
+
+
+def test_annotations():
+    def probe(probes):
+        return [("CommittedState", 1, "3 changed files"), ("StartState", 0, "yes")]
+
+    probes = Probes(probes=(probe,))
+    wait(probes)
+    assert probes.annotations("CommittedState") == {1: "3 changed files"}
+    assert probes.annotations("StartState") == {0: "yes"}
+    assert probes.annotations("BadMergeState") == {}
+    probes.close()
+
+
+def test_failed_probes_are_ignored():
+    def failing(probes):
+        raise ValueError("unexpected output")
+
+    def working(probes):
+        return [("StartState", 0, "yes")]
+
+    probes = Probes(probes=(failing, working))
+    wait(probes)
+    assert probes.annotations("StartState") == {0: "yes"}
+    probes.close()
+
+
+@pytest.mark.parametrize(
+    "output, annotations",
+    [
+        ("", {0: "working directory is clean"}),
+        (" M a.txt\n", {1: "1 changed file", 2: "1 changed file"}),
+        (" M a.txt\nM  b.txt\n", {1: "2 changed files", 2: "2 changed files"}),
+    ],
+)
+def test_probe_status(fake_git, tmp_path, output, annotations):
+    (tmp_path / "status").write_text(output)
+    fake_git(f"cat {tmp_path / 'status'}")
+    probes = Probes(str(tmp_path), probes=(probe_status,))
+    wait(probes)
+    assert probes.annotations("CommittedState") == annotations
+    probes.close()
+
+
+def test_probe_operation(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "rebase-merge").mkdir()
+    probes = Probes(str(tmp_path), probes=(probe_operation,))
+    wait(probes)
+    assert probes.annotations("CommitedQuestionState") == {1: "rebase in progress"}
+    probes.close()
+
+
+def test_close_kills_running_git(fake_git, tmp_path):
+    fake_git("sleep 30")
+    probes = Probes(str(tmp_path), probes=(probe_status,))
+    deadline = time.monotonic() + 5
+    while not probes._processes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (process,) = probes._processes
+    probes.close()
+    assert process.wait(timeout=5) != 0
+    wait(probes)
+    assert probes.annotations("CommittedState") == {}
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from gitfix.main import main
+from gitfix.profile import (
+    NULL_PROFILER,
+    Profiler,
+    load_profiler,
+    percentile,
+    read_frames,
+    summarize,
+)
+
+FRAMES = [
+    {"state": "StartState", "spans": {"input_wait": 500.0, "regions": 2.0}},
+    {
+        "state": "StartState",
+        "spans": {"input_wait": 90.0, "regions": 6.0, "render": 5.0, "flush": 1.0},
+    },
+    {"state": "BadMergeState", "spans": {"transition": 0.5, "regions": 1.5}},
+]
+
+
+@pytest.mark.parametrize(
+    "pct, expected", [(0, 1), (1, 1), (50, 5), (90, 9), (95, 10), (99, 10), (100, 10)]
+)
+def test_percentile(pct, expected):
+    assert percentile(list(range(1, 11)), pct) == expected
+
+
+def test_percentile_of_one_sample():
+    assert percentile([4.0], 99) == 4.0
+
+
+def test_summarize():
+    spans, states = summarize(FRAMES)
+    assert spans["input_wait"] == [90.0, 500.0]
+    assert spans["regions"] == [1.5, 2.0, 6.0]
+    assert spans["render"] == [5.0]
+    # Waiting for input and nested spans are not part of the paint time.
+    assert states == {"StartState": [2.0, 7.0], "BadMergeState": [2.0]}
+
+
+def test_profiler_records_frames(tmp_path):
+    path = tmp_path / "frames.jsonl"
+    profiler = load_profiler({"GITFIX_PROFILE": str(path)})
+    with profiler.span("regions"):
+        pass
+    profiler.note("keys", 3)
+    profiler.end_frame("StartState")
+    profiler.end_frame("BadMergeState")
+    profiler.close()
+    first, second = (json.loads(line) for line in path.read_text().splitlines())
+    assert first["state"] == "StartState"
+    assert first["keys"] == 3
+    assert set(first["spans"]) == {"regions"}
+    assert second == {**second, "frame": 1, "spans": {}}
+    assert "keys" not in second
+
+
+def test_profiling_is_off_by_default():
+    assert load_profiler({}) is NULL_PROFILER
+    assert not isinstance(NULL_PROFILER, Profiler)
+
+
+def test_read_frames_skips_broken_lines(tmp_path):
+    path = tmp_path / "frames.jsonl"
+    path.write_text('{"frame": 0}\n{"frame": 1, "sp\n{"frame": 2}\n')
+    assert [frame["frame"] for frame in read_frames(str(path))] == [0, 2]
+
+
+def test_profile_command(tmp_path, capsys):
+    path = tmp_path / "frames.jsonl"
+    path.write_text("".join(json.dumps(frame) + "\n" for frame in FRAMES))
+    with pytest.raises(SystemExit) as exit_info:
+        main(["profile", str(path)])
+    out = capsys.readouterr().out.splitlines()
+    assert exit_info.value.code == 0
+    assert out[0].split() == ["span", "(ms)", "count", "p50", "p95", "p99"]
+    assert ["regions", "3", "2.000", "6.000", "6.000"] in [line.split() for line in out]
+    assert any(line.startswith("StartState") for line in out)
+
+
+def test_profile_command_without_frames(tmp_path, capsys):
+    path = tmp_path / "frames.jsonl"
+    path.write_text("")
+    with pytest.raises(SystemExit) as exit_info:
+        main(["profile", str(path)])
+    assert exit_info.value.code == 2
+    assert "no frames" in capsys.readouterr().err
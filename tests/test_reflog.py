@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from gitfix.reflog import (
+    CHECKPOINT_INTERVAL,
+    DAY,
+    WINDOW_PAGES,
+    Filter,
+    Reflog,
+    ReflogView,
+    merged_entries,
+    open_reflogs,
+    parse_date,
+    parse_filter,
+    reversed_lines,
+)
+
+ZERO = "0" * 40
+NAME = "A U Thor <author@example.com>"
+
+
+def write_reflog(path, times, label):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for idx, moment in enumerate(times):
+            new = f"{idx:040x}"
+            f.write(f"{ZERO} {new} {NAME} {moment} +0000\t{label} {idx}\n")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git_dir = tmp_path / ".git"
+    write_reflog(git_dir / "logs" / "HEAD", range(1000, 1600, 2), "head")
+    write_reflog(
+        git_dir / "logs" / "refs" / "heads" / "main", range(1001, 1600, 3), "main"
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "data, lines",
+    [
+        (b"one\ntwo\nthree\n", [b"three", b"two", b"one"]),
+        (b"one\ntwo", [b"two", b"one"]),
+        (b"one\n\ntwo\n", [b"two", b"", b"one"]),
+        (b"", []),
+    ],
+)
+def test_reversed_lines(data, lines):
+    assert list(reversed_lines(data)) == lines
+
+
+def test_parse_filter():
+    assert parse_filter("") == Filter(None, None, None)
+    since = parse_date("2021-07-01")
+    entry_filter = parse_filter("main since:2021-07-01 until:2021-07-31")
+    assert entry_filter.ref == "main"
+    assert entry_filter.since == since
+    assert entry_filter.until == parse_date("2021-07-31") + DAY
+    assert time.localtime(since)[:3] == (2021, 7, 1)
+
+
+@pytest.mark.parametrize("text", ["since:yesterday", "until:2021-13-01"])
+def test_parse_filter_rejects_bad_dates(text):
+    with pytest.raises(ValueError):
+        parse_filter(text)
+
+
+def test_reflog_entries_are_newest_first(repo):
+    reflog = Reflog(str(repo / ".git" / "logs" / "HEAD"), "HEAD")
+    entries = list(reflog)
+    reflog.close()
+    assert len(entries) == 300
+    assert entries[0].time == 1598
+    assert entries[0].message == "head 299"
+    assert [entry.time for entry in entries] == sorted(
+        (entry.time for entry in entries), reverse=True
+    )
+
+
+def test_merged_entries_resume_from_their_position(repo):
+    reflogs = open_reflogs(str(repo / ".git"))
+    merged = list(merged_entries(reflogs))
+    times = [entry.time for entry, _ in merged]
+    assert len(merged) == 500
+    assert times == sorted(times, reverse=True)
+    for position in (0, 1, 137, 498):
+        _, ends = merged[position]
+        rest = [entry for entry, _ in merged_entries(reflogs, ends=ends)]
+        assert rest == [entry for entry, _ in merged[position + 1 :]]
+    for reflog in reflogs:
+        reflog.close()
+
+
+def test_merged_entries_in_a_time_range(repo):
+    reflogs = open_reflogs(str(repo / ".git"), "main")
+    entries = [entry for entry, _ in merged_entries(reflogs, 1100, 1200)]
+    assert {entry.ref for entry in entries} == {"refs/heads/main"}
+    assert all(1100 <= entry.time < 1200 for entry in entries)
+    assert len(entries) == 34
+
+
+def test_view_keeps_a_bounded_window(tmp_path):
+    count = CHECKPOINT_INTERVAL * 4 + 10
+    write_reflog(tmp_path / ".git" / "logs" / "HEAD", range(count), "head")
+    view = ReflogView(str(tmp_path))
+    view.page = 10
+    for _ in range(count // view.page + 5):
+        view._select(view.selected + view.page)
+        assert len(view._window) <= WINDOW_PAGES * view.page
+    assert view.selected == count - 1
+    assert view._count == count
+    view._select(3)
+    view._fetch(view.top, view.top + view.page)
+    offset = view.selected - view._base
+    assert view._window[offset].message == f"head {count - 4}"
+    view.close()
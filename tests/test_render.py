@@ -0,0 +1,61 @@
+import pytest
+
+from gitfix import git_states, prerender, render
+
+
+@pytest.fixture(autouse=True)
+def live_renders(monkeypatch):
+    """Render every state live, counting the renders."""
+    calls = []
+
+    def parse_md(md, width=None, color_system="auto"):
+        calls.append((md, width, color_system))
+        return f"{len(calls)}: {width} {color_system}"
+
+    monkeypatch.setattr(prerender, "lookup", lambda *args: None)
+    monkeypatch.setattr(render, "parse_md", parse_md)
+    render.clear_render_cache()
+    yield calls
+    render.clear_render_cache()
+
+
+def test_renders_are_cached(live_renders):
+    state = git_states.StartState()
+    first = render.render_state(state, 80, "256")
+    assert render.is_rendered(state, 80, "256")
+    assert render.render_state(state, 80, "256") == first
+    assert len(live_renders) == 1
+
+
+def test_cache_is_keyed_on_width_and_color_system(live_renders):
+    state = git_states.StartState()
+    renders = {
+        render.render_state(state, width, color_system)
+        for width in (80, 100)
+        for color_system in ("256", None)
+    }
+    assert len(renders) == len(live_renders) == 4
+    assert not render.is_rendered(state, 120, "256")
+
+
+def test_least_recently_used_render_is_evicted(live_renders, monkeypatch):
+    monkeypatch.setattr(render, "RENDER_CACHE_SIZE", 2)
+    start = git_states.StartState()
+    question = git_states.CommitedQuestionState()
+    lost = git_states.LostNFoundState()
+    render.render_state(start, 80)
+    render.render_state(question, 80)
+    render.render_state(start, 80)
+    render.render_state(lost, 80)
+    assert render.is_rendered(start, 80)
+    assert not render.is_rendered(question, 80)
+    assert render.is_rendered(lost, 80)
+    render.render_state(question, 80)
+    assert len(live_renders) == 4
+
+
+def test_clear_render_cache():
+    state = git_states.StartState()
+    render.render_state(state, 80)
+    render.clear_render_cache()
+    assert not render.is_rendered(state, 80)
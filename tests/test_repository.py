@@ -0,0 +1,92 @@
+import pytest
+
+from gitfix import repository
+
+COMMIT = "1" * 40
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    git_dir = tmp_path / "repo" / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "refs" / "heads" / "main").write_text(COMMIT + "\n")
+    (tmp_path / "repo" / "src").mkdir()
+    return tmp_path / "repo"
+
+
+def test_clean_repository(repo):
+    assert repository.find_git_dir(str(repo / "src")) == str(repo / ".git")
+    assert repository.detect(str(repo / "src")) is None
+
+
+def test_outside_a_repository(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    assert repository.detect(str(tmp_path)) is None
+
+
+@pytest.mark.parametrize(
+    "path, operation, state",
+    [
+        ("MERGE_HEAD", "merge", "BadMergeState"),
+        ("rebase-merge/", "rebase", "BadRebaseState"),
+        ("rebase-apply/rebasing", "rebase", "BadRebaseState"),
+        ("rebase-apply/applying", "am", None),
+        ("CHERRY_PICK_HEAD", "cherry-pick", None),
+    ],
+)
+def test_operation_in_progress(repo, path, operation, state):
+    target = repo / ".git" / path
+    if path.endswith("/"):
+        target.mkdir()
+    else:
+        target.parent.mkdir(exist_ok=True)
+        target.write_text(COMMIT + "\n")
+    detection = repository.detect(str(repo))
+    assert detection.operation == operation
+    assert detection.state == state
+    assert detection.evidence == str(target).rstrip("/")
+
+
+def test_worktree(repo, tmp_path):
+    worktree_dir = repo / ".git" / "worktrees" / "feature"
+    worktree_dir.mkdir(parents=True)
+    (worktree_dir / "HEAD").write_text("ref: refs/heads/feature\n")
+    (worktree_dir / "commondir").write_text("../..\n")
+    (repo / ".git" / "refs" / "heads" / "feature").write_text(COMMIT + "\n")
+    worktree = tmp_path / "feature"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {worktree_dir}\n")
+
+    assert repository.find_git_dir(str(worktree)) == str(worktree_dir)
+    assert repository.common_dir(str(worktree_dir)) == str(repo / ".git")
+    assert repository.detect(str(worktree)) is None
+    (worktree_dir / "MERGE_HEAD").write_text(COMMIT + "\n")
+    assert repository.detect(str(worktree)).operation == "merge"
+    assert repository.detect(str(repo)) is None
+
+
+def test_unborn_head(repo):
+    (repo / ".git" / "refs" / "heads" / "main").unlink()
+    detection = repository.detect(str(repo))
+    assert detection.operation == "initial commit"
+    assert detection.state == "UncommittedState"
+
+
+def test_packed_refs_are_born(repo):
+    (repo / ".git" / "refs" / "heads" / "main").unlink()
+    (repo / ".git" / "packed-refs").write_text(
+        f"# pack-refs with: peeled fully-peeled sorted\n{COMMIT} refs/heads/main\n"
+    )
+    assert repository.detect(str(repo)) is None
+
+
+def test_detached_head_is_born(repo):
+    (repo / ".git" / "HEAD").write_text(COMMIT + "\n")
+    assert not repository.is_unborn(str(repo / ".git"))
+
+
+def test_git_dir_from_the_environment(repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("GIT_DIR", str(repo / ".git"))
+    assert repository.find_git_dir(str(tmp_path)) == str(repo / ".git")
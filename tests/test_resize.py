@@ -0,0 +1,55 @@
+import os
+import select
+import signal
+import time
+
+import pytest
+
+from gitfix.resize import ResizeWatcher
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(signal, "SIGWINCH"), reason="needs SIGWINCH"
+)
+
+
+def resize():
+    os.kill(os.getpid(), signal.SIGWINCH)
+
+
+def test_no_resize():
+    with ResizeWatcher() as watcher:
+        assert not watcher.pending
+        assert watcher.timeout() is None
+        assert not watcher.settled()
+
+
+def test_burst_settles_once():
+    with ResizeWatcher(debounce=0.05) as watcher:
+        for _ in range(5):
+            resize()
+            assert watcher.pending
+            assert not watcher.settled()
+            time.sleep(0.01)
+        assert 0 < watcher.timeout() <= 0.05
+        time.sleep(0.06)
+        assert watcher.settled()
+        assert not watcher.pending
+        assert not watcher.settled()
+
+
+def test_signal_wakes_the_input_loop():
+    with ResizeWatcher(debounce=0) as watcher:
+        resize()
+        readable, _, _ = select.select([watcher.fd], [], [], 1)
+        assert readable == [watcher.fd]
+        assert watcher.settled()
+        readable, _, _ = select.select([watcher.fd], [], [], 0)
+        assert readable == []
+
+
+def test_previous_handler_is_restored():
+    previous = signal.getsignal(signal.SIGWINCH)
+    with ResizeWatcher() as watcher:
+        assert signal.getsignal(signal.SIGWINCH) == watcher._on_signal
+    assert signal.getsignal(signal.SIGWINCH) == previous
+    assert watcher.fd is None
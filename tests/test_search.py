@@ -0,0 +1,83 @@
+import pytest
+
+from gitfix import git_states, search
+from gitfix.graph import Graph, Node
+from gitfix.search import Index, tokenize
+
+GRAPH = Graph(
+    [
+        Node(
+            "Start",
+            "Where to start",
+            "Pick what went wrong.",
+            (
+                ("Undo a rebase", "Rebase"),
+                ("Remove a file from history", "FilterBranch"),
+            ),
+        ),
+        Node("Rebase", "Rebase gone wrong", "Use the reflog to undo a rebase.", ()),
+        Node(
+            "FilterBranch",
+            "Rewrite history",
+            "Run git filter-branch, or the reflog cannot help.",
+            (),
+        ),
+    ]
+)
+
+
+@pytest.fixture
+def index():
+    return Index.build(GRAPH)
+
+
+def test_tokenize():
+    assert tokenize("Run git filter-branch, I said!") == [
+        "run",
+        "git",
+        "filter-branch",
+        "filter",
+        "branch",
+        "said",
+    ]
+    assert tokenize("a b", min_length=1) == ["a", "b"]
+
+
+def test_every_term_must_match(index):
+    assert index.search("reflog") == [1, 2]
+    assert index.search("reflog branch") == [2]
+    assert index.search("reflog nothing") == []
+    assert index.search("") == []
+
+
+def test_titles_and_options_rank_first(index):
+    assert index.search("rebase") == [1]
+    assert index.search("history") == [2]
+
+
+def test_last_term_matches_as_a_prefix(index):
+    assert index.search("ref") == [1, 2]
+    assert index.search("reflog bra") == [2]
+    assert index.search("ref branch") == []
+
+
+def test_limit(index):
+    assert index.search("reflog", limit=1) == [1]
+
+
+def test_dump_and_load(index, tmp_path):
+    path = str(tmp_path / "index.json")
+    index.dump(path)
+    loaded = Index.load(path)
+    assert loaded.crc == GRAPH.checksum()
+    assert loaded.search("reflog bra") == index.search("reflog bra")
+
+
+def test_stale_index_is_rebuilt(index, tmp_path, monkeypatch):
+    path = str(tmp_path / "index.json")
+    index.dump(path)
+    monkeypatch.setattr(search, "_index", None)
+    rebuilt = search.load_index(path)
+    assert rebuilt.crc == git_states.GRAPH.checksum()
+    found = rebuilt.search("rebase")
+    assert git_states.GRAPH.index("BadRebaseState") in found
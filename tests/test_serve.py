@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+
+import pytest
+
+from gitfix.serve import (
+    MAX_DISCARD_SIZE,
+    Server,
+    accepts_gzip,
+    body_length,
+    format_response,
+    keep_alive,
+    make_page,
+    parse_request,
+    respond,
+)
+
+
+def exchange(pages, data):
+    """Send ``data`` on a connection to a server, and return all it answers."""
+    loop = asyncio.new_event_loop()
+    server = Server(pages).start(loop, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def client():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(data)
+        answer = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return answer
+
+    try:
+        return loop.run_until_complete(client())
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+@pytest.fixture
+def pages():
+    return {"/StartState": make_page("<p>start</p>")}
+
+
+def test_parse_request():
+    method, path, version, headers = parse_request(
+        b"GET /StartState?x=1 HTTP/1.1\r\nHost: example\r\nAccept-Encoding: gzip\r\n\r\n"
+    )
+    assert (method, path, version) == ("GET", "/StartState", "HTTP/1.1")
+    assert headers == {"host": "example", "accept-encoding": "gzip"}
+
+
+@pytest.mark.parametrize("request_line", [b"GARBAGE", b"GET / SPDY/3"])
+def test_parse_request_rejects_malformed_requests(request_line):
+    with pytest.raises(ValueError):
+        parse_request(request_line + b"\r\n\r\n")
+
+
+def test_respond_with_the_page(pages):
+    status, headers, body = respond(pages, "GET", "/StartState", {})
+    assert status == 200
+    assert body == b"<p>start</p>"
+    assert headers["ETag"] == pages["/StartState"].etag
+
+
+def test_respond_gzipped(pages):
+    status, headers, body = respond(
+        pages, "GET", "/StartState", {"accept-encoding": "br, gzip"}
+    )
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == b"<p>start</p>"
+    assert headers["ETag"] != pages["/StartState"].etag
+
+
+def test_respond_not_modified(pages):
+    etag = pages["/StartState"].etag
+    status, _, body = respond(
+        pages, "GET", "/StartState", {"if-none-match": f"W/x, {etag}"}
+    )
+    assert (status, body) == (304, b"")
+
+
+def test_respond_not_found(pages):
+    assert respond(pages, "GET", "/Nowhere", {})[0] == 404
+
+
+def test_respond_method_not_allowed(pages):
+    status, headers, _ = respond(pages, "POST", "/StartState", {})
+    assert status == 405
+    assert headers["Allow"] == "GET, HEAD"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("", False),
+        ("*", True),
+    ],
+)
+def test_accepts_gzip(value, expected):
+    assert accepts_gzip(value) is expected
+
+
+def test_keep_alive():
+    assert keep_alive("HTTP/1.1", {})
+    assert not keep_alive("HTTP/1.1", {"connection": "close"})
+    assert not keep_alive("HTTP/1.0", {})
+
+
+def test_head_response_has_no_body():
+    data = format_response(200, {}, b"body", send_body=False)
+    assert data.endswith(b"\r\n\r\n")
+    assert b"Content-Length: 4" in data
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, 0),
+        ({"content-length": "12"}, 12),
+        ({"content-length": "-1"}, None),
+        ({"content-length": "x"}, None),
+        ({"transfer-encoding": "chunked"}, None),
+    ],
+)
+def test_body_length(headers, expected):
+    assert body_length(headers) == expected
+
+
+def test_kept_alive_connection(pages):
+    answer = exchange(
+        pages,
+        b"GET /StartState HTTP/1.1\r\n\r\n"
+        b"GET /StartState HTTP/1.1\r\nConnection: close\r\n\r\n",
+    )
+    assert answer.count(b"HTTP/1.1 200 OK") == 2
+    assert answer.endswith(b"<p>start</p>")
+
+
+def test_request_body_is_skipped(pages):
+    answer = exchange(
+        pages,
+        b"POST /StartState HTTP/1.1\r\nContent-Length: 19\r\n\r\n"
+        b"GET /x HTTP/1.1\r\n\r\n"
+        b"GET /StartState HTTP/1.1\r\nConnection: close\r\n\r\n",
+    )
+    assert answer.startswith(b"HTTP/1.1 405 Method Not Allowed")
+    assert answer.count(b"HTTP/1.1") == 2
+    assert b"404" not in answer
+    assert answer.endswith(b"<p>start</p>")
+
+
+@pytest.mark.parametrize(
+    "header",
+    [b"Transfer-Encoding: chunked", b"Content-Length: %d" % (MAX_DISCARD_SIZE + 1)],
+)
+def test_unskippable_body_closes_the_connection(pages, header):
+    answer = exchange(
+        pages,
+        b"POST /StartState HTTP/1.1\r\n" + header + b"\r\n\r\n"
+        b"GET /StartState HTTP/1.1\r\n\r\n",
+    )
+    assert answer.startswith(b"HTTP/1.1 405 Method Not Allowed")
+    assert b"Connection: close" in answer
+    assert answer.count(b"HTTP/1.1") == 1
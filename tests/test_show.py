@@ -0,0 +1,64 @@
+import pytest
+
+from gitfix import git_states
+from gitfix.main import main
+from gitfix.show import find_state
+
+
+def show(capsys, *args):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["show", *args])
+    out, err = capsys.readouterr()
+    return exit_info.value.code, out, err
+
+
+@pytest.mark.parametrize(
+    "target, state",
+    [
+        ("", "StartState"),
+        ("0", "CommitedQuestionState"),
+        ("0.2.1", "UncommittedEverythingState"),
+        ("BadRebaseState", "BadRebaseState"),
+        ("BadRebase", "BadRebaseState"),
+    ],
+)
+def test_find_state(target, state):
+    assert str(find_state(target)) == state
+
+
+@pytest.mark.parametrize("target", ["NoSuchState", "0.9", "1.x"])
+def test_find_state_rejects_unknown_states(target):
+    with pytest.raises(ValueError):
+        find_state(target)
+
+
+def test_show_renders_a_state(capsys):
+    code, out, err = show(capsys, "0", "--width", "60", "--color", "never")
+    state = git_states.CommitedQuestionState()
+    assert code == 0
+    assert out.startswith(state.title + "\n")
+    assert "\x1b[" not in out
+    assert all(len(line) <= 60 for line in out.splitlines()[1:])
+    assert out.endswith(f"{len(state.options) - 1}: {state.options[-1]}\n")
+
+
+def test_show_raw(capsys):
+    code, out, _ = show(capsys, "BadMerge", "--raw")
+    state = git_states.BadMergeState()
+    assert code == 0
+    assert out.startswith(f"# {state.title}\n\n")
+    assert state.body.strip() in out
+
+
+def test_show_unknown_state(capsys):
+    code, out, err = show(capsys, "Nowhere")
+    assert code == 2
+    assert out == ""
+    assert err == "gitfix show: No state named 'Nowhere'\n"
+
+
+@pytest.mark.parametrize("width", ["0", "-80", "wide"])
+def test_show_width_must_be_positive(capsys, width):
+    code, _, err = show(capsys, "0", "--width", width)
+    assert code == 2
+    assert "not a positive integer" in err